@@ -1,14 +1,32 @@
+import json
+import os
+import queue
 import re
+import threading
 import time
+from contextlib import contextmanager
+from pathlib import Path
+
 import pandas as pd
 from bs4 import BeautifulSoup
 from selenium import webdriver
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import Select, WebDriverWait
-from webdriver_manager.chrome import ChromeDriverManager
+
+try:
+    import psutil
+except ImportError:  # Optional, process memory is read from /proc without it
+    psutil = None
+
+from energy_common.tracing import Tracer
+try:
+    from .startup import browser_is_listening, resolve_chromedriver
+except ImportError:  # Fallback when running as a script
+    from startup import browser_is_listening, resolve_chromedriver
 
 """
 initialize Driver class to setup, close driver and set up soup efficiently. this is very efficient as i can use the Driver methods wherever i want to use them instead of setting up and closing driver each time I use it. I can also import it to other modules if need be.
@@ -19,12 +37,157 @@ get_soup() sets up soup for scraping html content from page content extracted fr
 wait() allows the driver to wait before sending any more requests to the browser, this allows for respectful scraping
 """
 
+PENDING_REQUESTS_SCRIPT = """
+if (!window.__aepXhrTracked && window.XMLHttpRequest) {
+    window.__aepXhrTracked = true;
+    window.__aepPendingXhr = 0;
+    var send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function() {
+        window.__aepPendingXhr++;
+        this.addEventListener('loadend', function() { window.__aepPendingXhr--; });
+        return send.apply(this, arguments);
+    };
+}
+var jq = window.jQuery ? window.jQuery.active : 0;
+return {ready: document.readyState, pending: jq + (window.__aepPendingXhr || 0)};
+"""
+
+CHART_SIGNATURE_SCRIPT = """
+if (!window.Highcharts || !Highcharts.charts) return null;
+var charts = 0, points = 0;
+Highcharts.charts.forEach(function(chart) {
+    if (!chart || !chart.series || chart.series.length === 0) return;
+    charts++;
+    chart.series.forEach(function(series) { points += (series.data || []).length; });
+});
+return charts + ':' + points;
+"""
+
+# Blocked by the lean profile: images, fonts, media and the analytics/share/newsletter scripts
+DEFAULT_BLOCKED_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.svg", "*.webp", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp4", "*.webm", "*.mp3",
+    "*google-analytics.com*", "*googletagmanager.com*", "*addtoany.com*", "*mailchimp.com*", "*doubleclick.net*",
+]
+
+MAX_WAIT_TIMEOUT = 120
+ADAPTIVE_TIMEOUT_FACTOR = 3
+MIB = 1024 * 1024
+
+
+def process_tree_rss(pid):
+    """Resident memory in bytes of a process and all its descendants, None when it cannot be read."""
+    if psutil:
+        try:
+            root = psutil.Process(pid)
+            processes = [root] + root.children(recursive=True)
+        except psutil.Error:
+            return None
+        total = 0
+        for process in processes:
+            try:
+                total += process.memory_info().rss
+            except psutil.Error:
+                continue
+        return total
+
+    proc = Path("/proc")
+    if not (proc / str(pid)).exists():
+        return None
+    children = {}
+    for stat in proc.glob("[0-9]*/stat"):
+        try:
+            # The command name may contain spaces and parentheses, the parent pid is the 2nd field after the last ")"
+            parent = int(stat.read_text().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(parent, []).append(int(stat.parent.name))
+
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    total = 0
+    stack = [pid]
+    while stack:
+        current = stack.pop()
+        try:
+            total += int((proc / str(current) / "statm").read_text().split()[1]) * page_size
+        except (OSError, IndexError, ValueError):
+            continue
+        stack.extend(children.get(current, []))
+    return total
+
+
 class Driver:
-    def __init__(self):
+    """One Chrome session with readiness waits, the lean profile and session recycling.
+
+    cache (a PageCache) lets the scraper serve extracted chart payloads from disk instead of driving the page again.
+    tracer (a Tracer) collects the timing spans of the scrape phases; drivers of a pool share one.
+    recycle_pages and memory_limit_mb set when recycle_if_needed() restarts the session.
+    """
+
+    def __init__(self, cache=None, tracer=None, recycle_pages=None, memory_limit_mb=None):
         self.driver = None
+        self.cache = cache
+        self.tracer = tracer or Tracer()
+        self.wait_history = {}
+        self.lean = False
+        self.blocked_patterns = []
+        self.page_weights = {}
+        self.full_page_bytes = {}
+        self.attached = False
+        self.startup_seconds = None
+        self.recycle_pages = recycle_pages
+        self.memory_limit_mb = memory_limit_mb
+        self.setup_options = {}
+        self.pages_loaded = 0
+        self.last_rss = None
+        self.peak_rss = None
+        self.recycle_events = []
+
+    def setup_driver(self, headless=False, lean=False, blocked_patterns=None, debugger_address=None, profile_dir=None):
+        """Start Chrome, or attach to the long-lived browser listening on debugger_address (see startup.py).
 
-    def setup_driver(self, headless=False):
+        The chromedriver binary is resolved once and cached by startup.py. profile_dir keeps a warm Chrome profile
+        between runs, and startup_seconds records how long setup took.
+        lean=True uses the eager page-load strategy, disables images and blocks blocked_patterns
+        (DEFAULT_BLOCKED_PATTERNS when None) through Network.setBlockedURLs; scraping only needs the DOM and the
+        Highcharts objects.
+        """
+        started = time.perf_counter()
+        self.setup_options = {
+            "headless": headless, "lean": lean, "blocked_patterns": blocked_patterns,
+            "debugger_address": debugger_address, "profile_dir": profile_dir,
+        }
         options = Options()
+
+        if debugger_address and browser_is_listening(debugger_address):
+            # Attach to the long-lived browser, its own flags and profile stay as they were launched
+            options.add_experimental_option("debuggerAddress", debugger_address)
+            self.attached = True
+        elif debugger_address:
+            print(f"[WARN] No browser listening on {debugger_address}, starting a new one")
+
+        if not self.attached:
+            self._add_launch_arguments(options, headless, lean, profile_dir)
+
+        if lean:
+            options.page_load_strategy = "eager"
+            options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
+        self.driver = webdriver.Chrome(service=Service(resolve_chromedriver()), options=options)
+
+        if lean:
+            self.lean = True
+            self.blocked_patterns = list(DEFAULT_BLOCKED_PATTERNS if blocked_patterns is None else blocked_patterns)
+            self.driver.execute_cdp_cmd("Network.enable", {})
+            self._apply_blocking(self.blocked_patterns)
+
+        self.startup_seconds = time.perf_counter() - started
+        mode = "attached to " + debugger_address if self.attached else "new browser"
+        profile = f", lean profile with {len(self.blocked_patterns)} blocked patterns" if lean else ""
+        print(f"Driver is set up successfully! ({mode}{profile}, startup {self.startup_seconds:.1f}s)")
+
+    def _add_launch_arguments(self, options, headless, lean, profile_dir):
         if headless:
             options.add_argument("--headless")
         options.add_argument("--no-sandbox") 
@@ -36,17 +199,155 @@ class Driver:
         options.add_argument("--start-maximized")
         options.add_argument("--ignore-certificate-errors")
         options.add_argument("--log-level=3")
+        if profile_dir:
+            options.add_argument(f"--user-data-dir={profile_dir}")
+        if lean:
+            options.add_argument("--blink-settings=imagesEnabled=false")
+            options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+
+    def _apply_blocking(self, patterns):
+        self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(patterns)})
 
-        self.driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
-        print("Driver is set up successfully!")
+    def _drain_network_log(self):
+        transferred = 0
+        requests = 0
+        blocked = 0
+        for entry in self.driver.get_log("performance"):
+            try:
+                message = json.loads(entry["message"])["message"]
+            except (KeyError, ValueError):
+                continue
+            method = message.get("method")
+            if method == "Network.loadingFinished":
+                requests += 1
+                transferred += message["params"].get("encodedDataLength", 0)
+            elif method == "Network.loadingFailed" and message["params"].get("blockedReason"):
+                blocked += 1
+        return {"bytes": transferred, "requests": requests, "blocked": blocked}
+
+    def report_page_weight(self, label):
+        """Print bytes transferred and requests blocked since the last report (lean profile only).
+
+        Both are read from Chrome's performance log.
+        """
+        if not self.lean:
+            return None
+        weight = self._drain_network_log()
+        self.page_weights[label] = weight
+        message = (
+            f"  [NET] {label}: {weight['bytes'] / 1024:.0f} KiB in {weight['requests']} requests, "
+            f"{weight['blocked']} blocked"
+        )
+        if label in self.full_page_bytes:
+            saved = self.full_page_bytes[label] - weight["bytes"]
+            message += f", ~{saved / 1024:.0f} KiB saved"
+        print(message)
+        return weight
+
+    def measure_lean_savings(self, url, label=None):
+        """Load url without and then with blocking; later reports for the same label include the bytes saved.
+
+        The scraper runs it once per run on the base page with --measure-lean (SCRAPER_MEASURE_LEAN).
+        """
+        if not self.lean:
+            raise Exception("measure_lean_savings() needs a driver set up with lean=True")
+        label = label or url
+        self._drain_network_log()
+
+        self._apply_blocking([])
+        self.driver.execute_cdp_cmd("Network.clearBrowserCache", {})
+        self.driver.get(url)
+        self.wait_for_page_ready(label=f"{label} (full)")
+        full = self._drain_network_log()
+
+        self._apply_blocking(self.blocked_patterns)
+        self.driver.execute_cdp_cmd("Network.clearBrowserCache", {})
+        self.driver.get(url)
+        self.wait_for_page_ready(label=f"{label} (lean)")
+
+        self.full_page_bytes[label] = full["bytes"]
+        return self.report_page_weight(label)
 
     def close_driver(self):
-        if self.driver:
+        if self.driver and self.attached:
+            # chromedriver does not close a browser it attached to, the session stays warm for the next run
+            self.driver.quit()
+            print("Driver detached, long-lived browser left running")
+        elif self.driver:
             self.driver.quit()
             print("Driver has been closed successfully!")
         else:
             print("Driver is not set up or not available")
 
+    def memory_usage(self):
+        """Resident bytes of chromedriver and the browser processes it started, None when unknown.
+
+        Read with psutil when installed, from /proc otherwise. Shared pages count once per process, so it is an upper
+        bound.
+        """
+        process = getattr(getattr(self.driver, "service", None), "process", None)
+        if process is None:
+            return None
+        rss = process_tree_rss(process.pid)
+        if rss is not None:
+            self.last_rss = rss
+            self.peak_rss = max(self.peak_rss or 0, rss)
+        return rss
+
+    def track_page(self):
+        """Count a page load and sample the browser memory."""
+        self.pages_loaded += 1
+        self.memory_usage()
+
+    def recycle_reason(self):
+        if self.recycle_pages and self.pages_loaded >= self.recycle_pages:
+            return f"{self.pages_loaded} pages"
+        if self.memory_limit_mb:
+            rss = self.memory_usage()
+            if rss is not None and rss > self.memory_limit_mb * MIB:
+                return f"{rss / MIB:.0f} MiB > {self.memory_limit_mb} MiB"
+        return None
+
+    def recycle_if_needed(self, restore=None):
+        """Start a fresh browser session when the page or memory limit is reached; restore(driver) rebuilds the page state.
+
+        The new session gets the same setup options; restore typically reloads the base page and dismisses the cookie
+        banner. Call it between sectors, never mid-page. Attached browsers are never recycled.
+        """
+        if not self.driver or self.attached:
+            return False
+        reason = self.recycle_reason()
+        if not reason:
+            return False
+
+        print(f"[RECYCLE] Restarting the browser session ({reason})")
+        started = time.perf_counter()
+        with self.tracer.span("browser recycle", reason=reason):
+            self.driver.quit()
+            self.driver = None
+            self.setup_driver(**self.setup_options)
+            if restore:
+                restore(self)
+        self.recycle_events.append({
+            "reason": reason,
+            "pages": self.pages_loaded,
+            "rss_mb": round(self.last_rss / MIB, 1) if self.last_rss else None,
+            "seconds": round(time.perf_counter() - started, 2),
+        })
+        self.pages_loaded = 0
+        self.last_rss = None
+        return True
+
+    def print_memory_summary(self):
+        """Peak browser memory and every recycle of the run."""
+        if self.peak_rss is None and not self.recycle_events:
+            return
+        peak = f"{self.peak_rss / MIB:.0f} MiB" if self.peak_rss else "unknown"
+        print(f"Browser memory: peak {peak}, {len(self.recycle_events)} recycle(s)")
+        for event in self.recycle_events:
+            rss = f", {event['rss_mb']:.0f} MiB" if event["rss_mb"] else ""
+            print(f"  - after {event['pages']} pages{rss} ({event['reason']}), restart took {event['seconds']:.1f}s")
+
     def get_soup(self):
         if not self.driver:
             raise Exception("Driver not set up first, run setup_driver() first for soup to work")
@@ -55,3 +356,165 @@ class Driver:
     def wait(self, secs=3):
         time.sleep(secs)
 
+    def _adaptive_timeout(self, label, timeout):
+        history = self.wait_history.get(label)
+        if not history:
+            return timeout
+        return min(MAX_WAIT_TIMEOUT, max(timeout, ADAPTIVE_TIMEOUT_FACTOR * max(history)))
+
+    def wait_until(self, condition, label, timeout=30, poll=0.1):
+        """Poll condition(driver) until it returns something truthy, logging how long it took.
+
+        The timeout adapts per label: a wait that was slow before gets a proportionally longer budget next time, never
+        less than timeout and never more than MAX_WAIT_TIMEOUT.
+        """
+        if not self.driver:
+            raise Exception("Driver not set up first, run setup_driver() first before waiting on the page")
+
+        budget = self._adaptive_timeout(label, timeout)
+        started = time.perf_counter()
+        while True:
+            try:
+                result = condition(self.driver)
+            except Exception:
+                result = None
+            elapsed = time.perf_counter() - started
+            if result:
+                self.wait_history.setdefault(label, []).append(elapsed)
+                print(f"  [WAIT] {label}: ready after {elapsed:.2f}s")
+                return result
+            if elapsed >= budget:
+                print(f"  [WAIT] {label}: not ready after {elapsed:.2f}s (budget {budget:.0f}s)")
+                raise TimeoutException(f"Timed out after {budget:.0f}s waiting for {label}")
+            time.sleep(poll)
+
+    def wait_for_ajax_idle(self, label="ajax idle", timeout=30):
+        """Wait until no XHRs are in flight."""
+        return self.wait_until(
+            lambda drv: drv.execute_script(PENDING_REQUESTS_SCRIPT)["pending"] == 0, label, timeout
+        )
+
+    def wait_for_page_ready(self, label="page ready", timeout=30):
+        """Wait for document.readyState == complete and no pending jQuery/XHR requests."""
+        def ready(drv):
+            state = drv.execute_script(PENDING_REQUESTS_SCRIPT)
+            return state["ready"] == "complete" and state["pending"] == 0
+
+        return self.wait_until(ready, label, timeout)
+
+    def wait_for_select2(self, select_selector, expected_text, label="select2 render", timeout=10):
+        """Wait until a Select2 widget renders expected_text and its dropdown is closed."""
+        rendered_selector = f"{select_selector} + .select2 .select2-selection__rendered"
+
+        def rendered(drv):
+            text = drv.find_element(By.CSS_SELECTOR, rendered_selector).text.strip()
+            still_open = drv.find_elements(By.CSS_SELECTOR, f"{select_selector} + .select2-container--open")
+            return text == expected_text and not still_open
+
+        return self.wait_until(rendered, label, timeout)
+
+    def wait_for_charts(self, label="charts stable", timeout=60, stable_for=0.75):
+        """Wait until Highcharts has series data and the series/point counts stop changing."""
+        last = {"signature": None, "since": None}
+
+        def stable(drv):
+            signature = drv.execute_script(CHART_SIGNATURE_SCRIPT)
+            now = time.perf_counter()
+            if not signature or signature.endswith(":0"):
+                last.update(signature=None, since=None)
+                return None
+            if signature != last["signature"]:
+                last.update(signature=signature, since=now)
+                return None
+            if now - last["since"] < stable_for:
+                return None
+            return drv.execute_script(PENDING_REQUESTS_SCRIPT)["pending"] == 0 and signature
+
+        return self.wait_until(stable, label, timeout)
+
+    def print_wait_summary(self):
+        """How long each kind of wait took over the run."""
+        if not self.wait_history:
+            return
+        print("Readiness waits:")
+        for label, durations in self.wait_history.items():
+            print(
+                f"  - {label}: {len(durations)}x, total {sum(durations):.1f}s, "
+                f"max {max(durations):.2f}s"
+            )
+
+
+class DriverPool:
+    """A bounded set of Drivers, so several sectors can be scraped at the same time, each in its own browser."""
+
+    def __init__(
+        self, size=3, headless=False, cache=None, lean=False, blocked_patterns=None, tracer=None,
+        recycle_pages=None, memory_limit_mb=None,
+    ):
+        if size < 1:
+            raise ValueError("DriverPool size must be at least 1")
+        self.size = size
+        self.headless = headless
+        self.cache = cache
+        self.tracer = tracer or Tracer()
+        self.lean = lean
+        self.blocked_patterns = blocked_patterns
+        self.recycle_pages = recycle_pages
+        self.memory_limit_mb = memory_limit_mb
+        self._idle = queue.Queue()
+        self._drivers = []
+        # Slots taken by started drivers and by drivers still starting
+        self._reserved = 0
+        self._lock = threading.Lock()
+
+    def _checkout(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            reserved = self._reserved < self.size
+            if reserved:
+                self._reserved += 1
+
+        if not reserved:
+            # Pool is full, block until another worker hands a driver back
+            return self._idle.get()
+
+        # Chrome starts outside the lock so the workers' browsers start in parallel
+        driver = Driver(
+            cache=self.cache, tracer=self.tracer,
+            recycle_pages=self.recycle_pages, memory_limit_mb=self.memory_limit_mb,
+        )
+        try:
+            with self.tracer.span("browser start"):
+                driver.setup_driver(headless=self.headless, lean=self.lean, blocked_patterns=self.blocked_patterns)
+        except Exception:
+            if driver.driver:
+                driver.close_driver()
+            with self._lock:
+                self._reserved -= 1
+            raise
+        with self._lock:
+            self._drivers.append(driver)
+        return driver
+
+    @contextmanager
+    def acquire(self):
+        """Hand out an idle driver, starting a new one while the pool is below its size, and take it back afterwards."""
+        driver = self._checkout()
+        try:
+            yield driver
+        finally:
+            self._idle.put(driver)
+
+    def close(self):
+        with self._lock:
+            for driver in self._drivers:
+                driver.print_wait_summary()
+                driver.print_memory_summary()
+                driver.close_driver()
+            self._drivers.clear()
+            self._reserved = 0
+        self._idle = queue.Queue()
@@ -0,0 +1,127 @@
+"""
+Per-indicator change detection between runs.
+
+Every chart block built by iter_chart_blocks gets a content fingerprint (sha256 over the indicator metadata, the countries
+with their serials and the year values), so the same data always hashes the same whatever order the charts came in.
+FingerprintStore keeps the fingerprints of the last finished run per sector in <output_dir>/fingerprints.json.
+
+SectorChanges compares one sector's indicators with the stored fingerprints while rows are written: the full sector file
+is written as before, rows of new or changed indicators also go to <sector file>_changes.<ext>, and close() writes
+<sector file>_changes.json listing the changed, new, unchanged and removed indicators, then stores the new fingerprints.
+Indicators are keyed on their label and unit (the chart index when the label is missing); two charts with the same key
+are both kept, the later one under its chart index, and listed as duplicates in the report.
+Transform and load stages can read the _changes files to process only what changed since the previous run.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+
+def indicator_key(block):
+    """Stable identity of a chart: its indicator label and unit, or its chart index when the label is missing."""
+    label = block["sub_sub_sector"]
+    if not label or label == "Unknown":
+        return f"chart {block['chart']}"
+    return f"{label} [{block['unit']}]" if block["unit"] else label
+
+
+def block_fingerprint(block):
+    """Stable fingerprint of one chart block's content."""
+    digest = hashlib.sha256()
+    meta = [block["metric"], block["unit"], block["sub_sector"], block["sub_sub_sector"], list(block["country"])]
+    digest.update(json.dumps(meta, ensure_ascii=False, default=str).encode("utf-8"))
+    digest.update(np.ascontiguousarray(block["country_serial"], dtype=np.int64).tobytes())
+    # Every NaN hashes the same, whichever null it came from
+    values = np.ascontiguousarray(block["values"], dtype=np.float64)
+    digest.update(np.where(np.isnan(values), np.nan, values).tobytes())
+    return digest.hexdigest()
+
+
+class FingerprintStore:
+    def __init__(self, path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        if self.path.exists():
+            self.data = json.loads(self.path.read_text(encoding="utf-8"))
+        else:
+            self.data = {"units": {}}
+
+    def get(self, unit):
+        """{indicator: fingerprint} stored for a sector (or tagged selection), empty on the first run."""
+        return dict(self.data["units"].get(unit, {}).get("indicators", {}))
+
+    def update(self, unit, fingerprints):
+        with self._lock:
+            self.data["units"][unit] = {"updated": datetime.now().isoformat(), "indicators": fingerprints}
+            tmp = self.path.with_name(f"{self.path.name}.tmp")
+            tmp.write_text(json.dumps(self.data, indent=2, sort_keys=True), encoding="utf-8")
+            os.replace(tmp, self.path)
+
+
+class SectorChanges:
+    def __init__(self, store, unit, delta_sink, report_file):
+        self.store = store
+        self.unit = unit
+        self.delta_sink = delta_sink
+        self.report_file = Path(report_file)
+        self.previous = store.get(unit)
+        self.current = {}
+        self.status = {}
+        self.duplicates = []
+
+    def observe(self, block, frame):
+        """Fingerprint a chart block; its rows go to the delta sink when the indicator is new or changed."""
+        key = indicator_key(block)
+        if key in self.current:
+            duplicate = f"{key} (chart {block['chart']})"
+            print(f"  [WARN] {self.unit}: duplicate indicator key {key!r}, chart {block['chart']} kept as {duplicate!r}")
+            self.duplicates.append(duplicate)
+            key = duplicate
+        fingerprint = block_fingerprint(block)
+        self.current[key] = fingerprint
+        if key not in self.previous:
+            self.status[key] = "new"
+        elif self.previous[key] != fingerprint:
+            self.status[key] = "changed"
+        else:
+            self.status[key] = "unchanged"
+            return False
+        self.delta_sink.write_frame(frame)
+        return True
+
+    def indicators(self, status):
+        return sorted(key for key, value in self.status.items() if value == status)
+
+    def abort(self):
+        """Drop the delta rows of a failed scrape; no report is written and the stored fingerprints stay as they were."""
+        self.delta_sink.abort()
+
+    def close(self, save=True):
+        """Close the delta sink, write the change report and, with save, keep this run's fingerprints for the next one."""
+        self.delta_sink.close()
+        removed = sorted(set(self.previous) - set(self.current))
+        report = {
+            "unit": self.unit,
+            "first_run": not self.previous,
+            "changed": self.indicators("changed"),
+            "new": self.indicators("new"),
+            "unchanged": self.indicators("unchanged"),
+            "removed": removed,
+            "duplicates": self.duplicates,
+            "delta_rows": self.delta_sink.rows_written,
+            "delta_file": str(self.delta_sink.path) if self.delta_sink.rows_written else None,
+        }
+        self.report_file.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(
+            f"  Changes for {self.unit}: {len(report['changed'])} changed, {len(report['new'])} new, "
+            f"{len(report['unchanged'])} unchanged, {len(removed)} removed ({report['delta_rows']} delta rows)"
+        )
+        if save and self.current:
+            self.store.update(self.unit, self.current)
+        return report
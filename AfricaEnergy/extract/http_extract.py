@@ -0,0 +1,276 @@
+"""
+Browserless extraction for the Africa Energy Portal database page (experimental, off by default).
+
+The database page is a Drupal app: the indicator checkboxes (.indicator-select) are in the static HTML and the chart data is
+fetched by the database widget script (aepdatabase_mongo/js/database-widget.js) with AJAX calls once the filters are applied.
+This module calls that data endpoint directly with a pooled requests.Session and builds the same rows as scrape_all_sectors,
+without starting Chrome.
+
+PortalHttpClient wraps a pooled, retrying session; with record_dir set every response is saved as a recording.
+scrape_all_sectors_http(replay_dir=...) serves a recorded session with ReplayServer (replay_server.py) and runs against it
+over HTTP, the same way it talks to the portal.
+discover_data_endpoint(client, html) finds the AJAX url in the widget script, AEP_DATA_ENDPOINT overrides it.
+charts_from_response(data) normalises the endpoint response into the columnar chart payload used by build_chart_frame.
+scrape_all_sectors_http() is the browserless counterpart of scrape_all_sectors.
+
+This is not a working mode for the live portal yet. The form fields (FILTER_FIELDS) and the endpoint discovery are
+modelled on the mock portal: the saved debug pages of the live portal only show the database-widget.js script tag and
+ajaxTrustedUrl entries, no recorded data request, so the real field names are unknown. benchmarks/check_replay.py only
+checks this module against recordings of the mock (a circular check). main.py never uses it, and the command line refuses
+to call a live url unless --experimental is given. Record a session of the live portal with check_replay.py and derive
+the fields from it before relying on this mode.
+"""
+
+import argparse
+import json
+import os
+import re
+import time
+from pathlib import Path
+from urllib.parse import urlencode, urljoin, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    from .fingerprints import FingerprintStore
+    from .offline_extract import chart_from_highcharts_options, parse_document, parse_indicators
+    from .replay_server import ReplayServer, save_recording
+    from .scrape import (
+        BASE_URL, SECTORS, finish_sector, open_sector_changes, open_sector_sink, print_run_summary,
+        select_indicators, selection_tag, write_chart_rows,
+    )
+except ImportError:  # Fallback when running as a script
+    from fingerprints import FingerprintStore
+    from offline_extract import chart_from_highcharts_options, parse_document, parse_indicators
+    from replay_server import ReplayServer, save_recording
+    from scrape import (
+        BASE_URL, SECTORS, finish_sector, open_sector_changes, open_sector_sink, print_run_summary,
+        select_indicators, selection_tag, write_chart_rows,
+    )
+
+YEARS = [str(year) for year in range(2000, 2025)]
+
+# Form fields the widget posts when APPLY is clicked
+FILTER_FIELDS = {
+    "sector": "main_grouping",
+    "indicators": "indicators[]",
+    "years": "years[]",
+}
+
+WIDGET_SCRIPT_PATTERN = re.compile(r"database-widget\.js")
+AJAX_URL_PATTERNS = [
+    re.compile(r"""url\s*:\s*['"]([^'"]+)['"]"""),
+    re.compile(r"""\$\.(?:post|get|getJSON|ajax)\(\s*['"]([^'"]+)['"]"""),
+]
+
+
+class PortalHttpClient:
+    def __init__(self, base_url=BASE_URL, pool_size=8, timeout=30, record_dir=None):
+        parts = urlsplit(base_url)
+        self.root_url = f"{parts.scheme}://{parts.netloc}"
+        self.database_path = parts.path or "/database"
+        self.timeout = timeout
+        self.record_dir = Path(record_dir) if record_dir else None
+        self.requests_made = 0
+        self.bytes_received = 0
+
+        retry = Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504), allowed_methods=None)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update(
+            {
+                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+                "X-Requested-With": "XMLHttpRequest",
+            }
+        )
+
+    def _path(self, url_or_path):
+        parts = urlsplit(urljoin(self.root_url + "/", url_or_path))
+        return parts.path + (f"?{parts.query}" if parts.query else "")
+
+    def request(self, method, url_or_path, data=None):
+        path = self._path(url_or_path)
+        body = urlencode(data, doseq=True) if data else ""
+        headers = {"Content-Type": "application/x-www-form-urlencoded"} if body else None
+        response = self.session.request(
+            method, self.root_url + path, data=body or None, headers=headers, timeout=self.timeout
+        )
+        response.raise_for_status()
+        self.requests_made += 1
+        self.bytes_received += len(response.content)
+
+        if self.record_dir:
+            save_recording(
+                self.record_dir, method, path, body, response.status_code,
+                response.headers.get("Content-Type", ""), response.text,
+            )
+        return response.text
+
+    def get(self, url_or_path):
+        return self.request("GET", url_or_path)
+
+    def post(self, url_or_path, data):
+        return self.request("POST", url_or_path, data=data)
+
+    def close(self):
+        self.session.close()
+
+
+def discover_data_endpoint(client, html):
+    """Find the AJAX url the database widget posts its filters to."""
+    configured = os.getenv("AEP_DATA_ENDPOINT", "").strip()
+    if configured:
+        return configured
+
+    for src in parse_document(html).xpath("//script/@src"):
+        if not WIDGET_SCRIPT_PATTERN.search(src):
+            continue
+        source = client.get(src)
+        for pattern in AJAX_URL_PATTERNS:
+            match = pattern.search(source)
+            if match:
+                return match.group(1)
+
+    raise RuntimeError(
+        "Could not find the database data endpoint in the widget script; set AEP_DATA_ENDPOINT to the url it posts to"
+    )
+
+
+def charts_from_response(data):
+    """Normalise the endpoint response into the columnar payload build_chart_frame expects.
+
+    Accepts either the columnar shape ({"charts": [{"countries", "years", "values"}]}) or a list of
+    Highcharts option objects ({"xAxis": {"categories"}, "series": [{"name", "data"}]}).
+    """
+    if isinstance(data, str):
+        data = json.loads(data)
+    if isinstance(data, dict) and "charts" in data:
+        data = data["charts"]
+    if isinstance(data, dict):
+        data = [data]
+
+    charts = []
+    for index, item in enumerate(data or []):
+        if "countries" in item and "values" in item:
+            chart = dict(item)
+            chart.setdefault("index", index)
+            charts.append(chart)
+        else:
+            chart = chart_from_highcharts_options(index, item)
+            if chart:
+                charts.append(chart)
+    return charts
+
+
+def scrape_sector_http(
+    client, endpoint, page_html, sector_name, sink, years=None, themes=None, indicators=None, changes=None,
+):
+    """Fetch one sector's charts in a single request and stream rows into sink like scrape_sector_data does."""
+    print(f"\nFetching sector over HTTP: {sector_name}")
+    available = parse_indicators(parse_document(page_html), sector_name)
+    indicators = select_indicators(available, themes, indicators) if themes or indicators else available
+    if not indicators:
+        raise RuntimeError(f"No indicators found for {sector_name}")
+    print(f"  Found {len(indicators)} indicators")
+
+    form = {
+        FILTER_FIELDS["sector"]: sector_name,
+        FILTER_FIELDS["indicators"]: [indicator["label"] for indicator in indicators],
+        FILTER_FIELDS["years"]: list(years or YEARS),
+    }
+    charts = charts_from_response(client.post(endpoint, form))
+    rows_written = write_chart_rows(charts, indicators, sector_name, sink, changes)
+    if not rows_written:
+        raise RuntimeError(f"No chart data found for {sector_name}")
+    print(f"[OK] Completed fetching {sector_name}: {rows_written} rows extracted")
+    return rows_written
+
+
+def scrape_all_sectors_http(
+    output_dir: str | Path | None = None,
+    base_url: str = BASE_URL,
+    endpoint: str | None = None,
+    record_dir: str | Path | None = None,
+    replay_dir: str | Path | None = None,
+    output_format: str = "csv",
+    sectors: list[str] | None = None,
+    themes: list[str] | None = None,
+    indicators: list[str] | None = None,
+    years: list[str] | None = None,
+    detect_changes: bool = True,
+):
+    """Browserless counterpart of scrape_all_sectors, writes the same files (and takes the same selection).
+
+    record_dir saves every exchange as a recording; replay_dir serves such a recording with ReplayServer and runs against
+    it instead of base_url's host.
+    """
+    project_root = Path(__file__).resolve().parent.parent
+    output_path = Path(output_dir) if output_dir else project_root / "staging_data"
+    output_path.mkdir(parents=True, exist_ok=True)
+    started = time.perf_counter()
+
+    replay = ReplayServer(replay_dir) if replay_dir else None
+    if replay:
+        base_url = replay.start() + (urlsplit(base_url).path or "/database")
+    client = PortalHttpClient(base_url, record_dir=record_dir)
+    fingerprints = FingerprintStore(output_path / "fingerprints.json") if detect_changes else None
+    summaries = []
+    try:
+        page_html = client.get(client.database_path)
+        endpoint = endpoint or discover_data_endpoint(client, page_html)
+        print(f"Using data endpoint: {endpoint}")
+
+        selection = {"themes": themes, "indicators": indicators, "years": years}
+        for sector in [sector for sector in SECTORS if not sectors or sector in sectors]:
+            sink = open_sector_sink(sector, output_path, output_format, selection_tag(**selection))
+            changes = open_sector_changes(sector, output_path, fingerprints, output_format, selection) if fingerprints else None
+            error = None
+            try:
+                scrape_sector_http(client, endpoint, page_html, sector, sink, years, themes, indicators, changes)
+            except Exception as e:
+                print(f"[ERROR] Error fetching sector {sector}: {e}")
+                error = e
+            summaries.append(finish_sector(sector, sink, selection=selection, changes=changes, error=error))
+    finally:
+        client.close()
+        if replay:
+            replay.stop()
+
+    print_run_summary(summaries, time.perf_counter() - started)
+    print(f"  HTTP requests: {client.requests_made}, {client.bytes_received / 1024:.0f} KiB received")
+    return summaries
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="EXPERIMENTAL: fetch the Africa Energy Portal database charts without a browser. The form fields are "
+        "only checked against the mock portal, use scrape.py for real runs."
+    )
+    parser.add_argument("--output-dir", help="Where to write the sector CSVs (default: staging_data)")
+    parser.add_argument("--base-url", default=BASE_URL, help="Database page url (default: the portal's)")
+    parser.add_argument("--record-dir", help="Save every request and response here")
+    parser.add_argument("--replay-dir", help="Replay a recorded session instead of calling the portal")
+    parser.add_argument("--sectors", nargs="+", choices=SECTORS, help="Only fetch these sectors")
+    parser.add_argument(
+        "--experimental", action="store_true",
+        help="Call --base-url even though the form fields are unverified against the live portal (not needed with --replay-dir)",
+    )
+    args = parser.parse_args(argv)
+    if not (args.experimental or args.replay_dir):
+        parser.error("the HTTP mode is experimental and unverified against the live portal, pass --experimental to run it")
+    return args
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    scrape_all_sectors_http(
+        output_dir=args.output_dir,
+        base_url=args.base_url,
+        record_dir=args.record_dir,
+        replay_dir=args.replay_dir,
+        sectors=args.sectors,
+    )
@@ -0,0 +1,279 @@
+"""
+Offline chart extraction from saved or fetched page sources, no browser needed.
+
+The page is parsed once with lxml. Indicator metadata comes from the .indicator-select inputs, chart data from (in this order)
+1. the chart payload the scraper embeds when it saves a page (<script type="application/json" id="aep-chart-payload">),
+2. inline Highcharts configurations (Highcharts.chart(...) / new Highcharts.Chart(...) with categories and series),
+3. Highcharts export-data tables (table.highcharts-data-table).
+Rows are built by build_chart_frame, so they match extract_chart_data exactly.
+
+extract_rows_from_html(html, sector) returns the rows as a DataFrame together with the indicator and chart counts,
+extract_rows_from_file(path) infers the sector from the file name (e.g. energy_page_source.html) when it is not given.
+Run the module with one or more html files to backfill sector CSVs.
+"""
+
+import argparse
+import json
+import re
+from pathlib import Path
+
+from lxml import html as lxml_html
+
+try:
+    from .scrape import PAYLOAD_SCRIPT_ID, SECTORS, build_chart_frame, indicator_metric, save_sector_data
+except ImportError:  # Fallback when running as a script
+    from scrape import PAYLOAD_SCRIPT_ID, SECTORS, build_chart_frame, indicator_metric, save_sector_data
+
+HIGHCHARTS_CALL = re.compile(r"(?:Highcharts\.(?:chart|Chart|stockChart)\s*\(|new\s+Highcharts\.Chart\s*\()")
+UNQUOTED_KEY = re.compile(r"([{,]\s*)([A-Za-z_$][\w$]*)\s*:")
+TRAILING_COMMA = re.compile(r",\s*([}\]])")
+
+
+def parse_document(page_source):
+    return lxml_html.fromstring(page_source)
+
+
+def parse_indicators(doc, sector_name, themes=None):
+    """Indicator metadata for one sector, in page order, from the .indicator-select inputs."""
+    indicators = []
+    for ind in doc.xpath("//input[contains(concat(' ', normalize-space(@class), ' '), ' indicator-select ')]"):
+        if ind.get("main-grouping") != sector_name:
+            continue
+        theme = ind.get("data-theme") or ""
+        if themes and theme not in themes:
+            continue
+        label = ind.get("value") or ""
+        indicators.append(
+            {"label": label, "metric": indicator_metric(label), "unit": ind.get("data-unit") or "", "theme": theme}
+        )
+    return indicators
+
+
+def _balanced_object(text, start):
+    """The {...} literal starting at text[start], respecting strings."""
+    depth = 0
+    quote = None
+    escaped = False
+    for position in range(start, len(text)):
+        char = text[position]
+        if quote:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == quote:
+                quote = None
+        elif char in "'\"":
+            quote = char
+        elif char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start:position + 1]
+    return None
+
+
+def _single_to_double_quotes(text):
+    out = []
+    quote = None
+    escaped = False
+    for char in text:
+        if quote == "'":
+            if escaped:
+                out.append("'" if char == "'" else "\\" + char)
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == "'":
+                out.append('"')
+                quote = None
+            elif char == '"':
+                out.append('\\"')
+            else:
+                out.append(char)
+            continue
+        if quote == '"':
+            out.append(char)
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                quote = None
+            continue
+        if char == "'":
+            quote = "'"
+            out.append('"')
+        else:
+            if char == '"':
+                quote = '"'
+            out.append(char)
+    return "".join(out)
+
+
+def js_object_to_python(literal):
+    """Parse a JSON-like JavaScript object literal (unquoted keys, single quotes, trailing commas)."""
+    try:
+        return json.loads(literal)
+    except ValueError:
+        pass
+    relaxed = _single_to_double_quotes(literal)
+    relaxed = UNQUOTED_KEY.sub(r'\1"\2":', relaxed)
+    relaxed = TRAILING_COMMA.sub(r"\1", relaxed)
+    relaxed = re.sub(r"\bundefined\b", "null", relaxed)
+    try:
+        return json.loads(relaxed)
+    except ValueError:
+        return None
+
+
+def _first(value):
+    if isinstance(value, list):
+        return value[0] if value else {}
+    return value or {}
+
+
+def chart_from_highcharts_options(index, options):
+    """Columnar chart (countries, years, values) from a Highcharts options object."""
+    x_axis = _first(options.get("xAxis"))
+    y_axis = _first(options.get("yAxis"))
+    countries = x_axis.get("categories") or []
+    series = options.get("series") or []
+    if not countries or not series:
+        return None
+
+    values = []
+    for item in series:
+        data = item.get("data") or []
+        column = []
+        for country_idx in range(len(countries)):
+            point = data[country_idx] if country_idx < len(data) else None
+            if isinstance(point, dict):
+                point = point.get("y")
+            elif isinstance(point, (list, tuple)):
+                point = point[-1] if point else None
+            column.append(point)
+        values.append(column)
+
+    return {
+        "index": index,
+        "title": (options.get("title") or {}).get("text", ""),
+        "yAxisTitle": (y_axis.get("title") or {}).get("text", ""),
+        "countries": countries,
+        "years": [item.get("name") for item in series],
+        "values": values,
+    }
+
+
+def _number(text):
+    text = (text or "").strip().replace(",", "")
+    if not text:
+        return None
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+
+def charts_from_data_tables(doc):
+    """Columnar charts from Highcharts export-data tables (category column + one column per series)."""
+    charts = []
+    for index, table in enumerate(doc.xpath("//table[contains(@class, 'highcharts-data-table')]")):
+        header = [cell.text_content().strip() for cell in table.xpath(".//thead//tr[last()]/*")]
+        if len(header) < 2:
+            continue
+        countries = []
+        columns = [[] for _ in header[1:]]
+        for row in table.xpath(".//tbody/tr"):
+            cells = [cell.text_content() for cell in row.xpath("./th|./td")]
+            if not cells:
+                continue
+            countries.append(cells[0].strip())
+            for column, cell in zip(columns, cells[1:] + [""] * (len(header) - len(cells))):
+                column.append(_number(cell))
+        caption = table.xpath("string(./caption)").strip()
+        charts.append(
+            {"index": index, "title": caption, "yAxisTitle": "", "countries": countries, "years": header[1:], "values": columns}
+        )
+    return charts
+
+
+def extract_charts(doc):
+    """Columnar chart payload from a parsed page, plus the embedded indicator list when there is one."""
+    embedded = doc.xpath(f"//script[@id='{PAYLOAD_SCRIPT_ID}']")
+    if embedded:
+        payload = json.loads(embedded[0].text or "{}")
+        return payload.get("charts") or [], payload.get("indicators")
+
+    charts = []
+    for script in doc.xpath("//script[not(@src)]"):
+        source = script.text or ""
+        for match in HIGHCHARTS_CALL.finditer(source):
+            brace = source.find("{", match.end())
+            literal = _balanced_object(source, brace) if brace != -1 else None
+            options = js_object_to_python(literal) if literal else None
+            chart = chart_from_highcharts_options(len(charts), options) if isinstance(options, dict) else None
+            if chart:
+                charts.append(chart)
+    if charts:
+        return charts, None
+
+    return charts_from_data_tables(doc), None
+
+
+def extract_rows_from_html(page_source, sector_name):
+    """Same rows as extract_chart_data, from a page source instead of a live browser.
+
+    Returns (rows, counts) with counts = {"indicators": ..., "charts": ...} found on the page.
+    """
+    doc = parse_document(page_source)
+    charts, embedded_indicators = extract_charts(doc)
+
+    if embedded_indicators is not None:
+        indicators = [
+            {"label": label, "metric": indicator_metric(label), "unit": unit, "theme": theme}
+            for label, unit, theme in embedded_indicators
+        ]
+    else:
+        indicators = parse_indicators(doc, sector_name)
+
+    counts = {"indicators": len(indicators), "charts": len(charts)}
+    return build_chart_frame(charts, indicators, sector_name), counts
+
+
+def sector_from_filename(path):
+    stem = Path(path).stem.lower()
+    for sector in SECTORS:
+        if stem.startswith(sector.lower().replace(" ", "_")):
+            return sector
+    return None
+
+
+def extract_rows_from_file(path, sector_name=None):
+    sector_name = sector_name or sector_from_filename(path)
+    if not sector_name:
+        raise ValueError(f"Cannot tell the sector of {path}; pass it explicitly")
+    page_source = Path(path).read_text(encoding="utf-8")
+    rows, counts = extract_rows_from_html(page_source, sector_name)
+    return sector_name, rows, counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Re-extract sector CSVs from saved database page sources.")
+    parser.add_argument("pages", nargs="+", help="Saved page source files")
+    parser.add_argument("--sector", choices=SECTORS, help="Sector of the pages (default: from the file name)")
+    parser.add_argument("--output-dir", default=str(Path(__file__).resolve().parent.parent / "staging_data"))
+    args = parser.parse_args(argv)
+
+    output_path = Path(args.output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+    for page in args.pages:
+        sector_name, rows, counts = extract_rows_from_file(page, args.sector)
+        print(f"\nExtracting {sector_name} offline from {page}")
+        print(f"  Found {counts['indicators']} indicators and {counts['charts']} charts")
+        save_sector_data(sector_name, rows, output_path)
+
+
+if __name__ == "__main__":
+    main()
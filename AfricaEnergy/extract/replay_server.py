@@ -0,0 +1,123 @@
+"""
+Record/replay support for the browserless extractor.
+
+recording_key(method, path, body) names a recorded exchange, the HTTP client writes recordings under that name and the
+replay server looks them up the same way, so a recorded run can be replayed byte for byte.
+save_recording()/load_recording() read and write one exchange as JSON (method, path, body, status, content_type, response).
+ReplayServer serves a directory of recordings on localhost so http_extract can be exercised offline, start() returns the base url.
+"""
+
+import hashlib
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlsplit
+
+
+def recording_key(method, path, body=""):
+    raw = f"{method.upper()} {path}\n{body or ''}".encode("utf-8")
+    return hashlib.sha1(raw).hexdigest()[:16]
+
+
+def save_recording(recordings_dir, method, path, body, status, content_type, response_text):
+    recordings_dir = Path(recordings_dir)
+    recordings_dir.mkdir(parents=True, exist_ok=True)
+    record_file = recordings_dir / f"{recording_key(method, path, body)}.json"
+    record = {
+        "method": method.upper(),
+        "path": path,
+        "body": body or "",
+        "status": status,
+        "content_type": content_type,
+        "response": response_text,
+    }
+    with record_file.open("w", encoding="utf-8") as fh:
+        json.dump(record, fh)
+    return record_file
+
+
+def load_recording(recordings_dir, method, path, body=""):
+    record_file = Path(recordings_dir) / f"{recording_key(method, path, body)}.json"
+    if not record_file.exists():
+        return None
+    with record_file.open(encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+class _ReplayHandler(BaseHTTPRequestHandler):
+    recordings_dir = None
+
+    def _replay(self, method):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length).decode("utf-8") if length else ""
+        parts = urlsplit(self.path)
+        path = parts.path + (f"?{parts.query}" if parts.query else "")
+
+        record = load_recording(self.recordings_dir, method, path, body)
+        if record is None:
+            self.send_error(404, f"No recording for {method} {path}")
+            return
+
+        payload = record["response"].encode("utf-8")
+        self.send_response(record.get("status", 200))
+        self.send_header("Content-Type", record.get("content_type") or "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        self._replay("GET")
+
+    def do_POST(self):
+        self._replay("POST")
+
+    def log_message(self, format, *args):
+        # Keep replayed runs as quiet as live ones
+        pass
+
+
+class ReplayServer:
+    def __init__(self, recordings_dir, host="127.0.0.1", port=0):
+        self.recordings_dir = Path(recordings_dir)
+        self.host = host
+        self.port = port
+        self._server = None
+        self._thread = None
+
+    def start(self):
+        handler = type("ReplayHandler", (_ReplayHandler,), {"recordings_dir": self.recordings_dir})
+        self._server = ThreadingHTTPServer((self.host, self.port), handler)
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        print(f"Replay server serving {self.recordings_dir} on {self.base_url}")
+        return self.base_url
+
+    @property
+    def base_url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+if __name__ == "__main__":
+    import sys
+
+    server = ReplayServer(sys.argv[1] if len(sys.argv) > 1 else "recordings", port=8765)
+    server.start()
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.stop()
@@ -1,18 +1,35 @@
+import argparse
+import json
+import os
 import re
 import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import lru_cache
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
+
+from energy_common.checkpoint import CheckpointStore
+from energy_common.page_cache import PageCache
+from energy_common.retry import RetryScheduler
+from energy_common.row_sink import RowSink, output_path_for
+from energy_common.tracing import Tracer
 try:
-    from .driver import Driver
+    from .driver import Driver, DriverPool
+    from .fingerprints import FingerprintStore, SectorChanges
 except ImportError:  # Fallback when running as a script
-    from driver import Driver
+    from driver import Driver, DriverPool
+    from fingerprints import FingerprintStore, SectorChanges
 from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 
-BASE_URL = "https://africa-energy-portal.org/database"
+# AEP_PORTAL_URL points the scraper at another host, e.g. the local mock portal in benchmarks/
+PORTAL_URL = os.getenv("AEP_PORTAL_URL", "https://africa-energy-portal.org").rstrip("/")
+BASE_URL = f"{PORTAL_URL}/database"
 OUTPUT_FILENAMES = {
     "Electricity": "africa_electricity_data.csv",
     "Energy": "africa_energy_data.csv",
@@ -20,360 +37,637 @@ OUTPUT_FILENAMES = {
 }
 
 
-def scrape_sector_data(driver, sector_name):
-    """Scrape all data for a specific sector"""
-    all_data = []
+def chart_cache_filters(sector_name, themes=None, indicators=None, years=None):
+    """Filter state that identifies a chart payload in the page cache."""
+    filters = {"sector": sector_name, "themes": sorted(themes) if themes else "all", "years": list(years) if years else "all"}
+    if indicators:
+        filters["indicators"] = sorted(indicators)
+    return filters
 
-    print(f"\n{'='*60}")
-    print(f"Starting to scrape sector: {sector_name.upper()}")
-    print(f"{'='*60}\n")
 
-    try:
-        # Select the sector from dropdown (Select2 wrapper around hidden <select>)
-        print(f"Selecting sector: {sector_name}")
+def parse_year_range(text):
+    """'2023-2024' or '2023' -> ['2023', '2024'], limited to the years the portal has."""
+    start, _, end = str(text).partition("-")
+    start, end = int(start), int(end or start)
+    if start > end:
+        start, end = end, start
+    years = [str(year) for year in range(start, end + 1) if str(year) in YEAR_KEYS]
+    if not years:
+        raise ValueError(f"No portal years in {text!r}, expected years between 2000 and 2024")
+    return years
 
-        select_element = WebDriverWait(driver.driver, 30).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "select.maingrouping-select"))
-        )
 
-        current_sector = (select_element.get_attribute("value") or "").strip()
-        print(f"  Current sector: {current_sector or 'Unknown'}")
-
-        if current_sector != sector_name:
-            driver.driver.execute_script(
-                """
-                const select = arguments[0];
-                const target = arguments[1];
-                const option = Array.from(select.options).find(opt => opt.text.trim() === target);
-                if (option) {
-                    select.value = option.value;
-                    select.dispatchEvent(new Event('change', { bubbles: true }));
-                }
-                """,
-                select_element,
-                sector_name,
-            )
+def select_indicators(indicators_metadata, themes=None, indicators=None):
+    """Indicators in the selected themes whose label or metric is one of `indicators` (case-insensitive)."""
+    wanted_themes = {theme.lower() for theme in themes or []}
+    wanted = {name.lower() for name in indicators or []}
+    selected = [
+        indicator
+        for indicator in indicators_metadata
+        if (not wanted_themes or indicator["theme"].lower() in wanted_themes)
+        and (not wanted or indicator["label"].lower() in wanted or indicator["metric"].lower() in wanted)
+    ]
 
-            try:
-                WebDriverWait(driver.driver, 10).until(
-                    lambda drv: drv.find_element(
-                        By.CSS_SELECTOR, ".maingrouping-select + .select2 .select2-selection__rendered"
-                    ).text.strip()
-                    == sector_name
-                )
-                driver.wait(2)
-                print(f"[OK] Sector '{sector_name}' selected via JS dispatch")
-            except TimeoutException:
-                rendered = driver.driver.find_element(
-                    By.CSS_SELECTOR, ".maingrouping-select + .select2 .select2-selection__rendered"
-                ).text.strip()
-                print(f"[WARN] Expected sector '{sector_name}', but dropdown shows '{rendered}'.")
-                if rendered != sector_name:
-                    print(f"[ERROR] Sector '{sector_name}' not confirmed; skipping.")
-                    return all_data
-        else:
-            print(f"[OK] Sector '{sector_name}' already selected")
+    known_themes = {indicator["theme"].lower() for indicator in indicators_metadata}
+    for theme in sorted(wanted_themes - known_themes):
+        print(f"[WARN] Theme '{theme}' not found")
+    known = {indicator["label"].lower() for indicator in selected} | {indicator["metric"].lower() for indicator in selected}
+    for name in sorted(wanted - known):
+        print(f"[WARN] Indicator '{name}' not found in the selected themes")
+    return selected
 
-        # Click "SELECT ALL THEMES" checkbox
-        print("Selecting all themes...")
-        select_all_checkbox = WebDriverWait(driver.driver, 10).until(
-            EC.presence_of_element_located((By.XPATH, f"//input[@class='select-all-themes' and @name='{sector_name}']"))
-        )
-        driver.driver.execute_script("arguments[0].scrollIntoView(true);", select_all_checkbox)
-        
-        if select_all_checkbox.is_selected():
-            driver.driver.execute_script("arguments[0].click();", select_all_checkbox)
-            driver.wait(1)
-        
+
+def selection_tag(themes=None, indicators=None, years=None):
+    """Short file name tag for a partial selection ('' when everything is selected)."""
+    parts = []
+    if themes:
+        parts.append("-".join(sorted(theme.lower().replace(" ", "_") for theme in themes)))
+    if indicators:
+        parts.append(f"{len(indicators)}_indicators")
+    if years:
+        parts.append(f"{years[0]}-{years[-1]}" if len(years) > 1 else str(years[0]))
+    return "_".join(parts)
+
+
+def select_sector_indicators(driver, sector_name, themes=None, indicators=None):
+    """Tick only the indicator checkboxes in the selection; returns how many are ticked."""
+    available = [
+        {"label": label, "metric": indicator_metric(label), "unit": unit, "theme": theme}
+        for label, unit, theme in driver.driver.execute_script(LIST_INDICATORS_SCRIPT, sector_name) or []
+    ]
+    selected = select_indicators(available, themes, indicators)
+    if not selected:
+        return 0
+
+    select_all_checkbox = WebDriverWait(driver.driver, 10).until(
+        EC.presence_of_element_located((By.XPATH, f"//input[@class='select-all-themes' and @name='{sector_name}']"))
+    )
+    if select_all_checkbox.is_selected():
         driver.driver.execute_script("arguments[0].click();", select_all_checkbox)
-        driver.wait(2)
-        print("[OK] All themes selected")
+        driver.wait_until(lambda drv: not select_all_checkbox.is_selected(), "themes unchecked", timeout=5)
 
-        # Select ALL years before clicking APPLY
-        print("Selecting all years (2000-2024)...")
-        try:
-            # Find and click the year filter label to open dropdown
-            year_filter_label = WebDriverWait(driver.driver, 10).until(
-                EC.element_to_be_clickable((By.XPATH, "//div[contains(@class, 'year-filter-field')]//a[contains(@class, 'filter-field-label')]"))
+    labels = [indicator["label"] for indicator in selected]
+    driver.wait_until(
+        lambda drv: drv.execute_script(SET_INDICATORS_SCRIPT, sector_name, labels) == len(labels),
+        "indicators checked",
+        timeout=5,
+    )
+    driver.wait_for_ajax_idle(label="indicators applied")
+    return len(labels)
+
+
+def select_years(driver, years=None):
+    """Tick "All" years, or only `years` when given."""
+    label = "all years (2000-2024)" if not years else ", ".join(years)
+    print(f"Selecting {label}...")
+    try:
+        # Find and click the year filter label to open dropdown
+        year_filter_label = WebDriverWait(driver.driver, 10).until(
+            EC.element_to_be_clickable((By.XPATH, "//div[contains(@class, 'year-filter-field')]//a[contains(@class, 'filter-field-label')]"))
+        )
+        driver.driver.execute_script("arguments[0].scrollIntoView(true);", year_filter_label)
+        driver.driver.execute_script("arguments[0].click();", year_filter_label)
+
+        if years:
+            driver.wait_until(
+                lambda drv: sorted(drv.execute_script(SET_YEARS_SCRIPT, list(years)) or []) == sorted(years),
+                "years checked",
+                timeout=10,
             )
-            driver.driver.execute_script("arguments[0].scrollIntoView(true);", year_filter_label)
-            driver.driver.execute_script("arguments[0].click();", year_filter_label)
-            driver.wait(2)
-            
+            print(f"[OK] Years selected: {label}")
+        else:
             # Find and click "All" checkbox for years
-            year_all_checkbox = driver.driver.find_element(By.XPATH, 
-                "//div[contains(@class, 'year-filter-field')]//span[@class='checkbox-label' and text()='All']/preceding-sibling::input"
+            year_all_checkbox = driver.wait_until(
+                lambda drv: drv.find_element(By.XPATH,
+                    "//div[contains(@class, 'year-filter-field')]//span[@class='checkbox-label' and text()='All']/preceding-sibling::input"
+                ),
+                "year dropdown",
+                timeout=10,
             )
-            
+
             # First uncheck if already checked (to ensure clean state)
             if year_all_checkbox.is_selected():
                 driver.driver.execute_script("arguments[0].click();", year_all_checkbox)
-                driver.wait(1)
-            
+                driver.wait_until(lambda drv: not year_all_checkbox.is_selected(), "years unchecked", timeout=5)
+
             # Then check it to select all years
             driver.driver.execute_script("arguments[0].click();", year_all_checkbox)
-            driver.wait(2)
+            driver.wait_until(lambda drv: year_all_checkbox.is_selected(), "years checked", timeout=5)
             print("[OK] All years selected")
-            
-            # Close the year dropdown
-            driver.driver.execute_script("arguments[0].click();", year_filter_label)
-            driver.wait(1)
-        except Exception as e:
-            print(f"[WARN] Could not select all years: {e}")
-            print("  Continuing anyway...")
 
-        # Click APPLY button
-        print("Clicking APPLY button...")
-        apply_button = WebDriverWait(driver.driver, 10).until(
-            EC.element_to_be_clickable((By.CLASS_NAME, "apply-btn"))
+        # Close the year dropdown
+        driver.driver.execute_script("arguments[0].click();", year_filter_label)
+    except Exception as e:
+        print(f"[WARN] Could not select {label}: {e}")
+        print("  Continuing anyway...")
+
+
+def select_sector(driver, sector_name):
+    """Pick the sector in the Select2 dropdown; returns False when the page does not confirm it."""
+    # Select the sector from dropdown (Select2 wrapper around hidden <select>)
+    print(f"Selecting sector: {sector_name}")
+
+    select_element = WebDriverWait(driver.driver, 30).until(
+        EC.presence_of_element_located((By.CSS_SELECTOR, "select.maingrouping-select"))
+    )
+
+    current_sector = (select_element.get_attribute("value") or "").strip()
+    print(f"  Current sector: {current_sector or 'Unknown'}")
+
+    if current_sector == sector_name:
+        print(f"[OK] Sector '{sector_name}' already selected")
+        return True
+
+    driver.driver.execute_script(
+        """
+        const select = arguments[0];
+        const target = arguments[1];
+        const option = Array.from(select.options).find(opt => opt.text.trim() === target);
+        if (option) {
+            select.value = option.value;
+            select.dispatchEvent(new Event('change', { bubbles: true }));
+        }
+        """,
+        select_element,
+        sector_name,
+    )
+
+    try:
+        driver.wait_for_select2("select.maingrouping-select", sector_name, label="sector select2")
+        driver.wait_for_ajax_idle(label="sector change")
+        print(f"[OK] Sector '{sector_name}' selected via JS dispatch")
+    except TimeoutException:
+        rendered = driver.driver.find_element(
+            By.CSS_SELECTOR, ".maingrouping-select + .select2 .select2-selection__rendered"
+        ).text.strip()
+        print(f"[WARN] Expected sector '{sector_name}', but dropdown shows '{rendered}'.")
+        if rendered != sector_name:
+            print(f"[ERROR] Sector '{sector_name}' not confirmed; skipping.")
+            return False
+    return True
+
+
+def select_all_themes(driver, sector_name):
+    """Click "SELECT ALL THEMES" so every indicator of the sector is ticked."""
+    print("Selecting all themes...")
+    select_all_checkbox = WebDriverWait(driver.driver, 10).until(
+        EC.presence_of_element_located((By.XPATH, f"//input[@class='select-all-themes' and @name='{sector_name}']"))
+    )
+    driver.driver.execute_script("arguments[0].scrollIntoView(true);", select_all_checkbox)
+
+    if select_all_checkbox.is_selected():
+        driver.driver.execute_script("arguments[0].click();", select_all_checkbox)
+        driver.wait_until(lambda drv: not select_all_checkbox.is_selected(), "themes unchecked", timeout=5)
+
+    driver.driver.execute_script("arguments[0].click();", select_all_checkbox)
+    driver.wait_until(lambda drv: select_all_checkbox.is_selected(), "themes checked", timeout=5)
+    driver.wait_for_ajax_idle(label="themes applied")
+    print("[OK] All themes selected")
+
+
+def apply_filters(driver):
+    """Click APPLY so the page loads the charts for the ticked filters."""
+    print("Clicking APPLY button...")
+    apply_button = WebDriverWait(driver.driver, 10).until(
+        EC.element_to_be_clickable((By.CLASS_NAME, "apply-btn"))
+    )
+    driver.driver.execute_script("arguments[0].scrollIntoView(true);", apply_button)
+    driver.driver.execute_script("arguments[0].click();", apply_button)
+    print("[OK] APPLY button clicked, waiting for data to load...")
+
+
+def wait_for_sector_charts(driver, sector_name):
+    """Wait for the charts to be populated and stop changing (all years can take a while)."""
+    try:
+        WebDriverWait(driver.driver, 30).until(
+            EC.presence_of_element_located((By.CLASS_NAME, "highcharts-container"))
         )
-        driver.driver.execute_script("arguments[0].scrollIntoView(true);", apply_button)
-        driver.driver.execute_script("arguments[0].click();", apply_button)
-        driver.wait(8)  # Increased wait time for all years to load
-        print("[OK] APPLY button clicked, waiting for data to load...")
+        driver.wait_for_charts(label="charts after APPLY", timeout=60)
+        print("[OK] Charts loaded successfully")
+        driver.report_page_weight(f"{sector_name} charts")
+        return True
+    except Exception as e:
+        print(f"[ERROR] Charts did not load: {e}")
+        return False
+
+
+def scrape_sector_data(driver, sector_name, sink, themes=None, indicators=None, years=None, changes=None):
+    """Scrape all data for a specific sector, pushing rows into sink chart by chart.
+
+    themes, indicators and years narrow the selection; only those checkboxes are ticked, so the
+    page renders (and transfers) just the selected charts. Returns the number of rows written, and raises when the
+    sector could not be scraped completely so the caller can drop the partial rows (see finish_sector).
+    With changes (a SectorChanges) rows of new or changed indicators are also written to the delta file.
+    Every phase is timed as a span on driver.tracer.
+    """
+    rows_written = 0
+    cache_filters = chart_cache_filters(sector_name, themes, indicators, years)
+    tracer = driver.tracer
+
+    print(f"\n{'='*60}")
+    print(f"Starting to scrape sector: {sector_name.upper()}")
+    print(f"{'='*60}\n")
+
+    with tracer.span("sector", sector=sector_name):
+        if driver.cache:
+            with tracer.span("cache lookup"):
+                payload = driver.cache.get_json(BASE_URL, cache_filters)
+            if payload:
+                age = driver.cache.age(BASE_URL, cache_filters) or 0
+                print(f"[CACHE] Using cached chart data for {sector_name}, stored {age / 3600:.1f}h ago (not refetched)")
+                with tracer.span("row build"):
+                    rows_written = write_payload_rows(payload, sector_name, sink, changes)
+                print(f"\n[OK] Completed scraping {sector_name}: {rows_written} rows extracted")
+                return rows_written
 
-        # Wait for chart to appear
         try:
-            WebDriverWait(driver.driver, 30).until(
-                EC.presence_of_element_located((By.CLASS_NAME, "highcharts-container"))
-            )
-            print("[OK] Charts loaded successfully")
+            with tracer.span("sector select"):
+                if not select_sector(driver, sector_name):
+                    raise RuntimeError(f"Sector '{sector_name}' not confirmed")
+
+            if themes or indicators:
+                print("Selecting indicators...")
+                with tracer.span("indicator select"):
+                    selected = select_sector_indicators(driver, sector_name, themes, indicators)
+                if not selected:
+                    raise RuntimeError(f"No indicators selected for {sector_name}")
+                print(f"[OK] {selected} indicators selected")
+            else:
+                with tracer.span("theme select"):
+                    select_all_themes(driver, sector_name)
+
+            # Select the years before clicking APPLY
+            with tracer.span("year select"):
+                select_years(driver, years)
+
+            with tracer.span("apply"):
+                apply_filters(driver)
+
+            with tracer.span("chart load"):
+                if not wait_for_sector_charts(driver, sector_name):
+                    raise RuntimeError(f"Charts did not load for {sector_name}")
+
+            # Extract data from charts
+            print("\nExtracting data from charts...")
+            rows_written = extract_chart_data(driver, sector_name, sink, cache_filters, changes)
+            if not rows_written:
+                raise RuntimeError(f"No chart data found for {sector_name}")
+
+            print(f"\n[OK] Completed scraping {sector_name}: {rows_written} rows extracted")
+
+        except TimeoutException as e:
+            debug_dir = Path(__file__).resolve().parent.parent / "staging_data" / "debug"
+            debug_file = save_page_source(driver, debug_dir / f"{sector_name.lower().replace(' ', '_')}_page_source.html")
+            print(f"[ERROR] Timed out locating selectors for {sector_name}. Saved page source to {debug_file}")
+            raise
         except Exception as e:
-            print(f"[ERROR] Charts did not load: {e}")
-            return all_data
-
-        # Extract data from charts
-        print("\nExtracting data from charts...")
-        chart_data = extract_chart_data(driver, sector_name)
-        
-        all_data.extend(chart_data)
-
-        print(f"\n[OK] Completed scraping {sector_name}: {len(all_data)} rows extracted")
-
-    except TimeoutException as e:
-        debug_dir = Path(__file__).resolve().parent.parent / "staging_data" / "debug"
-        debug_dir.mkdir(parents=True, exist_ok=True)
-        debug_file = debug_dir / f"{sector_name.lower().replace(' ', '_')}_page_source.html"
-        with debug_file.open("w", encoding="utf-8") as fh:
-            fh.write(driver.driver.page_source)
-        print(f"[ERROR] Timed out locating selectors for {sector_name}. Saved page source to {debug_file}")
-        return all_data
-    except Exception as e:
-        print(f"[ERROR] Error scraping sector {sector_name}: {e}")
-        import traceback
-        traceback.print_exc()
+            print(f"[ERROR] Error scraping sector {sector_name}: {e}")
+            import traceback
+            traceback.print_exc()
+            raise
 
-    return all_data
+    return rows_written
 
 
-def extract_chart_data(driver, sector_name):
-    """Extract data from all Highcharts on the page"""
-    all_rows = []
-    
-    # Get all selected indicators with their metadata
-    indicators_metadata = []
-    try:
-        selected_indicators = driver.driver.find_elements(By.CSS_SELECTOR, ".indicator-select:checked")
-        for ind in selected_indicators:
-            indicator_label = ind.get_attribute("value") or ""
-            unit = ind.get_attribute("data-unit") or ""
-            theme = ind.get_attribute("data-theme") or ""
-            
-            # Extract metric from label (text before parenthesis)
-            if "(" in indicator_label:
-                metric = indicator_label.split("(")[0].strip()
-                # Remove trailing dashes
-                metric = metric.rstrip(" -")
-            else:
-                metric = indicator_label
-            
-            indicators_metadata.append({
-                "label": indicator_label,
-                "metric": metric,
-                "unit": unit,
-                "theme": theme
-            })
-        print(f"  Found {len(indicators_metadata)} selected indicators")
-    except Exception as e:
-        print(f"  Warning: Could not extract indicator metadata: {e}")
-    
-    # Enhanced JavaScript to extract chart data and gets all years
-    extract_script = """
-    var allData = [];
-    if (Highcharts && Highcharts.charts) {
-        Highcharts.charts.forEach(function(chart, chartIndex) {
-            if (!chart || !chart.series || chart.series.length === 0) return;
-            
-            var chartTitle = chart.title ? chart.title.textStr : '';
-            var yAxisTitle = chart.yAxis && chart.yAxis[0] && chart.yAxis[0].axisTitle 
-                ? chart.yAxis[0].axisTitle.textStr 
-                : '';
-            
-            var hasCategories = chart.xAxis && chart.xAxis[0] && chart.xAxis[0].categories && chart.xAxis[0].categories.length > 0;
-            var categories = hasCategories ? chart.xAxis[0].categories : [];
-            
-            // Countries on X-axis (categories), Years as series
-            if (hasCategories && categories.length > 0) {
-                categories.forEach(function(country, countryIndex) {
-                    var yearData = {};
-                    
-                    // Iterate through ALL series (each series is a year)
-                    chart.series.forEach(function(series) {
-                        if (series.data && series.data[countryIndex]) {
-                            var point = series.data[countryIndex];
-                            if (point && point.y !== null && point.y !== undefined) {
-                                var year = series.name;
-                                yearData[year] = point.y;
-                            }
-                        }
-                    });
-                    
-                    // Only add if we have data for this country
-                    if (Object.keys(yearData).length > 0) {
-                        allData.push({
-                            chartIndex: chartIndex,
-                            chartTitle: chartTitle,
-                            yAxisTitle: yAxisTitle,
-                            country: country,
-                            yearData: yearData
-                        });
-                    }
+# Every indicator checkbox of one sector as [label, unit, theme]
+LIST_INDICATORS_SCRIPT = """
+var sector = arguments[0];
+return Array.prototype.filter.call(
+    document.querySelectorAll('.indicator-select'),
+    function(input) { return input.getAttribute('main-grouping') === sector; }
+).map(function(input) {
+    return [input.value || '', input.getAttribute('data-unit') || '', input.getAttribute('data-theme') || ''];
+});
+"""
+
+# Tick exactly the given indicators of a sector (clicking fires the widget's change handlers), returns how many are ticked
+SET_INDICATORS_SCRIPT = """
+var sector = arguments[0], wanted = arguments[1], checked = 0;
+document.querySelectorAll('.indicator-select').forEach(function(input) {
+    if (input.getAttribute('main-grouping') !== sector) return;
+    var want = wanted.indexOf(input.value) !== -1;
+    if (input.checked !== want) input.click();
+    if (input.checked) checked++;
+});
+return checked;
+"""
+
+# Tick exactly the given years in the year dropdown, returns the ticked years
+SET_YEARS_SCRIPT = """
+var wanted = arguments[0];
+var field = document.querySelector('.year-filter-field');
+if (!field) return [];
+var all = field.querySelector('.custom-dropdown-select-all');
+if (all && all.checked) all.click();
+var inputs = field.querySelectorAll("input[name='Year']");
+inputs.forEach(function(input) {
+    var want = wanted.indexOf(input.value) !== -1;
+    if (input.checked !== want) input.click();
+});
+return Array.prototype.filter.call(inputs, function(input) { return input.checked; }).map(function(input) { return input.value; });
+"""
+
+# One round trip: indicator metadata plus every chart as countries x years columns
+EXTRACT_SCRIPT = """
+var indicators = Array.prototype.map.call(
+    document.querySelectorAll('.indicator-select:checked'),
+    function(input) {
+        return [
+            input.value || '',
+            input.getAttribute('data-unit') || '',
+            input.getAttribute('data-theme') || ''
+        ];
+    }
+);
+
+var charts = [];
+if (window.Highcharts && Highcharts.charts) {
+    Highcharts.charts.forEach(function(chart, chartIndex) {
+        if (!chart || !chart.series || chart.series.length === 0) return;
+
+        var categories = chart.xAxis && chart.xAxis[0] && chart.xAxis[0].categories
+            ? chart.xAxis[0].categories
+            : [];
+        // Countries on X-axis (categories), Years as series
+        if (categories.length === 0) return;
+
+        charts.push({
+            index: chartIndex,
+            title: chart.title ? chart.title.textStr : '',
+            yAxisTitle: chart.yAxis && chart.yAxis[0] && chart.yAxis[0].axisTitle
+                ? chart.yAxis[0].axisTitle.textStr
+                : '',
+            countries: categories,
+            years: chart.series.map(function(series) { return series.name; }),
+            // values[s][c] is the point for series (year) s and country c, null when missing
+            values: chart.series.map(function(series) {
+                var data = series.data || [];
+                return categories.map(function(_, countryIndex) {
+                    var point = data[countryIndex];
+                    return point && point.y !== null && point.y !== undefined ? point.y : null;
                 });
-            }
+            })
         });
-    }
-    return allData;
-    """
-    
+    });
+}
+return {indicators: indicators, charts: charts};
+"""
+
+PAYLOAD_SCRIPT_ID = "aep-chart-payload"
+
+
+def save_page_source(driver, path):
+    """Save the current page source with the chart payload embedded, so it can be re-extracted offline."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    page_source = driver.driver.page_source
     try:
-        chart_data_list = driver.driver.execute_script(extract_script)
-        
-        if not chart_data_list:
-            print("  [ERROR] No chart data found")
-            return all_rows
-        
-        print(f"  Found {len(chart_data_list)} country-indicator combinations")
-        
-        # Group data by chart index
-        charts_by_index = {}
-        for data in chart_data_list:
-            chart_idx = data.get("chartIndex", 0)
-            if chart_idx not in charts_by_index:
-                charts_by_index[chart_idx] = []
-            charts_by_index[chart_idx].append(data)
-        
-        # Create country serial mapping that resets for each indicator
-        country_serial_map = {}
-        
-        # Process each chart
-        for chart_idx, chart_countries_list in sorted(charts_by_index.items()):
-            # Get indicator metadata for this chart
-            if chart_idx < len(indicators_metadata):
-                indicator = indicators_metadata[chart_idx]
-                sub_sector = indicator["theme"]
-                sub_sub_sector = indicator["label"]
-                metric = indicator["metric"]
-                unit = indicator["unit"]
-            else:
-                # Fallback to chart title
-                sample_data = chart_countries_list[0]
-                chart_title = sample_data.get("chartTitle")
-                unit = sample_data.get("yAxisTitle", "")
-                
-                # Handle None chart_title
-                if chart_title and "(" in chart_title:
-                    metric = chart_title.split("(")[0].strip().rstrip(" -")
-                    sub_sub_sector = chart_title
-                elif chart_title:
-                    metric = chart_title
-                    sub_sub_sector = chart_title
-                else:
-                    metric = "Unknown"
-                    sub_sub_sector = "Unknown"
-                
-                sub_sector = "Unknown"
-            
-            print(f"    Processing Chart {chart_idx + 1}: {sub_sub_sector}")
-            
-            # Reset country serial for each indicator
-            indicator_key = f"{sub_sector}_{metric}_{unit}"
-            if indicator_key not in country_serial_map:
-                country_serial_map[indicator_key] = {}
-            
-            country_counter = 1
-            
-            # Process each country in this chart
-            for data in chart_countries_list:
-                country = data.get("country", "Unknown")
-                year_data = data.get("yearData", {})
-                
-                # Assign country serial (resets after 55 countries)
-                if country not in country_serial_map[indicator_key]:
-                    country_serial_map[indicator_key][country] = country_counter
-                    country_counter += 1
-                    if country_counter > 55:
-                        country_counter = 1
-                
-                country_serial = country_serial_map[indicator_key][country]
-                
-                # Initialize row
-                row_dict = {
-                    "country": country,
-                    "country_serial": country_serial,
-                    "metric": metric,
-                    "unit": unit,
-                    "sector": sector_name,
-                    "sub_sector": sub_sector,
-                    "sub_sub_sector": sub_sub_sector,
-                    "source_link": BASE_URL,
-                    "source": "Africa Energy Portal"
-                }
-                
-                # Initialize all year columns with empty values
-                for year in range(2000, 2025):
-                    row_dict[str(year)] = ""
-                
-                # Populate year data
-                for year_str, value in year_data.items():
-                    # Clean year string (remove any extra text)
-                    year_clean = re.search(r'(20\d{2})', str(year_str))
-                    if year_clean:
-                        year_key = year_clean.group(1)
-                        if year_key in row_dict:
-                            row_dict[year_key] = value
-                
-                all_rows.append(row_dict)
-                
-                # Log with year info
-                years_with_data = [y for y in year_data.keys()]
-                if years_with_data:
-                    print(f"      [OK] {country} (serial: {country_serial}): {len(years_with_data)} years")
-    
+        payload = driver.driver.execute_script(EXTRACT_SCRIPT) or {}
+    except Exception:
+        payload = {}
+
+    if payload.get("charts"):
+        embedded = json.dumps(payload).replace("</", "<\\/")
+        script = f'<script type="application/json" id="{PAYLOAD_SCRIPT_ID}">{embedded}</script>'
+        if "</body>" in page_source:
+            page_source = page_source.replace("</body>", script + "</body>", 1)
+        else:
+            page_source += script
+
+    with path.open("w", encoding="utf-8") as fh:
+        fh.write(page_source)
+    return path
+
+
+YEAR_PATTERN = re.compile(r"(20\d{2})")
+YEAR_COLUMNS = [str(year) for year in range(2000, 2025)]
+YEAR_KEYS = set(YEAR_COLUMNS)
+YEAR_INDEX = {year: idx for idx, year in enumerate(YEAR_COLUMNS)}
+
+
+def indicator_metric(indicator_label):
+    """Metric name is the label text before the unit in parentheses."""
+    if "(" in indicator_label:
+        # Remove trailing dashes
+        return indicator_label.split("(")[0].strip().rstrip(" -")
+    return indicator_label
+
+
+def series_year(series_name):
+    """Map a series name such as '2019' or 'Year 2019' to its year column, or None."""
+    year_clean = YEAR_PATTERN.search(str(series_name))
+    if year_clean and year_clean.group(1) in YEAR_KEYS:
+        return year_clean.group(1)
+    return None
+
+
+@lru_cache(maxsize=1024)
+def series_year_index(series_name):
+    """Year column index of a series name, or None. Cached: every chart of a sector repeats the same series names."""
+    year = series_year(series_name)
+    return YEAR_INDEX[year] if year else None
+
+
+def extract_chart_data(driver, sector_name, sink, cache_filters=None, changes=None):
+    """Extract data from all Highcharts on the page into sink, returns the number of rows written"""
+    try:
+        with driver.tracer.span("js extraction"):
+            payload = driver.driver.execute_script(EXTRACT_SCRIPT) or {}
     except Exception as e:
         print(f"  [ERROR] Error extracting chart data: {e}")
-        import traceback
-        traceback.print_exc()
-    
-    return all_rows
+        raise
 
+    if driver.cache and payload.get("charts"):
+        with driver.tracer.span("cache store"):
+            # No validators: the base page's ETag says nothing about the chart data, so payloads expire with the TTL
+            driver.cache.put_json(BASE_URL, payload, cache_filters or chart_cache_filters(sector_name), kind="charts")
 
-def scrape_all_sectors(output_dir: str | Path | None = None, headless: bool = False):
-    """Main function to scrape all sectors."""
-    sectors = ["Electricity", "Energy", "Social and Economic"]
-    project_root = Path(__file__).resolve().parent.parent
-    output_path = Path(output_dir) if output_dir else project_root / "staging_data"
-    output_path.mkdir(parents=True, exist_ok=True)
+    with driver.tracer.span("row build"):
+        return write_payload_rows(payload, sector_name, sink, changes)
+
+
+def payload_indicators(payload):
+    """Indicator metadata from a payload shaped like EXTRACT_SCRIPT's return value."""
+    # Get all selected indicators with their metadata
+    indicators_metadata = [
+        {"label": label, "metric": indicator_metric(label), "unit": unit, "theme": theme}
+        for label, unit, theme in payload.get("indicators") or []
+    ]
+    print(f"  Found {len(indicators_metadata)} selected indicators")
+    return indicators_metadata
+
+
+def payload_frame(payload, sector_name):
+    """Rows for one sector from a payload shaped like EXTRACT_SCRIPT's return value."""
+    return build_chart_frame(payload.get("charts") or [], payload_indicators(payload), sector_name)
 
-    driver = Driver()
-    driver.setup_driver(headless=headless)
 
+def write_payload_rows(payload, sector_name, sink, changes=None):
+    """Stream the rows of a payload into sink, returns the number of rows written."""
+    return write_chart_rows(payload.get("charts") or [], payload_indicators(payload), sector_name, sink, changes)
+
+
+def build_chart_frame(charts, indicators_metadata, sector_name):
+    """Turn the columnar chart payload into one DataFrame with one row per country and chart."""
+    return blocks_to_frame(list(iter_chart_blocks(charts, indicators_metadata, sector_name)), sector_name)
+
+
+def write_chart_rows(charts, indicators_metadata, sector_name, sink, changes=None):
+    """Push each chart's rows into sink as soon as the chart is processed, and through changes when tracking them."""
+    rows_written = 0
+    for block in iter_chart_blocks(charts, indicators_metadata, sector_name):
+        frame = blocks_to_frame([block], sector_name)
+        sink.write_frame(frame)
+        if changes is not None:
+            changes.observe(block, frame)
+        rows_written += len(block["country"])
+    return rows_written
+
+
+def chart_indicator(chart, indicators_metadata):
+    """(sub_sector, sub_sub_sector, metric, unit) of a chart, from the indicator list or the chart title."""
+    chart_idx = chart.get("index", 0)
+    if chart_idx < len(indicators_metadata):
+        indicator = indicators_metadata[chart_idx]
+        return indicator["theme"], indicator["label"], indicator["metric"], indicator["unit"]
+
+    # Fallback to chart title
+    chart_title = chart.get("title")
+    unit = chart.get("yAxisTitle", "")
+    if chart_title:
+        return "Unknown", chart_title, indicator_metric(chart_title), unit
+    return "Unknown", "Unknown", "Unknown", unit
+
+
+def chart_values(chart):
+    """(series x country) float matrix of a chart; nulls and series shorter than the country list are NaN."""
+    countries = chart.get("countries") or []
+    values = chart.get("values") or []
+    matrix = np.full((len(values), len(countries)), np.nan)
+    for series_idx, series_values in enumerate(values):
+        series_values = np.asarray(series_values[: len(countries)], dtype=float)
+        matrix[series_idx, : len(series_values)] = series_values
+    return matrix
+
+
+def iter_chart_blocks(charts, indicators_metadata, sector_name):
+    """Yield one block per chart: the countries with data, their serials, the chart metadata and a (country x year) value
+    matrix. Callers never hold a whole sector, and values stay in NumPy until the DataFrame is built."""
+    if not charts:
+        print("  [ERROR] No chart data found")
+        return
+
+    total_rows = 0
+
+    # Create country serial mapping that resets for each indicator
+    country_serial_map = {}
+
+    # Process each chart
+    for chart in sorted(charts, key=lambda chart: chart.get("index", 0)):
+        sub_sector, sub_sub_sector, metric, unit = chart_indicator(chart, indicators_metadata)
+        print(f"    Processing Chart {chart.get('index', 0) + 1}: {sub_sub_sector}")
+
+        countries = chart.get("countries") or []
+        series_names = chart.get("years") or []
+        matrix = chart_values(chart)[: len(series_names)]
+        present = ~np.isnan(matrix)
+        points = present.sum(axis=0)
+
+        # Scatter each series (year) into its year column; a later series for the same year only fills its non-null cells
+        year_values = np.full((len(countries), len(YEAR_COLUMNS)), np.nan)
+        for series_idx, series_name in enumerate(series_names[: len(matrix)]):
+            year_idx = series_year_index(series_name)
+            if year_idx is not None:
+                mask = present[series_idx]
+                year_values[mask, year_idx] = matrix[series_idx, mask]
+
+        # Only add countries we have data for
+        keep = np.flatnonzero(points)
+
+        # Reset country serial for each indicator
+        indicator_key = f"{sub_sector}_{metric}_{unit}"
+        serials = country_serial_map.setdefault(indicator_key, {})
+        country_counter = 1
+        kept_countries = [countries[idx] for idx in keep]
+        kept_serials = np.empty(len(keep), dtype=np.int64)
+        for position, (country, country_points) in enumerate(zip(kept_countries, points[keep])):
+            # Assign country serial (resets after 55 countries)
+            if country not in serials:
+                serials[country] = country_counter
+                country_counter += 1
+                if country_counter > 55:
+                    country_counter = 1
+            kept_serials[position] = serials[country]
+            print(f"      [OK] {country} (serial: {serials[country]}): {country_points} years")
+
+        total_rows += len(keep)
+        yield {
+            "chart": chart.get("index", 0),
+            "country": kept_countries,
+            "country_serial": kept_serials,
+            "metric": metric,
+            "unit": unit,
+            "sub_sector": sub_sector,
+            "sub_sub_sector": sub_sub_sector,
+            "values": year_values[keep],
+        }
+
+    print(f"  Found {total_rows} country-indicator combinations")
+
+
+def blocks_to_frame(blocks, sector_name):
+    """Build the DataFrame for a list of chart blocks in one step, laid out on COLUMNS."""
+    if not blocks:
+        return pd.DataFrame(columns=COLUMNS)
+    sizes = [len(block["country"]) for block in blocks]
+    data = {
+        "country": [country for block in blocks for country in block["country"]],
+        "country_serial": np.concatenate([block["country_serial"] for block in blocks]),
+        "sector": sector_name,
+        "source_link": BASE_URL,
+        "source": "Africa Energy Portal",
+    }
+    for key in ("metric", "unit", "sub_sector", "sub_sub_sector"):
+        data[key] = np.repeat(np.array([block[key] for block in blocks], dtype=object), sizes)
+    values = np.vstack([block["values"] for block in blocks])
+    data.update(zip(YEAR_COLUMNS, values.T))
+    return pd.DataFrame(data, columns=COLUMNS)
+
+
+SECTORS = ["Electricity", "Energy", "Social and Economic"]
+COLUMNS = [
+    "country",
+    "country_serial",
+    "metric",
+    "unit",
+    "sector",
+    "sub_sector",
+    "sub_sub_sector",
+    "source_link",
+    "source",
+] + YEAR_COLUMNS
+
+
+def measure_lean_savings(driver):
+    """Load the base page once without and once with blocking and log what the lean profile saves."""
+    print("Measuring lean profile savings on the base page (loads it twice)...")
     try:
-        # Navigate to the database page
-        print(f"Navigating to {BASE_URL}")
+        with driver.tracer.span("lean savings"):
+            driver.measure_lean_savings(BASE_URL, label="base page")
+    except Exception as e:
+        print(f"[WARN] Could not measure lean savings: {e}")
+
+
+def open_base_page(driver):
+    """Load the database page and dismiss the cookie banner if it shows up."""
+    print(f"Navigating to {BASE_URL}")
+    with driver.tracer.span("base page"):
         driver.driver.get(BASE_URL)
-        driver.wait(3)
+        driver.wait_for_page_ready(label="base page")
+    driver.track_page()
 
-        # Handle cookie banner
+    # Handle cookie banner
+    with driver.tracer.span("cookie banner"):
         try:
             cookie_button = WebDriverWait(driver.driver, 5).until(
                 EC.element_to_be_clickable(
@@ -387,65 +681,461 @@ def scrape_all_sectors(output_dir: str | Path | None = None, headless: bool = Fa
             )
             driver.driver.execute_script("arguments[0].click();", cookie_button)
             print("[OK] Cookie banner closed")
-            driver.wait(2)
+            driver.wait_until(EC.invisibility_of_element(cookie_button), "cookie banner", timeout=5)
         except Exception:
             print("No cookie banner found")
 
-        # Scrape each sector
-        for sector in sectors:
-            sector_data = scrape_sector_data(driver, sector)
-
-            if sector_data:
-                # Convert to DataFrame
-                df = pd.DataFrame(sector_data)
-
-                # Ensure all year columns exist
-                for year in range(2000, 2025):
-                    if str(year) not in df.columns:
-                        df[str(year)] = ""
-
-                # Reorder columns
-                columns = [
-                    "country",
-                    "country_serial",
-                    "metric",
-                    "unit",
-                    "sector",
-                    "sub_sector",
-                    "sub_sub_sector",
-                    "source_link",
-                    "source",
-                ] + [str(year) for year in range(2000, 2025)]
-                df = df[columns]
-
-                # Save to CSV
-                output_filename = OUTPUT_FILENAMES.get(
-                    sector, f"africa_energy_{sector.lower().replace(' ', '_')}_data.csv"
+    driver.report_page_weight("base page")
+
+
+def sector_output_file(sector, output_path, output_format="csv", tag=""):
+    """The sector's output file; a partial selection gets its tag in the name so it never overwrites the full file."""
+    output_filename = OUTPUT_FILENAMES.get(
+        sector, f"africa_energy_{sector.lower().replace(' ', '_')}_data.csv"
+    )
+    output_file = Path(output_path) / output_filename
+    if tag:
+        output_file = output_file.with_name(f"{output_file.stem}_{tag}{output_file.suffix}")
+    return output_path_for(output_file, output_format)
+
+
+def open_sector_sink(sector, output_path, output_format="csv", tag=""):
+    """Streaming sink for one sector's rows, laid out on COLUMNS; the file is only replaced once the sector finishes."""
+    return RowSink(
+        sector_output_file(sector, output_path, output_format, tag),
+        columns=COLUMNS,
+        fmt=output_format,
+        track=("country", "metric", "sub_sector"),
+        atomic=True,
+    )
+
+
+def open_sector_changes(sector, output_path, fingerprints, output_format="csv", selection=None):
+    """Change tracking for one sector against the fingerprints of the previous run (see fingerprints.py)."""
+    selection = selection or {}
+    sector_file = sector_output_file(sector, output_path, output_format, selection_tag(**selection))
+    delta_file = sector_file.with_name(f"{sector_file.stem}_changes{sector_file.suffix}")
+    report_file = sector_file.with_name(f"{sector_file.stem}_changes.json")
+    # A delta left over from an earlier run would look like this run's changes
+    for stale in (delta_file, report_file):
+        stale.unlink(missing_ok=True)
+    delta_sink = RowSink(delta_file, columns=COLUMNS, fmt=output_format, atomic=True)
+    return SectorChanges(fingerprints, checkpoint_unit(sector, selection), delta_sink, report_file)
+
+
+def close_sector_sink(sector, sink):
+    """Close a sector's sink and return a summary dict for the run report."""
+    sink.close()
+    summary = {"sector": sector, "rows": 0, "countries": 0, "metrics": 0, "file": None}
+
+    if not sink.rows_written:
+        print(f"\n[ERROR] No data collected for {sector}\n")
+        return summary
+
+    print(f"\n[OK] Saved {sector} data to {sink.path} ({sink.rows_written} rows)\n")
+
+    # Print summary
+    print(f"Summary for {sector}:")
+    print(f"  - Unique countries: {sink.unique_count('country')}")
+    print(f"  - Unique metrics: {sink.unique_count('metric')}")
+    print(f"  - Sub-sectors: {sorted(sink.unique['sub_sector'])}")
+
+    summary.update(
+        rows=sink.rows_written,
+        countries=sink.unique_count("country"),
+        metrics=sink.unique_count("metric"),
+        file=str(sink.path),
+    )
+    return summary
+
+
+def save_sector_data(sector, sector_data, output_path, output_format="csv"):
+    """Write one sector's rows (a DataFrame or a list of dicts) to its file and return a summary dict for the run report."""
+    sink = open_sector_sink(sector, output_path, output_format)
+    if isinstance(sector_data, pd.DataFrame):
+        sink.write_frame(sector_data)
+    else:
+        sink.write_rows(sector_data)
+    return close_sector_sink(sector, sink)
+
+
+def print_run_summary(summaries, elapsed):
+    """Print one merged summary table covering every scraped sector."""
+    print("\n" + "=" * 60)
+    print("Run summary")
+    print("=" * 60)
+    for summary in summaries:
+        status = "OK" if summary["rows"] else "EMPTY"
+        changed = summary.get("changed_indicators")
+        print(
+            f"  [{status}] {summary['sector']}: {summary['rows']} rows, "
+            f"{summary['countries']} countries, {summary['metrics']} metrics"
+            f"{f', {changed} changed indicators' if changed is not None else ''}"
+            f"{' -> ' + summary['file'] if summary['file'] else ''}"
+        )
+    total_rows = sum(summary["rows"] for summary in summaries)
+    print(f"  Total: {total_rows} rows in {elapsed:.1f}s")
+
+
+def checkpoint_unit(sector, selection=None):
+    """Checkpoint unit of a sector; partial selections are tracked apart from full scrapes."""
+    tag = selection_tag(**(selection or {}))
+    return f"{sector} [{tag}]" if tag else sector
+
+
+def finish_sector(sector, sink, checkpoint=None, selection=None, changes=None, error=None):
+    """Close a sector's sink and, if it finished cleanly with rows, store its fingerprints and checkpoint it as done.
+
+    With error (the exception the scrape raised) the partial rows are dropped, and the previous sector file and
+    fingerprints stay as they were.
+    """
+    if error is not None:
+        sink.abort()
+        if changes is not None:
+            changes.abort()
+        print(f"\n[ERROR] {sector} failed, kept the previous {sink.path.name}: {error}\n")
+        return {"sector": sector, "rows": 0, "countries": 0, "metrics": 0, "file": None}
+    summary = close_sector_sink(sector, sink)
+    if changes is not None:
+        # An empty scrape must not wipe the fingerprints the next run compares against
+        report = changes.close(save=bool(summary["rows"]))
+        summary["changed_indicators"] = len(report["changed"]) + len(report["new"])
+    if checkpoint and summary["rows"]:
+        checkpoint.mark_done(checkpoint_unit(sector, selection), **summary)
+    return summary
+
+
+def _scrape_sector_in_pool(
+    pool, sector, output_path, checkpoint=None, output_format="csv", selection=None, fingerprints=None, breaker=None,
+):
+    """Worker task: scrape one sector on its own browser from the pool."""
+    selection = selection or {}
+    changes = open_sector_changes(sector, output_path, fingerprints, output_format, selection) if fingerprints else None
+    error = None
+    with open_sector_sink(sector, output_path, output_format, selection_tag(**selection)) as sink:
+        try:
+            # Wait out an open circuit before taking a browser, so a paused sector does not hold one from the others
+            if breaker:
+                breaker.acquire(BASE_URL)
+            with pool.acquire() as driver:
+                # The base page is loaded below anyway, a recycled session needs no restore
+                driver.recycle_if_needed()
+                open_base_page(driver)
+                scrape_sector_data(driver, sector, sink, **selection, changes=changes)
+        except Exception as e:
+            error = e
+        summary = finish_sector(sector, sink, checkpoint, selection, changes, error)
+    if error is not None:
+        raise error
+    return summary
+
+
+def record_sector_result(retries, sector, error=None):
+    """A sector whose scrape raised failed; the scheduler queues it again unless it used up its attempts."""
+    if error is None:
+        retries.record_success(sector, BASE_URL)
+    else:
+        retries.record_failure(sector, error, BASE_URL)
+
+
+def scrape_sectors_parallel(
+    sectors, output_path, headless=False, max_workers=3, cache=None, checkpoint=None, lean=False, blocked_patterns=None,
+    output_format="csv", selection=None, tracer=None, recycle_pages=None, memory_limit_mb=None, fingerprints=None,
+    retries=None, measure_lean=False,
+):
+    """Scrape each sector in its own browser, at most max_workers at a time.
+
+    Failed sectors are submitted again once their backoff has passed, next to the sectors still running.
+    """
+    workers = max(1, min(max_workers, len(sectors)))
+    print(f"Scraping {len(sectors)} sectors in parallel with {workers} browser(s)")
+    retries = retries or RetryScheduler()
+
+    pool = DriverPool(
+        size=workers, headless=headless, cache=cache, lean=lean, blocked_patterns=blocked_patterns, tracer=tracer,
+        recycle_pages=recycle_pages, memory_limit_mb=memory_limit_mb,
+    )
+    summaries = {}
+    try:
+        if measure_lean:
+            # Once per run, on the first pool driver; it goes back to the pool for the sectors afterwards
+            with pool.acquire() as driver:
+                measure_lean_savings(driver)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            def submit(sector):
+                return executor.submit(
+                    _scrape_sector_in_pool, pool, sector, output_path, checkpoint, output_format, selection, fingerprints,
+                    retries.breaker,
                 )
-                output_file = output_path / output_filename
-                df.to_csv(output_file, index=False)
-                print(f"\n[OK] Saved {sector} data to {output_file} ({len(df)} rows)\n")
-
-                # Print summary
-                print(f"Summary for {sector}:")
-                print(f"  - Unique countries: {df['country'].nunique()}")
-                print(f"  - Unique metrics: {df['metric'].nunique()}")
-                print(f"  - Sub-sectors: {df['sub_sector'].unique().tolist()}")
-            else:
-                print(f"\n[ERROR] No data collected for {sector}\n")
 
-            # Navigate back to base page for next sector
-            if sector != sectors[-1]:
-                print("\nNavigating back to base page for next sector...")
-                driver.driver.get(BASE_URL)
-                driver.wait(5)
+            futures = {submit(sector): sector for sector in sectors}
+            while futures or retries.pending():
+                if futures:
+                    done, _ = wait(futures, timeout=retries.next_due_in(), return_when=FIRST_COMPLETED)
+                else:
+                    time.sleep(retries.next_due_in() or 0)
+                    done = ()
+                for future in done:
+                    sector = futures.pop(future)
+                    error = None
+                    try:
+                        summaries[sector] = future.result()
+                    except Exception as e:
+                        print(f"[ERROR] Worker for {sector} failed: {e}")
+                        summaries[sector] = {"sector": sector, "rows": 0, "countries": 0, "metrics": 0, "file": None}
+                        error = e
+                    record_sector_result(retries, sector, error)
+                for sector in retries.due():
+                    futures[submit(sector)] = sector
+    finally:
+        pool.close()
+
+    return [summaries[sector] for sector in sectors]
+
+
+def scrape_sectors_sequential(
+    sectors, output_path, headless=False, cache=None, checkpoint=None, lean=False, blocked_patterns=None,
+    debugger_address=None, profile_dir=None, output_format="csv", selection=None, tracer=None,
+    recycle_pages=None, memory_limit_mb=None, fingerprints=None, retries=None, measure_lean=False,
+):
+    """Scrape the sectors one after another on a single browser.
 
+    Failed sectors go back in the queue once their backoff has passed, behind the sectors still waiting.
+    """
+    selection = selection or {}
+    retries = retries or RetryScheduler()
+    summaries = {}
+    driver = Driver(cache=cache, tracer=tracer, recycle_pages=recycle_pages, memory_limit_mb=memory_limit_mb)
+    with driver.tracer.span("browser start"):
+        driver.setup_driver(
+            headless=headless, lean=lean, blocked_patterns=blocked_patterns,
+            debugger_address=debugger_address, profile_dir=profile_dir,
+        )
+
+    try:
+        if measure_lean:
+            measure_lean_savings(driver)
+
+        # Navigate to the database page
+        open_base_page(driver)
+
+        # Scrape each sector
+        queued = deque(sectors)
+        while queued or retries.pending():
+            if not queued:
+                time.sleep(retries.next_due_in() or 0)
+            queued.extend(retries.due())
+            if not queued:
+                continue
+            sector = queued.popleft()
+
+            retries.breaker.acquire(BASE_URL)
+            changes = open_sector_changes(sector, output_path, fingerprints, output_format, selection) if fingerprints else None
+            error = None
+            with open_sector_sink(sector, output_path, output_format, selection_tag(**selection)) as sink:
+                try:
+                    scrape_sector_data(driver, sector, sink, **selection, changes=changes)
+                except Exception as e:
+                    error = e
+                summaries[sector] = finish_sector(sector, sink, checkpoint, selection, changes, error)
+            record_sector_result(retries, sector, error)
+
+            # Navigate back to base page for next sector, a recycled session is restored with the cookie banner handled
+            if (queued or retries.pending()) and not driver.recycle_if_needed(restore=open_base_page):
+                print("\nNavigating back to base page for next sector...")
+                with driver.tracer.span("base page"):
+                    driver.driver.get(BASE_URL)
+                    driver.wait_for_page_ready(label="base page")
+                driver.track_page()
+                driver.report_page_weight("base page")
     finally:
+        driver.print_wait_summary()
+        driver.print_memory_summary()
         driver.close_driver()
+
+    return [summaries[sector] for sector in sectors if sector in summaries]
+
+
+def scrape_all_sectors(
+    output_dir: str | Path | None = None,
+    headless: bool = False,
+    parallel: bool = False,
+    max_workers: int = 3,
+    cache_dir: str | Path | None = None,
+    cache_ttl: float = 24 * 3600,
+    resume: bool = False,
+    run_id: str | None = None,
+    lean: bool = False,
+    blocked_patterns: list[str] | None = None,
+    debugger_address: str | None = None,
+    profile_dir: str | Path | None = None,
+    output_format: str = "csv",
+    sectors: list[str] | None = None,
+    themes: list[str] | None = None,
+    indicators: list[str] | None = None,
+    years: list[str] | None = None,
+    recycle_pages: int | None = None,
+    memory_limit_mb: float | None = None,
+    detect_changes: bool = True,
+    max_attempts: int = 3,
+    retry_delay: float = 10.0,
+    measure_lean: bool = False,
+):
+    """Main function to scrape all sectors.
+
+    With parallel=True every sector gets its own browser from a DriverPool of at most
+    max_workers drivers, so the run takes roughly as long as the slowest sector.
+    The cache is off unless cache_dir is given; then chart payloads younger than cache_ttl seconds are read from
+    disk instead of the portal, and every sector served that way is logged with the age of its payload.
+    Finished sectors are checkpointed under <output_dir>/checkpoints; resume=True skips the
+    sectors already finished by the latest run (or by run_id).
+    lean=True starts Chrome with the lean profile (eager loading, no images, blocked_patterns
+    or DEFAULT_BLOCKED_PATTERNS blocked) and reports bytes transferred per page; with measure_lean the base page
+    is also loaded once without blocking at the start of the run to log the bytes the lean profile saves.
+    In sequential mode debugger_address attaches to a long-lived browser (see startup.py) and
+    profile_dir keeps a warm Chrome profile; parallel workers always start their own browsers.
+    Rows are streamed to the sector files chart by chart; output_format is "csv", "jsonl" or "parquet".
+    sectors, themes, indicators (labels or metric names) and years (e.g. parse_year_range("2023-2024"))
+    limit the run to those checkboxes, e.g. themes=["Access"], years=["2023", "2024"] for a quick
+    refresh. Partial selections are written to tagged files (africa_electricity_data_access_2023-2024.csv)
+    next to the full ones.
+    Phase timings are written to <output_dir>/traces/<run_id>.jsonl and summarised at the end of the run.
+    recycle_pages and memory_limit_mb restart a browser session between sectors once it loaded that many pages or
+    its processes use more memory than that; peak memory and recycles are reported per browser.
+    With detect_changes every indicator is fingerprinted and compared with the previous run (<output_dir>/fingerprints.json);
+    rows of new or changed indicators also go to <sector file>_changes.<ext>, with a _changes.json report next to it.
+    A sector that failed (the scrape raised, e.g. the charts did not load or yielded no rows) is retried up to
+    max_attempts times with exponential backoff from retry_delay seconds, alongside the remaining sectors; repeated
+    failures open a circuit that pauses requests to the portal. Sectors that still failed are listed in
+    <output_dir>/checkpoints/<run_id>/failed.json, and resume=True re-runs only those.
+    """
+    project_root = Path(__file__).resolve().parent.parent
+    output_path = Path(output_dir) if output_dir else project_root / "staging_data"
+    output_path.mkdir(parents=True, exist_ok=True)
+    started = time.perf_counter()
+    cache = PageCache(cache_dir, ttl=cache_ttl) if cache_dir else None
+    if cache:
+        print(f"[CACHE] Chart cache on: {cache.root}, payloads younger than {cache_ttl / 3600:g}h are reused")
+    checkpoint = CheckpointStore(output_path / "checkpoints", run_id=run_id, resume=resume)
+    tracer = Tracer(output_path / "traces" / f"{checkpoint.run_id}.jsonl")
+    fingerprints = FingerprintStore(output_path / "fingerprints.json") if detect_changes else None
+    retries = RetryScheduler(max_attempts=max_attempts, base_delay=retry_delay)
+
+    unknown = sorted(set(sectors or []) - set(SECTORS))
+    if unknown:
+        raise ValueError(f"Unknown sector(s) {unknown}, expected some of {SECTORS}")
+    wanted_sectors = [sector for sector in SECTORS if not sectors or sector in sectors]
+    selection = {"themes": themes or None, "indicators": indicators or None, "years": list(years) if years else None}
+    if measure_lean and not lean:
+        print("[WARN] measure_lean only applies to the lean profile, skipping the measurement")
+        measure_lean = False
+    if selection_tag(**selection):
+        print(f"Selection: {', '.join(f'{key}={value}' for key, value in selection.items() if value)}")
+
+    done = {
+        sector: checkpoint.unit_info(checkpoint_unit(sector, selection))
+        for sector in wanted_sectors
+        if checkpoint.is_done(checkpoint_unit(sector, selection))
+    }
+    sectors = [sector for sector in wanted_sectors if sector not in done]
+    for sector in done:
+        print(f"[SKIP] {sector} already finished in run {checkpoint.run_id}")
+
+    summaries = []
+    try:
+        if not sectors:
+            print("All sectors already finished, nothing to scrape.")
+        elif parallel:
+            summaries = scrape_sectors_parallel(
+                sectors, output_path, headless=headless, max_workers=max_workers, cache=cache, checkpoint=checkpoint,
+                lean=lean, blocked_patterns=blocked_patterns, output_format=output_format, selection=selection,
+                tracer=tracer, recycle_pages=recycle_pages, memory_limit_mb=memory_limit_mb, fingerprints=fingerprints,
+                retries=retries, measure_lean=measure_lean,
+            )
+        else:
+            summaries = scrape_sectors_sequential(
+                sectors, output_path, headless=headless, cache=cache, checkpoint=checkpoint,
+                lean=lean, blocked_patterns=blocked_patterns,
+                debugger_address=debugger_address, profile_dir=profile_dir, output_format=output_format,
+                selection=selection, tracer=tracer, recycle_pages=recycle_pages, memory_limit_mb=memory_limit_mb,
+                fingerprints=fingerprints, retries=retries, measure_lean=measure_lean,
+            )
+    finally:
         print("\n" + "=" * 60)
         print("Scraping completed!")
         print("=" * 60)
+        if cache:
+            cache.print_stats()
+        retries.write_report(checkpoint.run_dir / "failed.json")
+        tracer.print_summary()
+        tracer.close()
+        if tracer.spans:
+            print(f"Phase traces written to {tracer.path}")
+
+    by_sector = {summary["sector"]: summary for summary in summaries}
+    for sector, info in done.items():
+        by_sector[sector] = {key: info.get(key) for key in ("sector", "rows", "countries", "metrics", "file")}
+    summaries = [by_sector[sector] for sector in SECTORS if sector in by_sector]
+
+    print_run_summary(summaries, time.perf_counter() - started)
+    return summaries
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Scrape the Africa Energy Portal database page into staging CSVs.")
+    parser.add_argument("--output-dir", help="Where to write the sector CSVs (default: staging_data)")
+    parser.add_argument("--headless", action="store_true", help="Run Chrome without a window")
+    parser.add_argument("--workers", type=int, default=1, help="Scrape sectors in parallel with this many browsers")
+    parser.add_argument("--resume", action="store_true", help="Skip sectors finished by the previous run")
+    parser.add_argument("--cache-dir", help="Reuse chart payloads cached in this directory (off by default)")
+    parser.add_argument(
+        "--cache-ttl-hours", type=float, default=24, help="Maximum age of a cached chart payload (with --cache-dir)"
+    )
+    parser.add_argument("--lean", action="store_true", help="Block images, fonts and trackers to load pages faster")
+    parser.add_argument(
+        "--measure-lean", action="store_true", help="With --lean, log the bytes saved on the base page once per run"
+    )
+    parser.add_argument("--attach", metavar="HOST:PORT", help="Attach to a long-lived browser started by startup.py")
+    parser.add_argument("--profile-dir", help="Reuse this Chrome profile directory between runs")
+    parser.add_argument("--format", choices=["csv", "jsonl", "parquet"], default="csv", help="Output file format")
+    parser.add_argument("--sectors", nargs="+", choices=SECTORS, help="Only scrape these sectors")
+    parser.add_argument("--themes", nargs="+", help="Only tick the indicators of these themes (e.g. Access)")
+    parser.add_argument("--indicators", nargs="+", help="Only tick these indicators (label or metric name)")
+    parser.add_argument("--years", type=parse_year_range, help="Year or year range to tick, e.g. 2023-2024")
+    parser.add_argument("--run-id", help="Checkpoint run to create or resume (default: new, or latest with --resume)")
+    parser.add_argument("--recycle-pages", type=int, help="Restart a browser session after this many page loads")
+    parser.add_argument("--memory-limit-mb", type=float, help="Restart a browser session above this much memory (MiB)")
+    parser.add_argument("--max-attempts", type=int, default=3, help="Attempts per sector before giving up")
+    parser.add_argument("--retry-delay", type=float, default=10.0, help="Seconds before the first retry, doubled each time")
+    parser.add_argument(
+        "--no-change-detection", action="store_true", help="Do not fingerprint indicators or write the _changes files"
+    )
+    return parser.parse_args(argv)
 
 
 if __name__ == "__main__":
-    scrape_all_sectors()
+    args = parse_args()
+    scrape_all_sectors(
+        output_dir=args.output_dir,
+        headless=args.headless,
+        parallel=args.workers > 1,
+        max_workers=args.workers,
+        cache_dir=args.cache_dir,
+        cache_ttl=args.cache_ttl_hours * 3600,
+        resume=args.resume,
+        run_id=args.run_id,
+        lean=args.lean,
+        debugger_address=args.attach,
+        profile_dir=args.profile_dir,
+        output_format=args.format,
+        sectors=args.sectors,
+        themes=args.themes,
+        indicators=args.indicators,
+        years=args.years,
+        recycle_pages=args.recycle_pages,
+        memory_limit_mb=args.memory_limit_mb,
+        detect_changes=not args.no_change_detection,
+        max_attempts=args.max_attempts,
+        retry_delay=args.retry_delay,
+        measure_lean=args.measure_lean,
+    )
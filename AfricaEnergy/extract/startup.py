@@ -0,0 +1,126 @@
+"""
+Fast browser startup.
+
+resolve_chromedriver() finds the chromedriver binary once and remembers it in DRIVER_CACHE_FILE, so later runs skip
+ChromeDriverManager's version lookup and download. CHROMEDRIVER_PATH overrides the lookup entirely.
+launch_persistent_browser() starts a long-lived Chrome with a remote debugging port and a persistent profile; scraper runs
+can attach to it with Driver.setup_driver(debugger_address=...) instead of starting a cold browser every time.
+browser_is_listening(address) tells whether such a browser is up.
+
+Run `python extract/startup.py` to start the long-lived browser, pass --headless to hide it.
+"""
+
+import json
+import os
+import shutil
+import socket
+import subprocess
+import threading
+import time
+from pathlib import Path
+
+from webdriver_manager.chrome import ChromeDriverManager
+
+DRIVER_CACHE_FILE = Path(os.getenv("SCRAPER_DRIVER_CACHE", Path.home() / ".cache" / "africaenergy" / "chromedriver.json"))
+DEFAULT_DEBUGGER_ADDRESS = "127.0.0.1:9222"
+DEFAULT_PROFILE_DIR = Path.home() / ".cache" / "africaenergy" / "chrome-profile"
+CHROME_BINARIES = ["google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome"]
+
+_resolve_lock = threading.Lock()
+_resolved_path = None
+
+
+def _usable(path):
+    return bool(path) and os.path.isfile(path) and os.access(path, os.X_OK)
+
+
+def resolve_chromedriver():
+    """Path to a chromedriver binary, resolved through ChromeDriverManager at most once per machine."""
+    global _resolved_path
+    with _resolve_lock:
+        if _usable(_resolved_path):
+            return _resolved_path
+
+        configured = os.getenv("CHROMEDRIVER_PATH")
+        if _usable(configured):
+            _resolved_path = configured
+            return _resolved_path
+
+        try:
+            cached = json.loads(DRIVER_CACHE_FILE.read_text(encoding="utf-8")).get("path")
+        except (FileNotFoundError, ValueError):
+            cached = None
+        if _usable(cached):
+            _resolved_path = cached
+            return _resolved_path
+
+        started = time.perf_counter()
+        path = ChromeDriverManager().install()
+        print(f"Resolved chromedriver in {time.perf_counter() - started:.1f}s: {path}")
+
+        DRIVER_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        DRIVER_CACHE_FILE.write_text(json.dumps({"path": path, "resolved": time.time()}), encoding="utf-8")
+        _resolved_path = path
+        return _resolved_path
+
+
+def browser_is_listening(address=DEFAULT_DEBUGGER_ADDRESS):
+    host, _, port = address.rpartition(":")
+    try:
+        with socket.create_connection((host or "127.0.0.1", int(port)), timeout=0.5):
+            return True
+    except (OSError, ValueError):
+        return False
+
+
+def find_chrome_binary():
+    configured = os.getenv("CHROME_BINARY")
+    if configured:
+        return configured
+    for name in CHROME_BINARIES:
+        path = shutil.which(name)
+        if path:
+            return path
+    raise FileNotFoundError("Chrome not found; set CHROME_BINARY to the browser executable")
+
+
+def launch_persistent_browser(address=DEFAULT_DEBUGGER_ADDRESS, profile_dir=DEFAULT_PROFILE_DIR, headless=False):
+    """Start a long-lived Chrome that scraper runs can attach to; returns the process (None if one is already up)."""
+    if browser_is_listening(address):
+        print(f"Browser already listening on {address}")
+        return None
+
+    port = address.rpartition(":")[2]
+    Path(profile_dir).mkdir(parents=True, exist_ok=True)
+    args = [
+        find_chrome_binary(),
+        f"--remote-debugging-port={port}",
+        f"--user-data-dir={profile_dir}",
+        "--no-first-run",
+        "--no-default-browser-check",
+        "--disable-dev-shm-usage",
+        "--window-size=1920,1080",
+    ]
+    if headless:
+        args.append("--headless=new")
+    process = subprocess.Popen(args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    deadline = time.monotonic() + 20
+    while not browser_is_listening(address):
+        if time.monotonic() > deadline or process.poll() is not None:
+            process.terminate()
+            raise RuntimeError(f"Chrome did not start listening on {address}")
+        time.sleep(0.2)
+    print(f"Long-lived browser listening on {address} (profile: {profile_dir})")
+    return process
+
+
+if __name__ == "__main__":
+    import sys
+
+    browser = launch_persistent_browser(headless="--headless" in sys.argv[1:])
+    if browser:
+        try:
+            browser.wait()
+        except KeyboardInterrupt:
+            browser.terminate()
@@ -1,4 +1,5 @@
 import os
+import sys
 from pathlib import Path
 
 import certifi
@@ -32,14 +33,42 @@ def main():
     staging_dir = project_root / "staging_data"
     headless_env = os.getenv("SCRAPER_HEADLESS", "").strip().lower()
     headless = headless_env in {"1", "true", "yes", "on"}
+    workers = int(os.getenv("SCRAPER_WORKERS", "1") or 1)
+    # Off by default so scheduled refreshes always fetch; SCRAPER_CACHE=on reuses chart payloads younger than the TTL
+    cache_enabled = os.getenv("SCRAPER_CACHE", "").strip().lower() in {"1", "true", "yes", "on"}
+    cache_dir = Path(os.getenv("SCRAPER_CACHE_DIR") or staging_dir / "cache") if cache_enabled else None
+    cache_ttl = float(os.getenv("SCRAPER_CACHE_TTL_HOURS", "24")) * 3600
+    lean = os.getenv("SCRAPER_LEAN", "").strip().lower() in {"1", "true", "yes", "on"}
+    measure_lean = os.getenv("SCRAPER_MEASURE_LEAN", "").strip().lower() in {"1", "true", "yes", "on"}
+    block_env = os.getenv("SCRAPER_BLOCK_PATTERNS", "").strip()
+    blocked_patterns = [pattern.strip() for pattern in block_env.split(",") if pattern.strip()] if block_env else None
+    debugger_address = os.getenv("SCRAPER_BROWSER_ADDRESS") or None
+    profile_dir = os.getenv("SCRAPER_PROFILE_DIR") or None
+    resume = "--resume" in sys.argv[1:] or os.getenv("SCRAPER_RESUME", "").strip().lower() in {"1", "true", "yes", "on"}
 
     if headless:
         print("Running scraper in headless mode.")
     else:
         print("Running scraper with visible browser window. Set SCRAPER_HEADLESS=true to override.")
 
+    if workers > 1:
+        print(f"Scraping sectors in parallel with up to {workers} browsers (SCRAPER_WORKERS).")
+
     print("Starting extraction...")
-    scrape_all_sectors(output_dir=staging_dir, headless=headless)
+    scrape_all_sectors(
+        output_dir=staging_dir,
+        headless=headless,
+        parallel=workers > 1,
+        max_workers=workers,
+        cache_dir=cache_dir,
+        cache_ttl=cache_ttl,
+        resume=resume,
+        lean=lean,
+        measure_lean=measure_lean,
+        blocked_patterns=blocked_patterns,
+        debugger_address=debugger_address,
+        profile_dir=profile_dir,
+    )
 
     print("Starting load phase...")
     run_loaders(collection)
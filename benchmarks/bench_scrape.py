@@ -0,0 +1,209 @@
+"""
+Scrape throughput benchmark against the local mock portal (mock_portal.py).
+
+Targets
+  sectors-http       AfricaEnergy scrape_all_sectors_http (no browser, experimental: its form fields follow the mock)
+  sectors-browser    AfricaEnergy scrape_all_sectors with headless Chrome
+  countries-http     energytest1 parse_country_page on pages fetched with requests (no browser)
+  countries-browser  energytest1 ComprehensiveAfricaEnergyScraper crawl with headless Chrome
+Browser targets are skipped when Chrome is not installed.
+
+For every target it reports elapsed time, pages/sec, rows/sec and the time spent per route on the mock side (page loads,
+widget script, chart data), so slowdowns can be traced to a phase. --save writes the results as JSON, --baseline compares
+against a saved run and exits with status 1 when a target's rows/sec dropped by more than --tolerance.
+
+    python benchmarks/bench_scrape.py --countries 55 --latency 0.05 --save baseline.json
+    python benchmarks/bench_scrape.py --baseline baseline.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+import requests
+
+from mock_portal import MockPortal, slugify
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+TARGETS = ["sectors-http", "sectors-browser", "countries-http", "countries-browser"]
+PAGE_ROUTES = ("database", "country")
+CHROME_BINARIES = ["google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome"]
+
+
+def chrome_available():
+    return bool(os.getenv("CHROME_BINARY")) or any(shutil.which(name) for name in CHROME_BINARIES)
+
+
+def africa_energy():
+    """AfricaEnergy's extract package, imported after AEP_PORTAL_URL is set."""
+    sys.path.insert(0, str(REPO_ROOT / "AfricaEnergy"))
+    from extract import http_extract, scrape
+
+    return scrape, http_extract
+
+
+def energytest1():
+    sys.path.insert(0, str(REPO_ROOT / "energytest1" / "extract"))
+    import scraper_complete
+
+    return scraper_complete
+
+
+def run_sectors_http(portal, output_dir, args):
+    _, http_extract = africa_energy()
+    summaries = http_extract.scrape_all_sectors_http(output_dir=output_dir, base_url=f"{portal.base_url}/database")
+    return sum(summary["rows"] for summary in summaries)
+
+
+def run_sectors_browser(portal, output_dir, args):
+    scrape, _ = africa_energy()
+    summaries = scrape.scrape_all_sectors(
+        output_dir=output_dir, headless=True, parallel=args.workers > 1, max_workers=args.workers,
+        run_id=f"bench_{int(time.time())}",
+    )
+    return sum(summary["rows"] or 0 for summary in summaries)
+
+
+def run_countries_http(portal, output_dir, args):
+    scraper_complete = energytest1()
+    scraper = scraper_complete.ComprehensiveAfricaEnergyScraper(base_url=portal.base_url)
+    rows = 0
+    with requests.Session() as session:
+        for name in portal.countries:
+            slug = slugify(name)
+            url = f"{scraper.base_url}/aep/country/{slug}"
+            frames = scraper.parse_country_page(session.get(url).text, slug, name, url)
+            rows += sum(len(frame) for frame in frames)
+    return rows
+
+
+def run_countries_browser(portal, output_dir, args):
+    scraper_complete = energytest1()
+    scraper = scraper_complete.ComprehensiveAfricaEnergyScraper(base_url=portal.base_url)
+    scraper.countries = [slugify(name) for name in portal.countries]
+    output_file = Path(output_dir) / "countries.csv"
+    # No politeness limit against the mock: the token bucket never makes a worker wait
+    scraper.scrape_all_countries_concurrent(
+        str(output_file), concurrency=args.workers, rate=1000, burst=max(args.workers, 1)
+    )
+    return len(pd.read_csv(output_file, encoding="utf-8-sig")) if output_file.exists() else 0
+
+
+RUNNERS = {
+    "sectors-http": run_sectors_http,
+    "sectors-browser": run_sectors_browser,
+    "countries-http": run_countries_http,
+    "countries-browser": run_countries_browser,
+}
+
+
+def run_target(target, portal, args):
+    portal.reset_stats()
+    output = io.StringIO()
+    with tempfile.TemporaryDirectory() as output_dir:
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(sys.stdout if args.verbose else output):
+            rows = RUNNERS[target](portal, output_dir, args)
+        elapsed = time.perf_counter() - started
+
+    routes = portal.stats()
+    pages = sum(routes.get(route, {}).get("requests", 0) for route in PAGE_ROUTES)
+    return {
+        "target": target,
+        "elapsed": elapsed,
+        "pages": pages,
+        "rows": rows,
+        "pages_per_sec": pages / elapsed if elapsed else 0.0,
+        "rows_per_sec": rows / elapsed if elapsed else 0.0,
+        "routes": routes,
+    }
+
+
+def print_results(results):
+    print(f"\n{'Target':<20} {'Elapsed':>9} {'Pages':>6} {'Rows':>8} {'Pages/s':>9} {'Rows/s':>10}")
+    for result in results:
+        print(
+            f"{result['target']:<20} {result['elapsed']:>8.2f}s {result['pages']:>6} {result['rows']:>8} "
+            f"{result['pages_per_sec']:>9.2f} {result['rows_per_sec']:>10.0f}"
+        )
+    print("\nTime per phase (mock side):")
+    for result in results:
+        for route, stats in sorted(result["routes"].items()):
+            print(
+                f"  {result['target']:<20} {route:<9} {stats['requests']:>5} requests "
+                f"{stats['bytes'] / 1024:>9.0f} KiB {stats['seconds']:>8.2f}s"
+            )
+
+
+def compare_with_baseline(results, baseline_file, tolerance):
+    """Print the change per target; returns the targets that got slower than tolerance allows."""
+    baseline = {result["target"]: result for result in json.loads(Path(baseline_file).read_text(encoding="utf-8"))["results"]}
+    regressions = []
+    print(f"\nCompared with {baseline_file}:")
+    for result in results:
+        before = baseline.get(result["target"])
+        if not before or not before["rows_per_sec"]:
+            continue
+        change = result["rows_per_sec"] / before["rows_per_sec"] - 1
+        status = "REGRESSION" if change < -tolerance else "OK"
+        print(f"  [{status}] {result['target']}: {before['rows_per_sec']:.0f} -> {result['rows_per_sec']:.0f} rows/s ({change:+.0%})")
+        if status == "REGRESSION":
+            regressions.append(result["target"])
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the scrapers against the local mock portal.")
+    parser.add_argument("--targets", nargs="+", choices=TARGETS, default=TARGETS)
+    parser.add_argument("--countries", type=int, default=55)
+    parser.add_argument("--indicators", type=int, help="Indicators per sector (default: the saved catalogue)")
+    parser.add_argument("--years", type=int, default=25, help="Number of years, counted from 2000")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every page")
+    parser.add_argument("--data-latency", type=float, default=0.0, help="Seconds added to every chart data request")
+    parser.add_argument("--render-delay", type=float, default=0.0, help="Seconds the mock widget takes per chart")
+    parser.add_argument("--workers", type=int, default=1, help="Browsers for the browser targets")
+    parser.add_argument("--save", help="Write the results to this JSON file")
+    parser.add_argument("--baseline", help="Compare with results saved by --save")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed rows/sec drop before a regression")
+    parser.add_argument("--verbose", action="store_true", help="Show the scrapers' own output")
+    args = parser.parse_args(argv)
+
+    portal = MockPortal(
+        countries=args.countries, indicators=args.indicators, years=range(2000, 2000 + args.years),
+        latency=args.latency, data_latency=args.data_latency, render_delay=args.render_delay,
+    )
+    results = []
+    with portal:
+        os.environ["AEP_PORTAL_URL"] = portal.base_url
+        for target in args.targets:
+            if target.endswith("-browser") and not chrome_available():
+                print(f"[SKIP] {target}: Chrome not found (set CHROME_BINARY)")
+                continue
+            print(f"Running {target}...")
+            try:
+                results.append(run_target(target, portal, args))
+            except Exception as e:
+                print(f"[ERROR] {target} failed: {e}")
+
+    print_results(results)
+
+    if args.save:
+        config = {key: value for key, value in vars(args).items() if key not in ("save", "baseline", "verbose")}
+        Path(args.save).write_text(json.dumps({"config": config, "results": results}, indent=2), encoding="utf-8")
+        print(f"\n[OK] Results saved to {args.save}")
+
+    if args.baseline and compare_with_baseline(results, args.baseline, args.tolerance):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,183 @@
+"""
+Replay check for AfricaEnergy's browserless extractor (extract/http_extract.py).
+
+A session is a directory of recordings under benchmarks/recordings/ (the database page, the widget script and one chart
+data POST per sector, see extract/replay_server.py) plus a session.json describing where it was recorded. The check
+serves the session with ReplayServer, runs scrape_all_sectors_http against it and compares the sector files row by row
+with
+  browser  scrape_all_sectors in headless Chrome against the source the session was recorded from (skipped when Chrome
+           is not installed)
+  source   scrape_all_sectors_http against the source itself, so a stale or incomplete recording shows up
+and exits with status 1 when any of them differ.
+
+The shipped session (recordings/mock_portal) was recorded from mock_portal.py, so it pins the form fields and endpoint
+discovery against the mock only; the HTTP mode stays experimental until a session of the live portal is recorded and
+checked the same way:
+
+    python benchmarks/check_replay.py                     # check the shipped session
+    python benchmarks/check_replay.py --record            # re-record it from the mock portal
+    python benchmarks/check_replay.py --record --session live --base-url https://africa-energy-portal.org/database
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from bench_scrape import chrome_available
+from mock_portal import MockPortal
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+RECORDINGS_DIR = Path(__file__).resolve().parent / "recordings"
+DEFAULT_SESSION = "mock_portal"
+# Small enough to keep in the repository: 5 countries, 3 indicators per sector, 5 years
+MOCK_CONFIG = {"countries": 5, "indicators": 3, "years": [2020, 2021, 2022, 2023, 2024], "seed": 0}
+# Sort keys for comparing sector files, the extractors may write charts in a different order
+ROW_KEYS = ["sub_sector", "sub_sub_sector", "metric", "unit", "country"]
+
+
+def africa_energy():
+    """AfricaEnergy's extract package, imported after AEP_PORTAL_URL is set."""
+    sys.path.insert(0, str(REPO_ROOT / "AfricaEnergy"))
+    from extract import http_extract, scrape
+
+    return scrape, http_extract
+
+
+@contextlib.contextmanager
+def source_portal(session):
+    """Database page url of the source a session was recorded from, with the mock portal running for mock sessions.
+
+    AEP_PORTAL_URL is pointed at the source, so the browser run navigates there and every run writes the same source_link.
+    """
+    if session["source"] == "mock":
+        config = session["mock"]
+        with MockPortal(
+            countries=config["countries"], indicators=config["indicators"], years=config["years"], seed=config["seed"]
+        ) as portal:
+            os.environ["AEP_PORTAL_URL"] = portal.base_url
+            yield f"{portal.base_url}/database"
+    else:
+        os.environ["AEP_PORTAL_URL"] = session["base_url"].rsplit("/database", 1)[0]
+        yield session["base_url"]
+
+
+def quiet(verbose):
+    return contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+
+
+def record_session(session, session_dir, url, verbose=False):
+    """Record every exchange of one scrape_all_sectors_http run against url into session_dir."""
+    if session_dir.exists():
+        shutil.rmtree(session_dir)
+    _, http_extract = africa_energy()
+    with tempfile.TemporaryDirectory() as output_dir, quiet(verbose):
+        http_extract.scrape_all_sectors_http(output_dir=output_dir, base_url=url, record_dir=session_dir, detect_changes=False)
+    session["recorded_at"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+    (session_dir / "session.json").write_text(json.dumps(session, indent=2) + "\n", encoding="utf-8")
+    print(f"[OK] Recorded {len(list(session_dir.glob('*.json'))) - 1} exchanges to {session_dir}")
+
+
+def sector_rows(output_dir, scrape):
+    """{sector: rows as text, sorted} for the sector files in output_dir."""
+    rows = {}
+    for sector in scrape.SECTORS:
+        path = Path(output_dir) / scrape.OUTPUT_FILENAMES[sector]
+        if not path.exists():
+            rows[sector] = None
+            continue
+        frame = pd.read_csv(path, dtype=str, keep_default_na=False)
+        rows[sector] = frame.sort_values(ROW_KEYS, kind="stable").reset_index(drop=True)
+    return rows
+
+
+def compare(name, expected, actual):
+    """Print and return the sectors whose rows differ."""
+    differing = []
+    for sector, rows in expected.items():
+        other = actual.get(sector)
+        if rows is None or other is None:
+            status = "same" if rows is None and other is None else "missing file"
+        elif list(rows.columns) != list(other.columns):
+            status = "different columns"
+        elif len(rows) != len(other):
+            status = f"{len(rows)} vs {len(other)} rows"
+        elif not rows.equals(other):
+            status = "values differ"
+        else:
+            status = "same"
+        if status == "same":
+            print(f"  [OK] {name}: {sector} ({0 if rows is None else len(rows)} rows)")
+        else:
+            print(f"  [ERROR] {name}: {sector} {status}")
+            differing.append(sector)
+    return differing
+
+
+def check_session(session, session_dir, url, verbose=False):
+    """Compare the rows replayed from session_dir with the scrapers' rows from url, returns the differing sectors."""
+    print(f"Checking {session_dir.name} ({session['source']}, recorded {session.get('recorded_at', '?')})")
+    failures = []
+    scrape, http_extract = africa_energy()
+    with tempfile.TemporaryDirectory() as work_dir:
+        work_dir = Path(work_dir)
+
+        with quiet(verbose):
+            http_extract.scrape_all_sectors_http(
+                output_dir=work_dir / "replay", base_url=url, replay_dir=session_dir, detect_changes=False
+            )
+        replayed = sector_rows(work_dir / "replay", scrape)
+
+        with quiet(verbose):
+            http_extract.scrape_all_sectors_http(output_dir=work_dir / "source", base_url=url, detect_changes=False)
+        failures += compare("replay vs source", sector_rows(work_dir / "source", scrape), replayed)
+
+        if chrome_available():
+            with quiet(verbose):
+                scrape.scrape_all_sectors(
+                    output_dir=work_dir / "browser", headless=True, run_id="replay_check", detect_changes=False
+                )
+            failures += compare("replay vs browser", sector_rows(work_dir / "browser", scrape), replayed)
+        else:
+            print("  [SKIP] replay vs browser: Chrome not found (set CHROME_BINARY)")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a recorded portal session and compare it with the scrapers.")
+    parser.add_argument("--session", default=DEFAULT_SESSION, help="Session directory under benchmarks/recordings")
+    parser.add_argument("--record", action="store_true", help="Record the session first (from the mock portal by default)")
+    parser.add_argument("--base-url", help="With --record, record this database page instead of the mock portal")
+    parser.add_argument("--verbose", action="store_true", help="Show the scrapers' own output")
+    args = parser.parse_args(argv)
+
+    session_dir = RECORDINGS_DIR / args.session
+    if args.record:
+        session = {"source": "live", "base_url": args.base_url} if args.base_url else {"source": "mock", "mock": MOCK_CONFIG}
+    elif (session_dir / "session.json").exists():
+        session = json.loads((session_dir / "session.json").read_text(encoding="utf-8"))
+    else:
+        print(f"[ERROR] No recorded session in {session_dir}, record one with --record")
+        return 1
+
+    with source_portal(session) as url:
+        if args.record:
+            record_session(session, session_dir, url, args.verbose)
+        failures = check_session(session, session_dir, url, args.verbose)
+    if failures:
+        print("\n[ERROR] Replayed rows differ from the scrapers")
+        return 1
+    print("\n[OK] Replayed rows match")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
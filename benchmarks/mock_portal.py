@@ -0,0 +1,385 @@
+"""
+Local mock of the Africa Energy Portal, for measuring the scrapers without touching the live site.
+
+The indicator catalogue (sector, theme, label, unit) and the country list are read from the saved database pages in
+AfricaEnergy/staging_data/debug/*.html, chart values are synthetic but deterministic (same seed, same numbers).
+MockPortal serves
+  /database                                       database page with the same selectors the Selenium flow uses
+                                                  (Select2 sector select, theme/indicator checkboxes, year dropdown, APPLY)
+  /modules/custom/aepdatabase_mongo/js/database-widget.js
+                                                  widget script: APPLY posts the filters to /database/data and fills
+                                                  Highcharts.charts, the way the real widget does
+  /database/data (POST)                           Highcharts options for the posted sector, indicators and years
+  /aep/country/<slug>                             country profile page with an indicator table and access figures
+countries, indicators (per sector), years size the data; latency delays every page, data_latency the chart data request
+and render_delay the rendering of each chart in the browser. stats() reports requests, bytes and time per route.
+
+Point the scrapers at it with AEP_PORTAL_URL=<base_url> (or base_url= arguments).
+Run `python benchmarks/mock_portal.py --port 8765` to serve it on its own.
+"""
+
+import json
+import random
+import re
+import threading
+import time
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from lxml import html as lxml_html
+
+DEBUG_PAGES_DIR = Path(__file__).resolve().parent.parent / "AfricaEnergy" / "staging_data" / "debug"
+WIDGET_PATH = "/modules/custom/aepdatabase_mongo/js/database-widget.js"
+DATA_PATH = "/database/data"
+SECTORS = ["Electricity", "Energy", "Social and Economic"]
+PORTAL_YEARS = [str(year) for year in range(2000, 2025)]
+
+
+def slugify(name):
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")
+
+
+def load_catalogue(pages_dir=DEBUG_PAGES_DIR):
+    """Indicators [(sector, theme, label, unit)] and country names from the saved database pages."""
+    indicators = {}
+    countries = {}
+    for page in sorted(Path(pages_dir).glob("*.html")):
+        doc = lxml_html.fromstring(page.read_bytes())
+        for ind in doc.xpath("//input[contains(concat(' ', normalize-space(@class), ' '), ' indicator-select ')]"):
+            key = (ind.get("main-grouping") or "", ind.get("value") or "")
+            indicators.setdefault(key, (key[0], ind.get("data-theme") or "", key[1], ind.get("data-unit") or ""))
+        for box in doc.xpath("//input[starts-with(@name, 'country_target_id')]"):
+            name = box.xpath("string(..)").strip()
+            if name:
+                countries.setdefault(name, None)
+    return list(indicators.values()), list(countries)
+
+
+class MockPortal:
+    def __init__(
+        self, countries=55, indicators=None, years=None, latency=0.0, data_latency=0.0, render_delay=0.0,
+        missing=0.1, seed=0, pages_dir=DEBUG_PAGES_DIR, host="127.0.0.1", port=0,
+    ):
+        catalogue, names = load_catalogue(pages_dir)
+        if not names:
+            names = [f"Country {number}" for number in range(1, countries + 1)]
+        while len(names) < countries:
+            names.append(f"Country {len(names) + 1}")
+        self.countries = names[:countries]
+        self.country_by_slug = {slugify(name): name for name in self.countries}
+
+        self.indicators = []
+        for sector in SECTORS:
+            sector_indicators = [item for item in catalogue if item[0] == sector]
+            wanted = len(sector_indicators) if indicators is None else indicators
+            while len(sector_indicators) < wanted:
+                number = len(sector_indicators) + 1
+                sector_indicators.append((sector, "Synthetic", f"Synthetic {sector} indicator {number} (units)", "units"))
+            self.indicators.extend(sector_indicators[:wanted])
+
+        self.years = [str(year) for year in (years or PORTAL_YEARS)]
+        self.latency = latency
+        self.data_latency = data_latency
+        self.render_delay = render_delay
+        self.missing = missing
+        self.seed = seed
+        self.host = host
+        self.port = port
+        self._server = None
+        self._thread = None
+        self._stats_lock = threading.Lock()
+        self._stats = {}
+
+    # Synthetic data
+
+    def value(self, label, country, year):
+        rng = random.Random(f"{self.seed}|{label}|{country}|{year}")
+        if rng.random() < self.missing:
+            return None
+        return round(rng.uniform(0, 100), 2)
+
+    def chart_options(self, sector, labels, years):
+        by_label = {item[2]: item for item in self.indicators if item[0] == sector}
+        years = [year for year in years if year in self.years] or self.years
+        charts = []
+        for label in labels:
+            if label not in by_label:
+                continue
+            _, _, _, unit = by_label[label]
+            charts.append(
+                {
+                    "title": {"text": label},
+                    "yAxis": {"title": {"text": unit}},
+                    "xAxis": {"categories": self.countries},
+                    "series": [
+                        {"name": year, "data": [self.value(label, country, year) for country in self.countries]}
+                        for year in years
+                    ],
+                }
+            )
+        return charts
+
+    # Pages
+
+    def database_page(self):
+        blocks = []
+        for sector in SECTORS:
+            themes = {}
+            for item_sector, theme, label, unit in self.indicators:
+                if item_sector == sector:
+                    themes.setdefault(theme, []).append((label, unit))
+            theme_html = []
+            for theme, items in themes.items():
+                inputs = "".join(
+                    f'<li><label class="checkbox-wrapper"><input type="checkbox" class="indicator-select" '
+                    f'main-grouping="{escape(sector)}" data-unit="{escape(unit)}" value="{escape(label)}" '
+                    f'data-theme="{escape(theme)}" name="{escape(theme)}"><span class="checkbox-label">{escape(label)}</span></label></li>'
+                    for label, unit in items
+                )
+                theme_html.append(
+                    f'<div class="theme"><label><input type="checkbox" class="select-all-ind" name="{escape(theme)}" '
+                    f'main-grouping="{escape(sector)}">{escape(theme)}</label><ul>{inputs}</ul></div>'
+                )
+            hidden = "" if sector == SECTORS[0] else ' style="display:none"'
+            blocks.append(
+                f'<div class="theme-block" data-sector="{escape(sector)}"{hidden}>'
+                f'<label><input type="checkbox" class="select-all-themes" name="{escape(sector)}">SELECT ALL THEMES</label>'
+                f'{"".join(theme_html)}</div>'
+            )
+
+        options = "".join(f'<option value="{escape(sector)}">{escape(sector)}</option>' for sector in SECTORS)
+        years = "".join(
+            f'<li><label class="checkbox-wrapper"><input value="{year}" type="checkbox" data-title="Year" name="Year">'
+            f'<span class="checkbox-label">{year}</span></label></li>'
+            for year in self.years
+        )
+        return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Database | Africa Energy Portal (mock)</title>
+<style>.custom-dropdown-lists{{display:none}}.open .custom-dropdown-lists{{display:block}}</style>
+</head><body>
+<div class="filters">
+<select class="maingrouping-select" style="display:none">{options}</select><span class="select2"><span class="select2-selection__rendered">{SECTORS[0]}</span></span>
+{"".join(blocks)}
+<div class="filter-item-field year-filter-field"><a class="filter-field-label custom-dropdown-label" href="#">Select Year</a>
+<div class="custom-dropdown-lists"><label class="checkbox-wrapper"><input data-name="Year" type="checkbox" class="custom-dropdown-select-all"><span class="checkbox-label">All</span></label>
+<ul class="custom-dropdown-list-field">{years}</ul></div></div>
+<button class="apply-btn" type="button">APPLY</button>
+</div>
+<div id="charts"></div>
+<script src="{WIDGET_PATH}"></script>
+</body></html>"""
+
+    def widget_script(self):
+        return """(function () {
+  var settings = {url: '%(data_path)s', renderDelay: %(render_delay)d};
+  window.Highcharts = window.Highcharts || {charts: []};
+
+  function one(selector, root) { return (root || document).querySelector(selector); }
+  function all(selector, root) { return Array.prototype.slice.call((root || document).querySelectorAll(selector)); }
+  function currentSector() { var select = one('select.maingrouping-select'); return select.options[select.selectedIndex].text; }
+
+  function apply() {
+    var params = ['main_grouping=' + encodeURIComponent(currentSector())];
+    all('.indicator-select:checked').forEach(function (input) { params.push('indicators%%5B%%5D=' + encodeURIComponent(input.value)); });
+    all("input[name='Year']:checked").forEach(function (input) { params.push('years%%5B%%5D=' + encodeURIComponent(input.value)); });
+    var xhr = new XMLHttpRequest();
+    xhr.open('POST', settings.url);
+    xhr.setRequestHeader('Content-Type', 'application/x-www-form-urlencoded');
+    xhr.onload = function () { render(JSON.parse(xhr.responseText).charts || []); };
+    xhr.send(params.join('&'));
+  }
+
+  function render(charts) {
+    var container = one('#charts');
+    container.innerHTML = '';
+    Highcharts.charts = [];
+    charts.forEach(function (options, index) {
+      setTimeout(function () {
+        var div = document.createElement('div');
+        div.className = 'highcharts-container';
+        div.textContent = options.title.text;
+        container.appendChild(div);
+        Highcharts.charts[index] = {
+          title: {textStr: options.title.text},
+          yAxis: [{axisTitle: {textStr: options.yAxis.title.text}}],
+          xAxis: [{categories: options.xAxis.categories}],
+          series: options.series.map(function (series) {
+            return {name: series.name, data: series.data.map(function (y) { return {y: y}; })};
+          })
+        };
+      }, settings.renderDelay * index);
+    });
+  }
+
+  document.addEventListener('DOMContentLoaded', function () {
+    var select = one('select.maingrouping-select');
+    select.addEventListener('change', function () {
+      one('.maingrouping-select + .select2 .select2-selection__rendered').textContent = currentSector();
+      all('.theme-block').forEach(function (block) {
+        block.style.display = block.getAttribute('data-sector') === currentSector() ? '' : 'none';
+      });
+    });
+    all('.select-all-themes').forEach(function (box) {
+      box.addEventListener('change', function () {
+        all('.indicator-select').forEach(function (input) {
+          if (input.getAttribute('main-grouping') === box.name) input.checked = box.checked;
+        });
+      });
+    });
+    all('.select-all-ind').forEach(function (box) {
+      box.addEventListener('change', function () {
+        all('.indicator-select').forEach(function (input) {
+          if (input.getAttribute('main-grouping') === box.getAttribute('main-grouping') && input.name === box.name) input.checked = box.checked;
+        });
+      });
+    });
+    var yearField = one('.year-filter-field');
+    one('.filter-field-label', yearField).addEventListener('click', function (event) {
+      event.preventDefault();
+      yearField.classList.toggle('open');
+    });
+    var allYears = one('.custom-dropdown-select-all', yearField);
+    allYears.addEventListener('change', function () {
+      all("input[name='Year']", yearField).forEach(function (input) { input.checked = allYears.checked; });
+    });
+    one('.apply-btn').addEventListener('click', apply);
+  });
+})();
+""" % {"data_path": DATA_PATH, "render_delay": int(self.render_delay * 1000)}
+
+    def country_page(self, slug):
+        name = self.country_by_slug.get(slug) or slug.replace("-", " ").title()
+        access = [self.value(f"access-{part}", name, self.years[-1]) or 0.0 for part in ("National", "Rural", "Urban")]
+        header = "".join(f"<th>{year}</th>" for year in self.years)
+        rows = []
+        for sector, theme, label, unit in self.indicators:
+            cells = "".join(
+                f"<td>{'' if value is None else value}</td>"
+                for value in (self.value(label, name, year) for year in self.years)
+            )
+            rows.append(f"<tr><td>{escape(label)}</td><td>{escape(unit)}</td><td>{escape(sector)}</td>{cells}</tr>")
+        return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{escape(name)} | Africa Energy Portal (mock)</title></head><body>
+<h1>{escape(name)}</h1>
+<div class="access-figures">Access to electricity
+<span>National {access[0]} %</span> <span>Rural {access[1]} %</span> <span>Urban {access[2]} %</span></div>
+<table class="layout"><tr><td>Overview</td><td>Profile</td></tr></table>
+<table class="indicators"><thead><tr><th>Indicator</th><th>Unit</th><th>Sector</th>{header}</tr></thead>
+<tbody>{"".join(rows)}</tbody></table>
+</body></html>"""
+
+    # Serving
+
+    def handle(self, method, path, body):
+        """(status, content type, payload, route) for one request."""
+        if method == "GET" and path in ("/database", "/database/"):
+            time.sleep(self.latency)
+            return 200, "text/html; charset=utf-8", self.database_page(), "database"
+        if method == "GET" and path == WIDGET_PATH:
+            time.sleep(self.latency)
+            return 200, "application/javascript", self.widget_script(), "widget"
+        if method == "POST" and path == DATA_PATH:
+            time.sleep(self.data_latency)
+            form = parse_qs(body)
+            sector = (form.get("main_grouping") or [SECTORS[0]])[0]
+            charts = self.chart_options(sector, form.get("indicators[]") or [], form.get("years[]") or [])
+            return 200, "application/json", json.dumps({"charts": charts}), "data"
+        if method == "GET" and path.startswith("/aep/country/"):
+            time.sleep(self.latency)
+            return 200, "text/html; charset=utf-8", self.country_page(unquote(path.rsplit("/", 1)[-1])), "country"
+        return 404, "text/plain", f"Not found: {path}", "other"
+
+    def record(self, route, size, seconds):
+        with self._stats_lock:
+            stats = self._stats.setdefault(route, {"requests": 0, "bytes": 0, "seconds": 0.0})
+            stats["requests"] += 1
+            stats["bytes"] += size
+            stats["seconds"] += seconds
+
+    def stats(self):
+        with self._stats_lock:
+            return {route: dict(values) for route, values in self._stats.items()}
+
+    def reset_stats(self):
+        with self._stats_lock:
+            self._stats = {}
+
+    def start(self):
+        handler = type("MockPortalHandler", (_MockHandler,), {"portal": self})
+        self._server = ThreadingHTTPServer((self.host, self.port), handler)
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        print(
+            f"Mock portal on {self.base_url}: {len(self.countries)} countries, {len(self.indicators)} indicators, "
+            f"{len(self.years)} years"
+        )
+        return self.base_url
+
+    @property
+    def base_url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+class _MockHandler(BaseHTTPRequestHandler):
+    portal = None
+
+    def _serve(self, method):
+        started = time.perf_counter()
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length).decode("utf-8") if length else ""
+        status, content_type, text, route = self.portal.handle(method, urlsplit(self.path).path, body)
+
+        payload = text.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+        self.portal.record(route, len(payload), time.perf_counter() - started)
+
+    def do_GET(self):
+        self._serve("GET")
+
+    def do_POST(self):
+        self._serve("POST")
+
+    def log_message(self, format, *args):
+        pass
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve a local mock of the Africa Energy Portal.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--countries", type=int, default=55)
+    parser.add_argument("--indicators", type=int, help="Indicators per sector (default: the saved catalogue)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every page")
+    parser.add_argument("--data-latency", type=float, default=0.0, help="Seconds added to every chart data request")
+    args = parser.parse_args()
+
+    portal = MockPortal(
+        countries=args.countries, indicators=args.indicators, latency=args.latency, data_latency=args.data_latency,
+        port=args.port,
+    )
+    portal.start()
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        portal.stop()
@@ -0,0 +1,7 @@
+"""
+Helpers shared by the AfricaEnergy and energytest1 projects.
+
+Both scrapers use the same checkpoint store, page cache, retry scheduler, row sink and tracer, and both load stages use
+the same dtype schema. Both projects declare it as a dependency and install it from energy_common/ (see its README), so a
+fix here applies to both.
+"""
@@ -0,0 +1,95 @@
+"""
+Durable per-unit checkpoints for long scrapes.
+
+A CheckpointStore belongs to one run (run_id) and lives in <root>/<run_id>/. Every finished unit (a sector or a country) is
+recorded in manifest.json, optionally with its rows in units/<unit>.csv. Files are written to a temp file, fsynced and then
+renamed, so a crash never leaves a half-written checkpoint behind.
+CheckpointStore(root, resume=True) reopens the latest run (or run_id) so finished units can be skipped with is_done().
+"""
+
+import json
+import os
+import re
+import threading
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+
+def _fsync_write(path, data):
+    path = Path(path)
+    tmp = path.with_name(f"{path.name}.tmp")
+    with tmp.open("wb") as fh:
+        fh.write(data)
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.replace(tmp, path)
+
+
+def latest_run_id(root):
+    runs = [manifest.parent for manifest in Path(root).glob("*/manifest.json")]
+    if not runs:
+        return None
+    return max(runs, key=lambda run_dir: (run_dir / "manifest.json").stat().st_mtime).name
+
+
+class CheckpointStore:
+    def __init__(self, root, run_id=None, resume=False):
+        self.root = Path(root)
+        if resume and run_id is None:
+            run_id = latest_run_id(self.root)
+            if run_id is None:
+                print("[WARN] No previous run to resume, starting a new one")
+        self.run_id = run_id or datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.run_dir = self.root / self.run_id
+        self.unit_dir = self.run_dir / "units"
+        self.unit_dir.mkdir(parents=True, exist_ok=True)
+        self.manifest_file = self.run_dir / "manifest.json"
+        self._lock = threading.Lock()
+
+        if resume and self.manifest_file.exists():
+            self.manifest = json.loads(self.manifest_file.read_text(encoding="utf-8"))
+            print(f"Resuming run {self.run_id}: {len(self.manifest['units'])} unit(s) already done")
+        else:
+            self.manifest = {"run_id": self.run_id, "created": datetime.now().isoformat(), "meta": {}, "units": {}}
+            self._save_manifest()
+
+    def _save_manifest(self):
+        _fsync_write(self.manifest_file, json.dumps(self.manifest, indent=2, default=str).encode("utf-8"))
+
+    def _unit_file(self, unit):
+        return self.unit_dir / f"{re.sub(r'[^A-Za-z0-9_-]+', '_', unit)}.csv"
+
+    def is_done(self, unit):
+        return unit in self.manifest["units"]
+
+    def done_units(self):
+        return list(self.manifest["units"])
+
+    def unit_info(self, unit):
+        return self.manifest["units"].get(unit, {})
+
+    def mark_done(self, unit, frame=None, **info):
+        """Record a finished unit, writing its rows first so the manifest never points at missing data."""
+        if frame is not None:
+            _fsync_write(self._unit_file(unit), frame.to_csv(index=False).encode("utf-8"))
+            info["rows_file"] = str(self._unit_file(unit))
+        info["finished"] = datetime.now().isoformat()
+        with self._lock:
+            self.manifest["units"][unit] = info
+            self._save_manifest()
+
+    def load_unit(self, unit):
+        rows_file = self.unit_info(unit).get("rows_file")
+        if not rows_file or not Path(rows_file).exists():
+            return None
+        return pd.read_csv(rows_file)
+
+    def get_meta(self, key, default=None):
+        return self.manifest["meta"].get(key, default)
+
+    def set_meta(self, **meta):
+        with self._lock:
+            self.manifest["meta"].update(meta)
+            self._save_manifest()
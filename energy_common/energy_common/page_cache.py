@@ -0,0 +1,181 @@
+"""
+On-disk cache for fetched page sources and extracted chart payloads.
+
+Entries are keyed by url plus filter state (e.g. the selected sector) and point at content-addressed blobs, so identical
+payloads are only stored once. An entry younger than ttl seconds is served straight from disk. An older one stored with
+validators (the ETag / Last-Modified of the response the content came from, put(..., validators=...)) is revalidated with
+a conditional HEAD request (If-None-Match / If-Modified-Since) and only refetched if the server reports a change; entries
+stored without validators (page sources read from a browser, extracted payloads) simply expire after ttl. When the blobs
+grow past max_bytes the least recently used entries are evicted.
+
+get()/put() work on text (page sources), get_json()/put_json() on extracted payloads, age() tells how old a served entry
+is and print_stats() reports hits and misses.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+import requests
+
+
+class PageCache:
+    def __init__(self, root, ttl=24 * 3600, max_bytes=500 * 1024 * 1024, revalidate=True, timeout=10):
+        self.root = Path(root)
+        self.blob_dir = self.root / "blobs"
+        self.index_dir = self.root / "index"
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.revalidate = revalidate
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._session = None
+
+    @staticmethod
+    def make_key(url, filters=None):
+        raw = json.dumps({"url": url, "filters": filters or {}}, sort_keys=True)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _write_atomic(path, data):
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+    def _read_entry(self, key):
+        entry_file = self.index_dir / f"{key}.json"
+        try:
+            return json.loads(entry_file.read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _write_entry(self, key, entry):
+        self._write_atomic(self.index_dir / f"{key}.json", json.dumps(entry).encode("utf-8"))
+
+    def _http(self):
+        if self._session is None:
+            self._session = requests.Session()
+        return self._session
+
+    def _count(self, counter):
+        # Parallel workers share one cache
+        with self._stats_lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def _is_unchanged(self, entry):
+        etag = entry.get("etag")
+        last_modified = entry.get("last_modified")
+        if not (etag or last_modified):
+            return False
+
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        try:
+            response = self._http().head(entry["url"], headers=headers, timeout=self.timeout, allow_redirects=True)
+        except requests.RequestException:
+            return False
+
+        if response.status_code == 304:
+            return True
+        # Servers that ignore conditional HEAD still report their current validators
+        if etag and response.headers.get("ETag") == etag:
+            return True
+        return bool(last_modified) and response.headers.get("Last-Modified") == last_modified
+
+    def get(self, url, filters=None):
+        key = self.make_key(url, filters)
+        entry = self._read_entry(key)
+        blob_file = self.blob_dir / entry["blob"] if entry else None
+        if not entry or not blob_file.exists():
+            self._count("misses")
+            return None
+
+        now = time.time()
+        if now - entry["stored_at"] > self.ttl:
+            if not (self.revalidate and self._is_unchanged(entry)):
+                self._count("misses")
+                return None
+            entry["stored_at"] = now
+            self._count("revalidated")
+
+        entry["accessed_at"] = now
+        self._write_entry(key, entry)
+        self._count("hits")
+        return blob_file.read_text(encoding="utf-8")
+
+    def age(self, url, filters=None):
+        """Seconds since the entry was stored or last revalidated, None when there is no entry."""
+        entry = self._read_entry(self.make_key(url, filters))
+        return time.time() - entry["stored_at"] if entry else None
+
+    def put(self, url, content, filters=None, kind="page", validators=None):
+        data = content.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        blob_file = self.blob_dir / digest
+        if not blob_file.exists():
+            self._write_atomic(blob_file, data)
+
+        validators = validators or {}
+        now = time.time()
+        entry = {
+            "url": url,
+            "filters": filters or {},
+            "kind": kind,
+            "blob": digest,
+            "size": len(data),
+            "stored_at": now,
+            "accessed_at": now,
+            "etag": validators.get("etag"),
+            "last_modified": validators.get("last_modified"),
+        }
+        self._write_entry(self.make_key(url, filters), entry)
+        self.evict()
+
+    def get_json(self, url, filters=None):
+        content = self.get(url, filters)
+        return json.loads(content) if content is not None else None
+
+    def put_json(self, url, payload, filters=None, kind="payload", validators=None):
+        self.put(url, json.dumps(payload, sort_keys=True), filters=filters, kind=kind, validators=validators)
+
+    def evict(self):
+        """Drop least recently used entries until the stored blobs fit in max_bytes."""
+        with self._lock:
+            entries = []
+            for entry_file in self.index_dir.glob("*.json"):
+                try:
+                    entries.append((entry_file, json.loads(entry_file.read_text(encoding="utf-8"))))
+                except (FileNotFoundError, ValueError):
+                    continue
+
+            blob_sizes = {entry["blob"]: entry["size"] for _, entry in entries}
+            total = sum(blob_sizes.values())
+            if total <= self.max_bytes:
+                return
+
+            entries.sort(key=lambda item: item[1].get("accessed_at", 0))
+            live = [entry["blob"] for _, entry in entries]
+            for position, (entry_file, entry) in enumerate(entries):
+                if total <= self.max_bytes:
+                    break
+                entry_file.unlink(missing_ok=True)
+                if entry["blob"] not in live[position + 1:]:
+                    (self.blob_dir / entry["blob"]).unlink(missing_ok=True)
+                    total -= entry["size"]
+
+    def print_stats(self):
+        with self._stats_lock:
+            hits, revalidated, misses = self.hits, self.revalidated, self.misses
+        print(f"Page cache: {hits} hits ({revalidated} revalidated), {misses} misses")
@@ -0,0 +1,216 @@
+"""
+Retries for failed scrape units (sectors or countries) without re-running the whole scrape.
+
+RetryScheduler.record_failure(unit, error, url) puts a failed unit back in the queue with exponential backoff
+(base_delay * 2^(attempt - 1), capped at max_delay, plus up to jitter * delay) until it has used max_attempts. The caller
+keeps working on the remaining units and picks up due() retries as they come, so retries overlap with the rest of the run.
+Finished units are reported with record_success(unit, url).
+
+Every host has a circuit in the CircuitBreaker: after failure_threshold failures in a row the circuit opens and
+acquire(url) holds requests to that host back for reset_timeout seconds, then lets a single trial through (half-open);
+a success closes the circuit, a failure opens it again. Worker processes cannot see the parent's breaker, so the parent
+publishes it to a SharedCircuit after every result and the workers call SharedCircuit.acquire() before each request.
+
+write_report(path) writes the units that still failed after their last attempt, and those a retry recovered, as JSON.
+"""
+
+import heapq
+import json
+import multiprocessing
+import random
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import urlsplit
+
+
+def host_of(url):
+    return urlsplit(url).netloc or url
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold=5, reset_timeout=60.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def _state(self, url):
+        return self._hosts.setdefault(host_of(url), {"failures": 0, "opened": None, "trial": False})
+
+    def wait_time(self, url):
+        """Seconds to hold off before the next request to url's host; 0 lets the request through."""
+        with self._lock:
+            state = self._state(url)
+            if state["opened"] is None:
+                return 0.0
+            remaining = state["opened"] + self.reset_timeout - time.monotonic()
+            if remaining > 0:
+                return remaining
+            if not state["trial"]:
+                # Half-open: one trial request decides whether the circuit closes again
+                state["trial"] = True
+                return 0.0
+            return 1.0
+
+    def acquire(self, url):
+        """Block until a request to url's host is allowed."""
+        while True:
+            wait = self.wait_time(url)
+            if not wait:
+                return
+            time.sleep(wait)
+
+    def record_success(self, url):
+        with self._lock:
+            state = self._state(url)
+            if state["opened"] is not None:
+                print(f"[OK] Circuit for {host_of(url)} closed again")
+            state.update(failures=0, opened=None, trial=False)
+
+    def opened_at(self, url):
+        """time.monotonic() at which the circuit for url's host opened, None while it is closed."""
+        with self._lock:
+            return self._state(url)["opened"]
+
+    def record_failure(self, url):
+        with self._lock:
+            state = self._state(url)
+            state["failures"] += 1
+            # A failure after the pause is the trial's, even when another process let the trial through
+            expired = state["opened"] is not None and time.monotonic() >= state["opened"] + self.reset_timeout
+            if state["trial"] or expired or (state["opened"] is None and state["failures"] >= self.failure_threshold):
+                print(f"[WARN] Circuit for {host_of(url)} open after {state['failures']} failures, pausing {self.reset_timeout:.0f}s")
+                state.update(opened=time.monotonic(), trial=False)
+
+
+class SharedCircuit:
+    """One host's circuit as seen by worker processes.
+
+    The parent calls publish(breaker, url) after recording each result; workers call acquire() before each request,
+    which blocks while the circuit is open and lets a single trial request through across all workers once it
+    half-opens. Create it in the parent and hand it to the workers as a Process argument.
+    """
+
+    def __init__(self, context=None):
+        context = context or multiprocessing.get_context()
+        # time.monotonic() is system-wide, so the parent's timestamps hold in the workers; -1 while closed
+        self._opened = context.Value("d", -1.0, lock=False)
+        self._reset_timeout = context.Value("d", 0.0, lock=False)
+        self._trial = context.Value("b", 0, lock=False)
+        self._lock = context.Lock()
+
+    def publish(self, breaker, url):
+        opened = breaker.opened_at(url)
+        with self._lock:
+            if opened is None:
+                self._opened.value = -1.0
+            elif opened != self._opened.value:
+                self._opened.value = opened
+                self._reset_timeout.value = breaker.reset_timeout
+                self._trial.value = 0
+
+    def wait_time(self):
+        """Seconds to hold off before the next request; 0 lets the request through."""
+        with self._lock:
+            if self._opened.value < 0:
+                return 0.0
+            remaining = self._opened.value + self._reset_timeout.value - time.monotonic()
+            if remaining > 0:
+                return remaining
+            if not self._trial.value:
+                self._trial.value = 1
+                return 0.0
+            return 1.0
+
+    def acquire(self):
+        """Block until a request is allowed."""
+        while True:
+            wait = self.wait_time()
+            if not wait:
+                return
+            time.sleep(wait)
+
+
+class RetryScheduler:
+    def __init__(self, max_attempts=3, base_delay=10.0, max_delay=300.0, jitter=0.1, breaker=None):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.breaker = breaker or CircuitBreaker()
+        self.attempts = {}
+        self.errors = {}
+        self.failed = []
+        self.recovered = []
+        self._queue = []
+        self._lock = threading.Lock()
+
+    def backoff(self, attempt):
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return delay * (1 + random.uniform(0, self.jitter))
+
+    def record_failure(self, unit, error=None, url=None):
+        """Count a failed attempt. Returns the delay before the retry, or None once the unit is given up."""
+        if url:
+            self.breaker.record_failure(url)
+        with self._lock:
+            attempt = self.attempts[unit] = self.attempts.get(unit, 0) + 1
+            self.errors[unit] = str(error) if error else "no data"
+            if attempt >= self.max_attempts:
+                self.failed.append(unit)
+                print(f"[ERROR] {unit} failed {attempt} time(s), giving up: {self.errors[unit]}")
+                return None
+            delay = self.backoff(attempt)
+            heapq.heappush(self._queue, (time.monotonic() + delay, unit))
+        print(f"[RETRY] {unit} failed (attempt {attempt}/{self.max_attempts}), retrying in {delay:.1f}s")
+        return delay
+
+    def record_success(self, unit, url=None):
+        if url:
+            self.breaker.record_success(url)
+        with self._lock:
+            if unit in self.attempts:
+                self.recovered.append(unit)
+
+    def due(self):
+        """Units whose backoff has passed, removed from the queue."""
+        now = time.monotonic()
+        units = []
+        with self._lock:
+            while self._queue and self._queue[0][0] <= now:
+                units.append(heapq.heappop(self._queue)[1])
+        return units
+
+    def next_due_in(self):
+        """Seconds until the next retry is due, None when nothing is queued."""
+        with self._lock:
+            if not self._queue:
+                return None
+            return max(0.0, self._queue[0][0] - time.monotonic())
+
+    def pending(self):
+        with self._lock:
+            return bool(self._queue)
+
+    def report(self):
+        return {
+            "finished": datetime.now().isoformat(),
+            "failed": [
+                {"unit": unit, "failures": self.attempts[unit], "error": self.errors[unit]} for unit in self.failed
+            ],
+            "recovered": [{"unit": unit, "failures": self.attempts[unit]} for unit in self.recovered],
+        }
+
+    def write_report(self, path):
+        """Write the retry report when anything failed during the run; returns the path or None."""
+        if not self.attempts:
+            return None
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.report(), indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"Retries: {len(self.recovered)} recovered, {len(self.failed)} still failed -> {path}")
+        for unit in self.failed:
+            print(f"  [FAILED] {unit}: {self.errors[unit]}")
+        return path
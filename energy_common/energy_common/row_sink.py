@@ -0,0 +1,235 @@
+"""
+Streaming row sinks for the scrapers.
+
+Extract functions push rows (dicts) or DataFrame chunks into a RowSink as soon as a chart or country is done, instead of
+collecting a whole sector in memory and writing it at the end. The sink keeps at most buffer_rows rows in memory, appends
+them to the output file through a pluggable writer (CSV, JSONL or Parquet) and fsyncs the file every fsync_every flushes,
+so memory stays flat however many indicators a sector has and the file on disk is usable while extraction is still running
+(Parquet only once the sink is closed, its footer is written last).
+
+With columns given, every chunk is laid out on those columns; without, the first chunk's columns are the layout. A chunk
+with a column outside the layout raises ValueError rather than rewriting the file with a wider header, so pass every
+column the rows can have.
+track=("country", ...) keeps the unique values of those columns for the run summary.
+With atomic=True rows go to <file>.part and close() renames it over the file, so a run that fails partway (abort(), or
+an exception leaving the with block) keeps the previous file instead of a truncated one.
+"""
+
+import json
+import os
+from pathlib import Path
+
+import pandas as pd
+
+FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".json": "jsonl", ".parquet": "parquet"}
+
+
+class CsvWriter:
+    suffix = ".csv"
+
+    def __init__(self, path, encoding="utf-8"):
+        self.path = Path(path)
+        self.encoding = encoding
+        self.fh = None
+
+    def append(self, frame):
+        if self.fh is None:
+            self.fh = self.path.open("w", encoding=self.encoding, newline="")
+            frame.to_csv(self.fh, index=False)
+        else:
+            frame.to_csv(self.fh, index=False, header=False)
+
+    def sync(self):
+        if self.fh:
+            self.fh.flush()
+            os.fsync(self.fh.fileno())
+
+    def close(self):
+        if self.fh:
+            self.sync()
+            self.fh.close()
+            self.fh = None
+
+
+class JsonlWriter:
+    suffix = ".jsonl"
+
+    def __init__(self, path, encoding="utf-8"):
+        self.path = Path(path)
+        self.fh = None
+
+    def append(self, frame):
+        if self.fh is None:
+            self.fh = self.path.open("w", encoding="utf-8")
+        for record in frame.to_dict(orient="records"):
+            clean = {key: (None if isinstance(value, float) and value != value else value) for key, value in record.items()}
+            self.fh.write(json.dumps(clean, ensure_ascii=False, default=str) + "\n")
+
+    def sync(self):
+        if self.fh:
+            self.fh.flush()
+            os.fsync(self.fh.fileno())
+
+    def close(self):
+        if self.fh:
+            self.sync()
+            self.fh.close()
+            self.fh = None
+
+
+class ParquetWriter:
+    suffix = ".parquet"
+
+    def __init__(self, path, encoding="utf-8"):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Parquet output needs pyarrow: pip install pyarrow") from e
+        self.pa = pa
+        self.pq = pq
+        self.path = Path(path)
+        self.fh = None
+        self.writer = None
+        self.schema = None
+
+    def _table(self, frame):
+        # Blank cells are missing values, so numeric columns stay numeric
+        frame = frame.replace("", None).infer_objects()
+        table = self.pa.Table.from_pandas(frame, preserve_index=False)
+        if self.schema is None:
+            self.schema = self.pa.schema(
+                [field.with_type(self.pa.string()) if self.pa.types.is_null(field.type) else field for field in table.schema]
+            )
+        return table.cast(self.schema)
+
+    def append(self, frame):
+        table = self._table(frame)
+        if self.writer is None:
+            self.fh = self.path.open("wb")
+            self.writer = self.pq.ParquetWriter(self.fh, self.schema)
+        self.writer.write_table(table)
+
+    def sync(self):
+        if self.fh:
+            self.fh.flush()
+            os.fsync(self.fh.fileno())
+
+    def close(self):
+        if self.writer:
+            self.writer.close()
+            self.writer = None
+        if self.fh:
+            self.sync()
+            self.fh.close()
+            self.fh = None
+
+
+WRITERS = {"csv": CsvWriter, "jsonl": JsonlWriter, "parquet": ParquetWriter}
+
+
+def output_path_for(path, fmt):
+    """The path with the suffix of the given format (africa_energy_data.csv -> africa_energy_data.parquet)."""
+    return Path(path).with_suffix(WRITERS[fmt].suffix)
+
+
+class RowSink:
+    def __init__(
+        self, path, columns=None, fmt=None, buffer_rows=1000, fsync_every=1, track=(), encoding="utf-8", atomic=False,
+    ):
+        self.path = Path(path)
+        fmt = fmt or FORMATS.get(self.path.suffix.lower(), "csv")
+        if fmt not in WRITERS:
+            raise ValueError(f"Unknown output format {fmt!r}, expected one of {sorted(WRITERS)}")
+        self.format = fmt
+        self.write_path = self.path.with_name(f"{self.path.name}.part") if atomic else self.path
+        self.writer = WRITERS[fmt](self.write_path, encoding=encoding)
+        self.columns = list(columns or [])
+        self.buffer_rows = max(1, buffer_rows)
+        self.fsync_every = max(1, fsync_every)
+        self.buffer = []
+        self.buffered = 0
+        self.rows_written = 0
+        self.flushes = 0
+        self.unique = {column: set() for column in track}
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def write_row(self, row):
+        self.write_rows([row])
+
+    def write_rows(self, rows):
+        rows = list(rows)
+        if not rows:
+            return
+        self.write_frame(pd.DataFrame(rows))
+
+    def write_frame(self, frame):
+        if frame is None or frame.empty:
+            return
+        if not self.columns:
+            self.columns = list(frame.columns)
+        new_columns = [column for column in frame.columns if column not in self.columns]
+        if new_columns:
+            raise ValueError(f"Columns {new_columns} are not among the columns of {self.path.name}")
+        self.buffer.append(frame)
+        self.buffered += len(frame)
+        if self.buffered >= self.buffer_rows:
+            self.flush()
+
+    def flush(self):
+        """Append the buffered rows to the file, fsyncing every fsync_every flushes."""
+        if not self.buffer:
+            return
+        chunk = pd.concat(self.buffer, ignore_index=True) if len(self.buffer) > 1 else self.buffer[0]
+        self.buffer = []
+        self.buffered = 0
+
+        chunk = chunk.reindex(columns=self.columns)
+
+        for column, values in self.unique.items():
+            if column in chunk.columns:
+                values.update(chunk[column].dropna().unique().tolist())
+
+        self.writer.append(chunk)
+        self.rows_written += len(chunk)
+        self.flushes += 1
+        if self.flushes % self.fsync_every == 0:
+            self.writer.sync()
+
+    def close(self):
+        if self.closed:
+            return
+        try:
+            self.flush()
+        except BaseException:
+            self.abort()
+            raise
+        self.writer.close()
+        self.closed = True
+        if self.write_path != self.path and self.write_path.exists():
+            os.replace(self.write_path, self.path)
+
+    def abort(self):
+        """Drop the buffered rows and close; an atomic sink removes its .part file and leaves the previous file as it was."""
+        if self.closed:
+            return
+        self.buffer = []
+        self.buffered = 0
+        try:
+            self.writer.close()
+        finally:
+            self.closed = True
+            if self.write_path != self.path:
+                self.write_path.unlink(missing_ok=True)
+
+    def unique_count(self, column):
+        return len(self.unique.get(column, ()))
@@ -0,0 +1,193 @@
+"""
+Canonical dataset schema with compact dtypes.
+
+The energy CSVs repeat the same few strings (source_link, source, sector, sub_sector, unit, ...) on every row, which
+default dtypes keep as one Python string per cell. read_canonical_csv reads them as categories, country_serial as int16
+and the year columns as float32 when every value in the column reads back unchanged (GDP in current US$ or commitments
+in UA need more than float32's 7 digits, such columns stay float64). year_values turns the year columns back into
+float64 with the values as written in the CSV, so documents and long rows are the same as with default dtypes.
+read_extracted_csv does the same for the text columns of energytest1's extracted file.
+
+python -m energy_common.schema [file.csv ...] prints the memory footprint with default and with schema dtypes
+(default: AfricaEnergy's staged CSVs and the latest energytest1 extract, transformed and long-format files).
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+BASE_COLUMNS: list[str] = [
+    "country",
+    "country_serial",
+    "metric",
+    "unit",
+    "sector",
+    "sub_sector",
+    "sub_sub_sector",
+    "source_link",
+    "source",
+]
+YEAR_COLUMNS: list[str] = [str(year) for year in range(2000, 2025)]
+CANONICAL_COLUMNS: list[str] = BASE_COLUMNS + YEAR_COLUMNS
+CATEGORY_COLUMNS: list[str] = [column for column in BASE_COLUMNS if column != "country_serial"]
+
+# Text columns of energytest1's extracted file (extract/scraper_complete.py)
+EXTRACTED_CATEGORY_COLUMNS: list[str] = [
+    "Country",
+    "Sector",
+    "Sovereign / Non-Sovereign",
+    "Title",
+    "Status",
+    "Signature Date",
+    "Country_Name",
+    "Country_Slug",
+    "Source_Link",
+    "Source",
+]
+
+# Every column of energytest1's extracted file: the project table, then where each row came from, then the indicator
+# tables and the access figures found in the page text
+EXTRACTED_COLUMNS: list[str] = [
+    "Country",
+    "Sector",
+    "Sovereign / Non-Sovereign",
+    "Title",
+    "Commitment in UA",
+    "Status",
+    "Signature Date",
+    "Country_Name",
+    "Country_Slug",
+    "Source_Link",
+    "Source",
+    "Indicator",
+    "Unit",
+    "Sub_Sector",
+    "Value_2022",
+] + YEAR_COLUMNS
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+def compact_float(values: pd.Series) -> pd.Series:
+    """float32 when every value survives the round trip, float64 otherwise."""
+    values = pd.to_numeric(values, errors="coerce").astype("float64")
+    wide = values.to_numpy()
+    narrow = wide.astype(np.float32)
+    # Compare the float32 value as it would be written back (shortest repr) with the original
+    if np.array_equal(narrow.astype(str).astype(np.float64), wide, equal_nan=True):
+        return pd.Series(narrow, index=values.index, name=values.name)
+    return values
+
+
+def compact_int(values: pd.Series) -> pd.Series:
+    """int16 country serials (nullable Int16 when some are missing)."""
+    values = pd.to_numeric(values, errors="coerce")
+    return values.astype("Int16" if values.isna().any() else "int16")
+
+
+def apply_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """Cast the canonical columns present in df to their compact dtypes."""
+    for column in CATEGORY_COLUMNS:
+        if column not in df.columns:
+            continue
+        if not isinstance(df[column].dtype, pd.CategoricalDtype):
+            df[column] = df[column].astype("category")
+        categories = df[column].cat.categories
+        if not categories.is_monotonic_increasing:
+            # read_csv merges categories per parser block; sorted ones keep sort_values lexical
+            df[column] = df[column].cat.reorder_categories(categories.sort_values())
+    if "country_serial" in df.columns:
+        df["country_serial"] = compact_int(df["country_serial"])
+    for column in YEAR_COLUMNS:
+        if column in df.columns:
+            df[column] = compact_float(df[column])
+    return df
+
+
+def read_canonical_csv(csv_path, **kwargs):
+    """Read a wide CSV (or chunks of it, with chunksize) with the canonical dtypes."""
+    reader = pd.read_csv(csv_path, dtype={column: "category" for column in CATEGORY_COLUMNS}, **kwargs)
+    if kwargs.get("chunksize"):
+        return (apply_schema(chunk) for chunk in reader)
+    return apply_schema(reader)
+
+
+def read_extracted_csv(csv_path) -> pd.DataFrame:
+    """Read energytest1's extracted file with its repeated text columns as categories."""
+    return pd.read_csv(csv_path, dtype={column: "category" for column in EXTRACTED_CATEGORY_COLUMNS})
+
+
+def year_values(df: pd.DataFrame, year_columns: Iterable[str]) -> pd.DataFrame:
+    """The year columns as float64, float32 ones restored to the values they were read from."""
+    restored = {}
+    for column in year_columns:
+        series = df[column]
+        if series.dtype == np.float32:
+            restored[column] = series.to_numpy().astype(str).astype(np.float64)
+        else:
+            restored[column] = pd.to_numeric(series, errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+    return pd.DataFrame(restored, index=df.index)
+
+
+def memory_mb(df: pd.DataFrame) -> float:
+    return df.memory_usage(deep=True).sum() / (1024 * 1024)
+
+
+def memory_report(csv_path) -> tuple[float, float]:
+    """Print the in-memory footprint of a CSV with default and with schema dtypes."""
+    default = pd.read_csv(csv_path)
+    if any(column in default.columns for column in EXTRACTED_CATEGORY_COLUMNS):
+        compact = read_extracted_csv(csv_path)
+    else:
+        compact = read_canonical_csv(csv_path)
+    before = default.memory_usage(deep=True, index=False)
+    after = compact.memory_usage(deep=True, index=False)
+
+    print(f"\n{Path(csv_path).name}: {len(default)} rows")
+    print(f"  {'Column':<28} {'Default':>14} {'Schema':>14} {'Before KB':>10} {'After KB':>10}")
+    for column in default.columns:
+        print(
+            f"  {column[:28]:<28} {str(default[column].dtype):>14} {str(compact[column].dtype)[:14]:>14} "
+            f"{before[column] / 1024:>10.1f} {after[column] / 1024:>10.1f}"
+        )
+    print(
+        f"  Total: {memory_mb(default):.2f} MB -> {memory_mb(compact):.2f} MB "
+        f"({memory_mb(default) / max(memory_mb(compact), 1e-9):.1f}x smaller)"
+    )
+    return memory_mb(default), memory_mb(compact)
+
+
+def default_files() -> list[Path]:
+    staging_dir = REPO_ROOT / "AfricaEnergy" / "staging_data"
+    files = sorted(path for path in staging_dir.glob("*.csv") if "_changes" not in path.name)
+    for pattern in ["africa_energy_complete_*.csv", "africa_energy_transformed_*.csv", "africa_energy_long_format_*.csv"]:
+        files += sorted((REPO_ROOT / "energytest1").glob(pattern), reverse=True)[:1]
+    return files
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Memory footprint of energy CSVs with default and schema dtypes.")
+    parser.add_argument("files", nargs="*", type=Path, help="CSV files (default: staged and latest transform files)")
+    args = parser.parse_args(argv)
+
+    files = args.files or default_files()
+    if not files:
+        print("[ERROR] No CSV files found")
+        return 1
+
+    print("Memory report: default dtypes vs schema")
+    totals = [memory_report(path) for path in files]
+    before = sum(total[0] for total in totals)
+    after = sum(total[1] for total in totals)
+    print(f"\nAll files: {before:.2f} MB -> {after:.2f} MB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+"""
+Lightweight timing spans for the scraper phases.
+
+    with tracer.span("apply", sector="Energy"):
+        ...
+
+Every span records its duration, status (ok/error), parent span and attributes; nested spans inherit their parent's
+attributes, so a "chart load" span inside a sector span is attributed to that sector. Spans are kept in memory and, with
+a path, appended to a JSON lines file as they finish. close() adds one rollup record per sector/country (seconds per
+phase) to the file, print_summary() prints the per-phase table and the rollups at the end of a run.
+"""
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+ROLLUP_KEYS = ("sector", "country")
+
+
+def _rollup(spans, key):
+    rollups = {}
+    for record in spans:
+        value = record["attrs"].get(key)
+        if value is None:
+            continue
+        phases = rollups.setdefault(value, {})
+        phases[record["name"]] = round(phases.get(record["name"], 0.0) + record["duration"], 6)
+    return rollups
+
+
+class Tracer:
+    def __init__(self, path=None):
+        self.path = Path(path) if path else None
+        self.spans = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._fh = None
+
+    def _stack(self):
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    @contextmanager
+    def span(self, name, **attrs):
+        stack = self._stack()
+        parent = stack[-1] if stack else None
+        record = {
+            "type": "span",
+            "name": name,
+            "parent": parent["name"] if parent else None,
+            "depth": len(stack),
+            "thread": threading.current_thread().name,
+            "start": time.time(),
+            "attrs": {**(parent["attrs"] if parent else {}), **attrs},
+        }
+        stack.append(record)
+        started = time.perf_counter()
+        try:
+            yield record
+        except BaseException as e:
+            record["status"] = "error"
+            record["error"] = repr(e)[:200]
+            raise
+        else:
+            record.setdefault("status", "ok")
+        finally:
+            record["duration"] = round(time.perf_counter() - started, 6)
+            stack.pop()
+            self._emit(record)
+
+    def _write(self, record):
+        if not self.path:
+            return
+        if self._fh is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._fh = self.path.open("a", encoding="utf-8")
+        self._fh.write(json.dumps(record, default=str) + "\n")
+        self._fh.flush()
+
+    def _emit(self, record):
+        with self._lock:
+            self.spans.append(record)
+            self._write(record)
+
+    def phase_totals(self):
+        """{span name: {"count", "total", "max"}} over all spans."""
+        totals = {}
+        with self._lock:
+            spans = list(self.spans)
+        for record in spans:
+            phase = totals.setdefault(record["name"], {"count": 0, "total": 0.0, "max": 0.0})
+            phase["count"] += 1
+            phase["total"] += record["duration"]
+            phase["max"] = max(phase["max"], record["duration"])
+        return totals
+
+    def rollup(self, key):
+        """{attribute value: {span name: seconds}} for spans carrying the attribute, e.g. rollup("sector")."""
+        with self._lock:
+            return _rollup(list(self.spans), key)
+
+    def print_summary(self, top=3):
+        totals = self.phase_totals()
+        if not totals:
+            return
+        print("\nPhase timings:")
+        print(f"  {'Phase':<24} {'Count':>6} {'Total':>9} {'Mean':>8} {'Max':>8}")
+        for name, phase in sorted(totals.items(), key=lambda item: item[1]["total"], reverse=True):
+            print(
+                f"  {name:<24} {phase['count']:>6} {phase['total']:>8.2f}s "
+                f"{phase['total'] / phase['count']:>7.2f}s {phase['max']:>7.2f}s"
+            )
+        for key in ROLLUP_KEYS:
+            rollups = self.rollup(key)
+            if not rollups:
+                continue
+            print(f"\nSlowest phases per {key}:")
+            for value, phases in rollups.items():
+                # The span named after the key (e.g. "sector") is the total for that unit
+                total = phases.get(key, sum(phases.values()))
+                slowest = sorted(((name, seconds) for name, seconds in phases.items() if name != key), key=lambda item: -item[1])
+                details = ", ".join(f"{name} {seconds:.2f}s" for name, seconds in slowest[:top])
+                print(f"  {value}: {total:.2f}s ({details})")
+
+    def close(self):
+        """Append the per-sector/per-country rollups to the trace file and close it."""
+        with self._lock:
+            if self.path and self.spans:
+                for key in ROLLUP_KEYS:
+                    for value, phases in _rollup(self.spans, key).items():
+                        self._write({"type": "rollup", "by": key, "key": value, "phases": phases})
+            if self._fh:
+                self._fh.close()
+                self._fh = None
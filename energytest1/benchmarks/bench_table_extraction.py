@@ -0,0 +1,92 @@
+"""
+Table extraction benchmark
+Compares the old country page path (BeautifulSoup html.parser + pd.read_html per table)
+with the single-pass lxml extractor used by extract_country_data
+
+Usage: python benchmarks/bench_table_extraction.py [page.html ...] [--repeat N]
+Defaults to the saved debug pages in AfricaEnergy/staging_data/debug
+"""
+
+import argparse
+import sys
+import time
+from io import StringIO
+from pathlib import Path
+
+import pandas as pd
+from bs4 import BeautifulSoup
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / 'extract'))
+
+from table_extractor import extract_tables, page_text, parse_page
+
+DEFAULT_PAGES_DIR = PROJECT_ROOT.parent / 'AfricaEnergy' / 'staging_data' / 'debug'
+
+
+def old_path(page_source):
+    """The previous extract_country_data parsing: parse with bs4, then re-parse every table with read_html"""
+    soup = BeautifulSoup(page_source, 'html.parser')
+    frames = []
+    for table in soup.find_all('table'):
+        try:
+            df = pd.read_html(StringIO(str(table)))[0]
+            if 'Country' in df.columns or 'Indicator' in df.columns:
+                frames.append(df)
+        except Exception:
+            continue
+    soup.get_text()
+    return frames
+
+
+def new_path(page_source):
+    doc = parse_page(page_source)
+    frames = extract_tables(doc)
+    page_text(doc)
+    return frames
+
+
+def best_of(func, page_source, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func(page_source)
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark country page table extraction')
+    parser.add_argument('pages', nargs='*', help='HTML files to parse (default: saved debug pages)')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per page, the best one is reported')
+    args = parser.parse_args(argv)
+
+    pages = [Path(page) for page in args.pages] or sorted(DEFAULT_PAGES_DIR.glob('*.html'))
+    if not pages:
+        print(f"[ERROR] No pages to benchmark in {DEFAULT_PAGES_DIR}")
+        return 1
+
+    total_old = total_new = 0.0
+    print(f"{'Page':<40} {'KiB':>7} {'Tables':>7} {'Old (ms)':>10} {'New (ms)':>10} {'Speedup':>8}")
+    for page in pages:
+        page_source = page.read_text(encoding='utf-8')
+        old_time, old_frames = best_of(old_path, page_source, args.repeat)
+        new_time, new_frames = best_of(new_path, page_source, args.repeat)
+        total_old += old_time
+        total_new += new_time
+
+        if len(old_frames) != len(new_frames) or not all(
+            old.equals(new) for old, new in zip(old_frames, new_frames)
+        ):
+            print(f"  [WARN] {page.name}: tables differ between the two paths")
+
+        print(f"{page.name:<40} {len(page_source) / 1024:>7.0f} {len(new_frames):>7} "
+              f"{old_time * 1000:>10.1f} {new_time * 1000:>10.1f} {old_time / new_time:>7.1f}x")
+
+    print(f"{'Total':<40} {'':>7} {'':>7} {total_old * 1000:>10.1f} {total_new * 1000:>10.1f} "
+          f"{total_old / total_new:>7.1f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,132 @@
+"""
+Schema transform benchmark
+Compares the old row-by-row EnergyDataTransformer.transform_to_schema (iterrows,
+one pd.to_datetime per row) with the vectorized one on 10k-1M input rows
+
+Input rows are sampled from the latest extracted file (africa_energy_complete_*.csv),
+with signature dates spread over 1995-2026 so every year column gets values.
+The row loop takes minutes at 1M rows; above --old-limit rows its time is
+extrapolated linearly from the largest measured size and marked with ~
+
+Usage: python benchmarks/bench_transform_schema.py [--rows 10000 100000 1000000] [--old-limit 100000]
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / 'transform'))
+
+from transformer import EnergyDataTransformer
+
+
+def old_transform(df, country_mapping):
+    """The previous transform_to_schema loop"""
+    records = []
+    for idx, row in df.iterrows():
+        country_name = row.get('Country_Name', 'Unknown')
+        country_serial = country_mapping.get(country_name, 0)
+        if pd.notna(row.get('Title')):
+            metric = row.get('Title', 'Unknown Metric')
+        else:
+            metric = 'Energy Project Data'
+        record = {
+            'country': country_name,
+            'country_serial': country_serial,
+            'metric': metric,
+            'unit': row.get('Commitment in UA', 'UA'),
+            'sector': row.get('Sector', 'Energy'),
+            'sub_sector': row.get('Sovereign / Non-Sovereign', 'Not Specified'),
+            'sub_sub_sector': row.get('Status', None),
+            'source_link': row.get('Source_Link', 'https://africa-energy-portal.org/'),
+            'source': row.get('Source', 'Africa Energy Portal'),
+        }
+        for year in range(2000, 2025):
+            record[str(year)] = None
+        if pd.notna(row.get('Signature Date')) and pd.notna(row.get('Commitment in UA')):
+            try:
+                sig_date = pd.to_datetime(row.get('Signature Date'))
+                year = sig_date.year
+                if 2000 <= year <= 2024:
+                    record[str(year)] = row.get('Commitment in UA')
+            except:
+                pass
+        records.append(record)
+    return pd.DataFrame(records)
+
+
+def sample_input(rows, seed=0):
+    """`rows` extracted rows sampled from the latest extract, with varied signature dates"""
+    extracted = sorted(PROJECT_ROOT.glob('africa_energy_complete_*.csv'), reverse=True)
+    if not extracted:
+        raise SystemExit(f"[ERROR] No extracted file in {PROJECT_ROOT}, run extract/scraper_complete.py first")
+    source = pd.read_csv(extracted[0])
+    rng = np.random.default_rng(seed)
+    df = source.sample(rows, replace=True, random_state=seed).reset_index(drop=True)
+    dates = pd.to_datetime('1995-01-01') + pd.to_timedelta(rng.integers(0, 32 * 365, rows), unit='D')
+    signed = df['Signature Date'].notna()
+    df.loc[signed, 'Signature Date'] = dates[signed.to_numpy()].strftime('%d %b %Y')
+    return df
+
+
+def transformer_for(df):
+    transformer = EnergyDataTransformer(None)
+    transformer.df = df
+    transformer.country_mapping = {
+        country: idx + 1 for idx, country in enumerate(sorted(df['Country_Name'].dropna().unique()))
+    }
+    return transformer
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the schema transform')
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--old-limit', type=int, default=100_000,
+                        help='Largest input the row loop is run on, larger ones are extrapolated')
+    args = parser.parse_args(argv)
+
+    print(f"{'Rows':>10} {'Old (s)':>10} {'New (s)':>10} {'Speedup':>9}  Same output")
+    old_rate = None
+    for rows in args.rows:
+        df = sample_input(rows)
+        transformer = transformer_for(df)
+
+        # Silence the step messages, only the timing matters here
+        with contextlib.redirect_stdout(io.StringIO()):
+            started = time.perf_counter()
+            new = transformer.transform_to_schema()
+            new_time = time.perf_counter() - started
+
+        same = '-'
+        if rows <= args.old_limit:
+            started = time.perf_counter()
+            old = old_transform(df, transformer.country_mapping)
+            old_time = time.perf_counter() - started
+            old_rate = old_time / rows
+            try:
+                pd.testing.assert_frame_equal(old, new)
+                same = 'yes'
+            except AssertionError as e:
+                same = f"NO: {str(e).splitlines()[0]}"
+            old_label = f"{old_time:>10.2f}"
+        elif old_rate:
+            old_time = old_rate * rows
+            old_label = f"{'~' + format(old_time, '.1f'):>10}"
+        else:
+            old_time = None
+            old_label = f"{'-':>10}"
+
+        speedup = f"{old_time / new_time:>8.0f}x" if old_time else f"{'-':>9}"
+        print(f"{rows:>10} {old_label} {new_time:>10.3f} {speedup}  {same}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,72 @@
+"""
+Rate limiting for the country crawlers
+Token bucket shared by all concurrent workers so the portal sees a steady, polite request rate
+"""
+
+import asyncio
+import multiprocessing
+import time
+
+
+class AsyncTokenBucket:
+    """
+    Token bucket for asyncio workers.
+    Tokens refill at `rate` per second up to `capacity`; every page fetch takes one.
+    """
+
+    def __init__(self, rate=0.5, capacity=2):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        """Wait until a token is available and take it"""
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class ProcessTokenBucket:
+    """
+    Token bucket shared by worker processes.
+    The token count and refill time live in shared memory behind one lock, so
+    N processes together never exceed `rate` pages per second. Create it in the
+    parent and hand it to the workers as a Process argument.
+    """
+
+    def __init__(self, rate=0.5, capacity=2, context=None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        context = context or multiprocessing.get_context()
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = context.Value("d", float(capacity), lock=False)
+        self._updated = context.Value("d", time.monotonic(), lock=False)
+        self._lock = context.Lock()
+
+    def acquire(self):
+        """Block until a token is available and take it"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                tokens = min(self.capacity, self._tokens.value + (now - self._updated.value) * self.rate)
+                self._updated.value = now
+                if tokens >= 1:
+                    self._tokens.value = tokens - 1
+                    return
+                self._tokens.value = tokens
+            # Sleep outside the lock so other workers can check in
+            time.sleep((1 - tokens) / self.rate)
@@ -4,25 +4,86 @@ Extracts ALL energy data country-by-country for 2000-2022
 Saves to CSV with comprehensive metrics
 """
 
+import argparse
+import asyncio
+import multiprocessing
+import queue
 import time
 import os
-from datetime import datetime
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
-from bs4 import BeautifulSoup
+from selenium.common.exceptions import TimeoutException
 import pandas as pd
 import re
+from collections import deque
+from pathlib import Path
+
+from energy_common.checkpoint import CheckpointStore
+from energy_common.page_cache import PageCache
+from energy_common.retry import RetryScheduler, SharedCircuit
+from energy_common.row_sink import RowSink
+from energy_common.schema import EXTRACTED_COLUMNS
+from energy_common.tracing import Tracer
+
+# Import from same directory
+from rate_limiter import AsyncTokenBucket, ProcessTokenBucket
+from table_extractor import extract_tables, page_text, parse_page
+
+
+def crawl_shard(scraper_cls, config, work, limiter, circuit, results, worker_id):
+    """
+    Worker process of scrape_all_countries_sharded.
+    Takes country slugs from the shared `work` queue until it gets None, crawls
+    and parses each with its own browser and puts
+    (slug, name, DataFrame or None, datasets, error) on `results`; the parent
+    is the only process writing output. Every page waits for the shared
+    `circuit` (a SharedCircuit) and the token bucket first.
+    Ends with a (None, worker_id, ...) marker
+    """
+    trace_path = config.pop("trace_path", None)
+    page_load_timeout = config.pop("page_load_timeout", None)
+    scraper = scraper_cls(tracer=Tracer(trace_path), **config)
+    if page_load_timeout:
+        scraper.page_load_timeout = page_load_timeout
+    driver = None
+    try:
+        driver = scraper.create_driver()
+        print(f"[OK] Worker {worker_id}: Chrome driver initialized")
+        for country_slug in iter(work.get, None):
+            country_name = country_slug.replace('-', ' ').title()
+            circuit.acquire()
+            limiter.acquire()
+            try:
+                country_data = scraper.extract_country_data(country_slug, country_name, driver)
+                country_df = pd.concat(country_data, ignore_index=True) if country_data else None
+                results.put((country_slug, country_name, country_df, len(country_data), None))
+            except Exception as e:
+                results.put((country_slug, country_name, None, 0, repr(e)))
+    except Exception as e:
+        print(f"[ERROR] Worker {worker_id} failed: {e}")
+    finally:
+        if driver:
+            driver.quit()
+        scraper.tracer.close()
+        results.put((None, worker_id, None, 0, None))
 
 
 class ComprehensiveAfricaEnergyScraper:
-    def __init__(self):
-        self.base_url = "https://africa-energy-portal.org"
+    def __init__(self, cache_dir=None, cache_ttl=24 * 3600, base_url=None, tracer=None):
+        # AEP_PORTAL_URL points the scraper at another host (e.g. the local mock portal)
+        self.base_url = (base_url or os.getenv("AEP_PORTAL_URL", "https://africa-energy-portal.org")).rstrip("/")
         self.driver = None
         self.all_data = []
         
+        # Optional on-disk cache of country page sources
+        self.cache = PageCache(cache_dir, ttl=cache_ttl) if cache_dir else None
+        
+        # Timing spans for every phase of a country (see tracing.py)
+        self.tracer = tracer or Tracer()
+        
         # List of all 54 African countries
         self.countries = [
             "algeria", "angola", "benin", "botswana", "burkina-faso", "burundi",
@@ -39,8 +100,16 @@ class ComprehensiveAfricaEnergyScraper:
         # Years we want to extract
         self.years = list(range(2000, 2023))  # 2000-2022
         
-    def setup_driver(self):
-        """Initialize Chrome WebDriver"""
+        # Upper bound for a country page to finish loading (was a fixed sleep)
+        self.page_load_timeout = 8
+        
+        # Rendered instead of the tables when a country has no data (Drupal's empty view)
+        self.no_data_selector = '.view-empty'
+        # A page without tables or marker counts as loaded once it stopped changing for this many polls
+        self.empty_page_polls = 4
+        
+    def create_driver(self):
+        """Create a new Chrome WebDriver (one per concurrent worker)"""
         chrome_options = Options()
         chrome_options.add_argument("--no-sandbox")
         chrome_options.add_argument("--disable-dev-shm-usage")
@@ -51,7 +120,11 @@ class ComprehensiveAfricaEnergyScraper:
         chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
         chrome_options.add_experimental_option('useAutomationExtension', False)
         
-        self.driver = webdriver.Chrome(options=chrome_options)
+        return webdriver.Chrome(options=chrome_options)
+        
+    def setup_driver(self):
+        """Initialize Chrome WebDriver"""
+        self.driver = self.create_driver()
         print("[OK] Chrome driver initialized")
         
     def close_driver(self):
@@ -59,63 +132,116 @@ class ComprehensiveAfricaEnergyScraper:
         if self.driver:
             self.driver.quit()
             
-    def extract_country_data(self, country_slug, country_name):
+    def wait_for_country_page(self, driver):
+        """
+        Wait until the page has loaded and its tables stopped rendering
+        (same table count and page length on two polls in a row),
+        never longer than the old fixed 8 second sleep.
+        A page showing the no-data marker is ready as soon as it stops
+        changing, one with neither tables nor marker after
+        `empty_page_polls` unchanged polls
+        """
+        last = {'signature': None, 'unchanged': 0}
+        
+        def stable(drv):
+            if drv.execute_script("return document.readyState") != "complete":
+                return False
+            signature = drv.execute_script(
+                "return [document.getElementsByTagName('table').length,"
+                " document.documentElement.outerHTML.length,"
+                " document.querySelector(arguments[0]) !== null]",
+                self.no_data_selector,
+            )
+            previous, last['signature'] = last['signature'], signature
+            last['unchanged'] = last['unchanged'] + 1 if signature == previous else 0
+            if not last['unchanged']:
+                return False
+            tables, _, no_data = signature
+            return tables > 0 or no_data or last['unchanged'] >= self.empty_page_polls - 1
+        
+        try:
+            WebDriverWait(driver, self.page_load_timeout, poll_frequency=0.5).until(stable)
+        except TimeoutException:
+            # Pages without tables still get scanned for access data
+            pass
+    
+    def extract_country_data(self, country_slug, country_name, driver=None):
         """
         Extract all energy data for a specific country
         """
+        driver = driver or self.driver
         country_url = f"{self.base_url}/aep/country/{country_slug}"
         
         print(f"\n  Extracting: {country_name}")
         print(f"  URL: {country_url}")
         
-        try:
-            self.driver.get(country_url)
-            time.sleep(8)  # Wait for page load
-            
-            page_source = self.driver.page_source
-            soup = BeautifulSoup(page_source, 'html.parser')
-            
-            # Extract data from tables
-            tables = soup.find_all('table')
-            country_data = []
-            
-            for table in tables:
-                try:
-                    df = pd.read_html(str(table))[0]
-                    
-                    # Check if this is a data table with country info
-                    if 'Country' in df.columns or 'Indicator' in df.columns:
-                        # Add country name to each row
-                        df['Country_Name'] = country_name
-                        df['Country_Slug'] = country_slug
-                        df['Source_Link'] = country_url
-                        df['Source'] = 'Africa Energy Portal'
-                        country_data.append(df)
-                        
-                except Exception as e:
-                    continue
-            
-            # Look for key indicators in the page text
-            # Try to extract electricity access rates
-            access_data = self.extract_access_data(soup, country_name, country_slug, country_url)
-            if access_data:
-                country_data.extend(access_data)
-            
-            print(f"  [OK] Extracted {len(country_data)} data tables")
-            return country_data
-            
-        except Exception as e:
-            print(f"  [ERROR] Failed to extract {country_name}: {e}")
-            return []
+        with self.tracer.span("country", country=country_slug):
+            try:
+                page_source = None
+                if self.cache:
+                    with self.tracer.span("cache lookup"):
+                        page_source = self.cache.get(country_url)
+                if page_source is not None:
+                    age = self.cache.age(country_url) or 0
+                    print(f"  [CACHE] Served from local page cache, stored {age / 3600:.1f}h ago (not refetched)")
+                else:
+                    with self.tracer.span("page load"):
+                        driver.get(country_url)
+                    with self.tracer.span("table wait"):
+                        self.wait_for_country_page(driver)
+                    with self.tracer.span("page source"):
+                        page_source = driver.page_source
+                    if self.cache:
+                        with self.tracer.span("cache store"):
+                            self.cache.put(country_url, page_source)
+                
+                with self.tracer.span("parse"):
+                    country_data = self.parse_country_page(page_source, country_slug, country_name, country_url)
+                print(f"  [OK] Extracted {len(country_data)} data tables")
+                return country_data
+                
+            except Exception as e:
+                print(f"  [ERROR] Failed to extract {country_name}: {e}")
+                return []
+    
+    def parse_country_page(self, page_source, country_slug, country_name, country_url):
+        """
+        Turn a country page source into data tables.
+        The page is parsed once; only tables with a 'Country' or 'Indicator'
+        header become DataFrames
+        """
+        doc = parse_page(page_source)
+        country_data = []
+        
+        # Extract data from tables
+        for df in extract_tables(doc):
+            # Add country name to each row
+            df['Country_Name'] = country_name
+            df['Country_Slug'] = country_slug
+            df['Source_Link'] = country_url
+            df['Source'] = 'Africa Energy Portal'
+            country_data.append(df)
+        
+        # Look for key indicators in the page text
+        # Try to extract electricity access rates
+        access_data = self.extract_access_data(page_text(doc), country_name, country_slug, country_url)
+        if access_data:
+            country_data.extend(access_data)
+        
+        # The output file's columns are fixed when it is opened
+        unexpected = sorted({column for df in country_data for column in df.columns} - set(EXTRACTED_COLUMNS))
+        if unexpected:
+            raise ValueError(f"Columns {unexpected} on {country_url} are not in EXTRACTED_COLUMNS")
+        
+        return country_data
     
-    def extract_access_data(self, soup, country_name, country_slug, country_url):
+    def extract_access_data(self, text, country_name, country_slug, country_url):
         """
-        Extract electricity access data from country page
+        Extract electricity access data from country page text
         """
         access_data = []
         
-        # Look for electricity access percentages in the HTML
-        text = soup.get_text()
+        # Look for electricity access percentages in the page text
         
         # Try to find patterns like "National 60.5 %"
         patterns = {
@@ -142,9 +268,44 @@ class ComprehensiveAfricaEnergyScraper:
         
         return [pd.DataFrame(access_data)] if access_data else []
     
-    def scrape_all_countries(self, output_file="africa_energy_complete.csv"):
+    def open_sink(self, output_file, output_format=None):
+        """
+        Streaming sink for the combined output, laid out on EXTRACTED_COLUMNS
+        (utf-8-sig CSV unless another format is asked for)
+        """
+        return RowSink(output_file, columns=EXTRACTED_COLUMNS, fmt=output_format, encoding='utf-8-sig')
+    
+    def print_saved(self, sink, successful, failed):
+        """Report what the sink wrote"""
+        print(f"\n[OK] Data saved successfully!")
+        print(f"File: {sink.path}")
+        print(f"Total rows: {sink.rows_written}")
+        print(f"Total columns: {len(sink.columns)}")
+        print(f"Successful countries: {successful}/{len(self.countries)}")
+        print(f"Failed countries: {failed}/{len(self.countries)}")
+        
+        print(f"\nColumn names:")
+        print(sink.columns)
+    
+    def write_retry_report(self, retries, output_file, checkpoint=None):
+        """Failed countries go to the checkpoint run (failed.json) or next to the output file"""
+        if checkpoint:
+            return retries.write_report(checkpoint.run_dir / "failed.json")
+        output_file = Path(output_file)
+        return retries.write_report(output_file.with_name(f"{output_file.stem}_failed.json"))
+    
+    def scrape_all_countries(self, output_file="africa_energy_complete.csv", checkpoint=None, output_format=None,
+                             retries=None, rate=0.5, burst=2):
         """
         Main method to scrape all countries
+        Every country's tables are streamed to `output_file` as soon as the
+        country is done, nothing is accumulated in memory.
+        With a CheckpointStore every finished country is checkpointed and
+        countries already finished in that run are loaded instead of scraped.
+        Countries without data are queued again by `retries` (a RetryScheduler)
+        and crawled once their backoff has passed, between the remaining ones.
+        Pages are paced by the same token bucket as the other modes (`rate`
+        pages per second, bursts of `burst`)
         """
         print(f"\n{'='*80}")
         print("COMPREHENSIVE AFRICA ENERGY DATA EXTRACTION")
@@ -153,68 +314,381 @@ class ComprehensiveAfricaEnergyScraper:
         print(f"Years: 2000-2022 (23 years)")
         print(f"{'='*80}\n")
         
-        all_country_data = []
+        retries = retries or RetryScheduler()
+        sink = self.open_sink(output_file, output_format)
+        limiter = ProcessTokenBucket(rate=rate, capacity=burst)
         successful = 0
-        failed = 0
+        queued = deque(self.countries)
         
-        for idx, country_slug in enumerate(self.countries, 1):
+        while queued or retries.pending():
+            if not queued:
+                time.sleep(retries.next_due_in() or 0)
+            queued.extend(retries.due())
+            if not queued:
+                continue
+            country_slug = queued.popleft()
+            idx = self.countries.index(country_slug) + 1
+            
             # Convert slug to readable name
             country_name = country_slug.replace('-', ' ').title()
             
+            if checkpoint and checkpoint.is_done(country_slug):
+                done_df = checkpoint.load_unit(country_slug)
+                if done_df is not None:
+                    sink.write_frame(done_df)
+                    successful += 1
+                print(f"[{idx}/{len(self.countries)}] [SKIP] {country_name} already finished in run {checkpoint.run_id}")
+                continue
+            
             print(f"[{idx}/{len(self.countries)}] Processing: {country_name}")
+            retries.breaker.acquire(self.base_url)
+            limiter.acquire()
             
             try:
                 country_data = self.extract_country_data(country_slug, country_name)
                 
                 if country_data:
-                    all_country_data.extend(country_data)
+                    country_df = pd.concat(country_data, ignore_index=True)
+                    sink.write_frame(country_df)
                     successful += 1
+                    retries.record_success(country_slug, self.base_url)
+                    if checkpoint:
+                        checkpoint.mark_done(country_slug, country_df, datasets=len(country_data))
                     print(f"  [SUCCESS] {country_name} - {len(country_data)} datasets")
                 else:
-                    failed += 1
                     print(f"  [WARNING] {country_name} - No data extracted")
-                
-                # Rate limiting - be respectful
-                time.sleep(2)
+                    retries.record_failure(country_slug, None, self.base_url)
                 
             except Exception as e:
-                failed += 1
                 print(f"  [ERROR] {country_name} - {e}")
+                retries.record_failure(country_slug, e, self.base_url)
                 continue
         
-        # Save all data
+        # Flush what is left in the buffer
         print(f"\n{'='*80}")
-        print("SAVING DATA TO CSV")
+        print("SAVING DATA")
         print(f"{'='*80}")
+        sink.close()
+        self.write_retry_report(retries, output_file, checkpoint)
         
-        if all_country_data:
-            # Combine all dataframes
-            combined_df = pd.concat(all_country_data, ignore_index=True)
+        if sink.rows_written:
+            self.print_saved(sink, successful, len(retries.failed))
             
-            # Save to CSV
-            combined_df.to_csv(output_file, index=False, encoding='utf-8-sig')
-            
-            print(f"\n[OK] Data saved successfully!")
-            print(f"File: {output_file}")
-            print(f"Total rows: {len(combined_df)}")
-            print(f"Total columns: {len(combined_df.columns)}")
-            print(f"Successful countries: {successful}/{len(self.countries)}")
-            print(f"Failed countries: {failed}/{len(self.countries)}")
-            
-            print(f"\nColumn names:")
-            print(list(combined_df.columns))
-            
-            print(f"\nSample data:")
-            print(combined_df.head(10))
+            if sink.format == 'csv':
+                print(f"\nSample data:")
+                print(pd.read_csv(sink.path, encoding='utf-8-sig', nrows=10))
             
             return True
         else:
             print("[ERROR] No data collected!")
             return False
+    
+    async def scrape_all_countries_async(self, output_file="africa_energy_complete.csv",
+                                         concurrency=4, rate=0.5, burst=2, checkpoint=None, output_format=None,
+                                         retries=None):
+        """
+        Crawl country pages concurrently.
+        Up to `concurrency` browsers work at once; all of them share one token
+        bucket (`rate` pages per second, bursts of `burst`). Each country is
+        streamed to `output_file` as soon as it finishes.
+        With a CheckpointStore, countries finished earlier in the run are
+        written to `output_file` from their checkpoints and not crawled again.
+        Failed countries are crawled again by `retries` (a RetryScheduler) once
+        their backoff has passed, alongside the countries still in flight
+        """
+        print(f"\n{'='*80}")
+        print("COMPREHENSIVE AFRICA ENERGY DATA EXTRACTION (CONCURRENT)")
+        print(f"{'='*80}")
+        print(f"Countries to extract: {len(self.countries)}")
+        print(f"Concurrent browsers: {concurrency}")
+        print(f"Rate limit: {rate} pages/sec (burst {burst})")
+        print(f"{'='*80}\n")
+        
+        retries = retries or RetryScheduler()
+        sink = self.open_sink(output_file, output_format)
+        successful = 0
+        started = time.perf_counter()
+        
+        pending = list(self.countries)
+        if checkpoint:
+            pending = [slug for slug in self.countries if not checkpoint.is_done(slug)]
+            for slug in checkpoint.done_units():
+                done_df = checkpoint.load_unit(slug)
+                if done_df is not None:
+                    sink.write_frame(done_df)
+                    successful += 1
+            if len(pending) < len(self.countries):
+                print(f"[SKIP] {len(self.countries) - len(pending)} countries already finished in run {checkpoint.run_id}")
+        
+        limiter = AsyncTokenBucket(rate=rate, capacity=burst)
+        idle_drivers = asyncio.Queue()
+        all_drivers = []
+        for _ in range(min(concurrency, len(pending))):
+            driver = await asyncio.to_thread(self.create_driver)
+            all_drivers.append(driver)
+            idle_drivers.put_nowait(driver)
+        print(f"[OK] {len(all_drivers)} Chrome drivers initialized")
+        
+        async def crawl(country_slug):
+            country_name = country_slug.replace('-', ' ').title()
+            while (wait := retries.breaker.wait_time(self.base_url)) > 0:
+                await asyncio.sleep(wait)
+            await limiter.acquire()
+            driver = await idle_drivers.get()
+            try:
+                data = await asyncio.to_thread(self.extract_country_data, country_slug, country_name, driver)
+                return country_slug, country_name, data, None
+            except Exception as e:
+                return country_slug, country_name, [], e
+            finally:
+                idle_drivers.put_nowait(driver)
+        
+        try:
+            tasks = {asyncio.create_task(crawl(slug)) for slug in pending}
+            done = 0
+            while tasks or retries.pending():
+                if tasks:
+                    finished, tasks = await asyncio.wait(
+                        tasks, timeout=retries.next_due_in(), return_when=asyncio.FIRST_COMPLETED
+                    )
+                else:
+                    await asyncio.sleep(retries.next_due_in() or 0)
+                    finished = set()
+                
+                for task in finished:
+                    country_slug, country_name, country_data, error = task.result()
+                    
+                    if error or not country_data:
+                        if error:
+                            print(f"  [ERROR] {country_name} - {error}")
+                        else:
+                            print(f"  [WARNING] {country_name} - No data extracted")
+                        if retries.record_failure(country_slug, error, self.base_url) is None:
+                            done += 1
+                        continue
+                    
+                    country_df = pd.concat(country_data, ignore_index=True)
+                    if checkpoint:
+                        checkpoint.mark_done(country_slug, country_df, datasets=len(country_data))
+                    sink.write_frame(country_df)
+                    successful += 1
+                    done += 1
+                    retries.record_success(country_slug, self.base_url)
+                    print(f"  [SUCCESS] [{done}/{len(pending)}] {country_name} - {len(country_data)} datasets")
+                
+                # Retries run next to the countries still in flight
+                for slug in retries.due():
+                    tasks.add(asyncio.create_task(crawl(slug)))
+        finally:
+            sink.close()
+            for driver in all_drivers:
+                await asyncio.to_thread(driver.quit)
+        
+        print(f"\n{'='*80}")
+        print("CONCURRENT EXTRACTION FINISHED")
+        print(f"{'='*80}")
+        self.write_retry_report(retries, output_file, checkpoint)
+        
+        if not sink.rows_written:
+            print("[ERROR] No data collected!")
+            return False
+        
+        self.print_saved(sink, successful, len(retries.failed))
+        print(f"Elapsed: {time.perf_counter() - started:.1f}s")
+        
+        return True
+    
+    def scrape_all_countries_concurrent(self, output_file="africa_energy_complete.csv",
+                                        concurrency=4, rate=0.5, burst=2, checkpoint=None, output_format=None,
+                                        retries=None):
+        """Blocking entry point for scrape_all_countries_async"""
+        return asyncio.run(
+            self.scrape_all_countries_async(
+                output_file, concurrency=concurrency, rate=rate, burst=burst, checkpoint=checkpoint,
+                output_format=output_format, retries=retries
+            )
+        )
+    
+    def worker_config(self, worker_id):
+        """Constructor arguments that rebuild this scraper inside a worker process"""
+        trace_path = None
+        if self.tracer.path:
+            trace_path = self.tracer.path.with_name(f"{self.tracer.path.stem}.worker{worker_id}.jsonl")
+        return {
+            "cache_dir": str(self.cache.root) if self.cache else None,
+            "cache_ttl": self.cache.ttl if self.cache else 24 * 3600,
+            "base_url": self.base_url,
+            "trace_path": trace_path,
+            "page_load_timeout": self.page_load_timeout,
+        }
+    
+    def run_shards(self, countries, processes, limiter, handle, retries):
+        """
+        Crawl `countries` with up to `processes` worker processes pulling from
+        one work queue, passing every (slug, name, frame, datasets, error)
+        result to handle() in this process.
+        Failed countries go back on the queue as soon as their backoff from
+        `retries` has passed, while the workers keep crawling; the workers
+        stop once nothing is left to crawl or retry
+        """
+        context = multiprocessing.get_context()
+        work = context.Queue()
+        results = context.Queue()
+        circuit = SharedCircuit(context)
+        for country_slug in countries:
+            work.put(country_slug)
+        # Countries on the queue or being crawled
+        outstanding = len(countries)
+        workers = [
+            context.Process(
+                target=crawl_shard, name=f"crawler-{worker_id}",
+                args=(type(self), self.worker_config(worker_id), work, limiter, circuit, results, worker_id),
+            )
+            for worker_id in range(min(processes, len(countries)))
+        ]
+        
+        try:
+            for worker in workers:
+                worker.start()
+            
+            running = len(workers)
+            stopping = False
+            while running:
+                if not stopping and not outstanding and not retries.pending():
+                    for _ in workers:
+                        work.put(None)
+                    stopping = True
+                
+                due_in = retries.next_due_in()
+                try:
+                    result = results.get(timeout=5 if due_in is None else min(5, max(due_in, 0.05)))
+                except queue.Empty:
+                    result = None
+                    # A worker killed before its end marker would otherwise block the writer forever
+                    if not any(worker.is_alive() for worker in workers):
+                        print("[WARN] All workers exited without finishing, stopping")
+                        break
+                
+                if result and result[0] is None:
+                    running -= 1
+                elif result:
+                    outstanding -= 1
+                    handle(*result)
+                    circuit.publish(retries.breaker, self.base_url)
+                
+                for country_slug in retries.due():
+                    print(f"  [RETRY] Queueing {country_slug} again")
+                    work.put(country_slug)
+                    outstanding += 1
+            
+            if outstanding:
+                print(f"[WARN] {outstanding} countries were not crawled, no worker was left to take them")
+        finally:
+            for worker in workers:
+                worker.join(timeout=30)
+                if worker.is_alive():
+                    worker.terminate()
+    
+    def scrape_all_countries_sharded(self, output_file="africa_energy_complete.csv",
+                                     processes=4, rate=0.5, burst=2, checkpoint=None, output_format=None,
+                                     retries=None):
+        """
+        Crawl country pages with `processes` worker processes.
+        The workers take self.countries from one shared work queue; each has
+        its own browser and parses its own pages, so parsing overlaps with page
+        loads in the other workers. All workers draw from one cross-process
+        token bucket (`rate` pages per second, bursts of `burst`), wait while
+        the circuit of `retries` (a RetryScheduler) is open, and send their
+        results through one queue to this process, the single writer of
+        `output_file` and the checkpoint.
+        Countries that failed go back on the work queue once their backoff has
+        passed, next to the countries still waiting
+        """
+        print(f"\n{'='*80}")
+        print("COMPREHENSIVE AFRICA ENERGY DATA EXTRACTION (MULTI-PROCESS)")
+        print(f"{'='*80}")
+        print(f"Countries to extract: {len(self.countries)}")
+        print(f"Worker processes: {processes}")
+        print(f"Rate limit: {rate} pages/sec (burst {burst})")
+        print(f"{'='*80}\n")
+        
+        retries = retries or RetryScheduler()
+        sink = self.open_sink(output_file, output_format)
+        progress = {"successful": 0, "done": 0}
+        started = time.perf_counter()
+        
+        pending = list(self.countries)
+        if checkpoint:
+            pending = [slug for slug in self.countries if not checkpoint.is_done(slug)]
+            for slug in checkpoint.done_units():
+                done_df = checkpoint.load_unit(slug)
+                if done_df is not None:
+                    sink.write_frame(done_df)
+                    progress["successful"] += 1
+            if len(pending) < len(self.countries):
+                print(f"[SKIP] {len(self.countries) - len(pending)} countries already finished in run {checkpoint.run_id}")
+        
+        def handle(country_slug, country_name, country_df, datasets, error):
+            if error or country_df is None:
+                if error:
+                    print(f"  [ERROR] {country_name} - {error}")
+                else:
+                    print(f"  [WARNING] {country_name} - No data extracted")
+                if retries.record_failure(country_slug, error, self.base_url) is None:
+                    progress["done"] += 1
+                return
+            if checkpoint:
+                checkpoint.mark_done(country_slug, country_df, datasets=datasets)
+            sink.write_frame(country_df)
+            progress["successful"] += 1
+            progress["done"] += 1
+            retries.record_success(country_slug, self.base_url)
+            print(f"  [SUCCESS] [{progress['done']}/{len(pending)}] {country_name} - {datasets} datasets")
+        
+        limiter = ProcessTokenBucket(rate=rate, capacity=burst, context=multiprocessing.get_context())
+        try:
+            if pending:
+                self.run_shards(pending, processes, limiter, handle, retries)
+        finally:
+            sink.close()
+        
+        print(f"\n{'='*80}")
+        print("MULTI-PROCESS EXTRACTION FINISHED")
+        print(f"{'='*80}")
+        self.write_retry_report(retries, output_file, checkpoint)
+        
+        if not sink.rows_written:
+            print("[ERROR] No data collected!")
+            return False
+        
+        self.print_saved(sink, progress["successful"], len(retries.failed))
+        print(f"Elapsed: {time.perf_counter() - started:.1f}s")
+        
+        return True
+
+
+def parse_args(argv=None):
+    """Command line options for the scraper"""
+    parser = argparse.ArgumentParser(description="Scrape Africa Energy Portal country pages")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue the latest run (or --run-id), skipping finished countries")
+    parser.add_argument("--run-id", help="Checkpoint run to create or resume")
+    parser.add_argument("--format", choices=["csv", "jsonl", "parquet"], default="csv",
+                        help="Output format (the transform stage reads csv)")
+    parser.add_argument("--max-attempts", type=int, default=3,
+                        help="Attempts per country before it is reported as failed")
+    parser.add_argument("--retry-delay", type=float, default=10.0,
+                        help="Seconds before the first retry of a country, doubled each time")
+    parser.add_argument("--cache", action="store_true",
+                        help="Reuse country pages cached by earlier runs (off by default, same as SCRAPER_CACHE=on)")
+    parser.add_argument("--cache-dir", help="Page cache directory (default: .cache/pages, implies --cache)")
+    return parser.parse_args(argv)
 
 
-def main():
+def main(argv=None):
     """Main execution"""
+    args = parse_args(argv)
+    
     print("\n" + "="*80)
     print("AFRICA ENERGY PORTAL - COMPREHENSIVE DATA SCRAPER")
     print("="*80)
@@ -223,17 +697,56 @@ def main():
     script_dir = os.path.dirname(os.path.abspath(__file__))
     project_root = os.path.dirname(script_dir)
     
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    output_file = os.path.join(project_root, f"africa_energy_complete_{timestamp}.csv")
+    # Every finished country is checkpointed so a crashed run can be resumed
+    checkpoint = CheckpointStore(
+        os.path.join(project_root, "checkpoints"), run_id=args.run_id, resume=args.resume
+    )
+    output_file = checkpoint.get_meta("output_file")
+    if not output_file:
+        output_file = os.path.join(project_root, f"africa_energy_complete_{checkpoint.run_id}.{args.format}")
+        checkpoint.set_meta(output_file=output_file)
+    
+    # Page cache is off by default so every run fetches the pages, --cache or SCRAPER_CACHE=on turns it on
+    cache_enabled = (args.cache or bool(args.cache_dir)
+                     or os.getenv("SCRAPER_CACHE", "").strip().lower() in {"1", "true", "yes", "on"})
+    cache_dir = args.cache_dir or os.getenv("SCRAPER_CACHE_DIR") or os.path.join(project_root, ".cache", "pages")
+    cache_ttl = float(os.getenv("SCRAPER_CACHE_TTL_HOURS", "24")) * 3600
+    
+    # Phase timings go to traces/<run_id>.jsonl
+    tracer = Tracer(os.path.join(project_root, "traces", f"{checkpoint.run_id}.jsonl"))
+    
+    scraper = ComprehensiveAfricaEnergyScraper(
+        cache_dir=cache_dir if cache_enabled else None, cache_ttl=cache_ttl, tracer=tracer
+    )
+    if cache_enabled:
+        print(f"[CACHE] Page cache on: {cache_dir}, pages younger than {cache_ttl / 3600:g}h are reused")
     
-    scraper = ComprehensiveAfricaEnergyScraper()
+    # SCRAPER_CONCURRENCY > 1 crawls countries with that many browsers at once,
+    # SCRAPER_PROCESSES > 1 with that many worker processes (one browser each)
+    concurrency = int(os.getenv("SCRAPER_CONCURRENCY", "1") or 1)
+    processes = int(os.getenv("SCRAPER_PROCESSES", "1") or 1)
+    
+    # Countries without data are retried with backoff; the ones that still fail end up in failed.json
+    retries = RetryScheduler(max_attempts=args.max_attempts, base_delay=args.retry_delay)
     
     try:
-        print("\n[SETUP] Initializing browser...")
-        scraper.setup_driver()
-        
-        # Scrape all countries
-        success = scraper.scrape_all_countries(output_file)
+        if processes > 1:
+            success = scraper.scrape_all_countries_sharded(
+                output_file, processes=processes, checkpoint=checkpoint, output_format=args.format, retries=retries
+            )
+        elif concurrency > 1:
+            success = scraper.scrape_all_countries_concurrent(
+                output_file, concurrency=concurrency, checkpoint=checkpoint, output_format=args.format,
+                retries=retries
+            )
+        else:
+            print("\n[SETUP] Initializing browser...")
+            scraper.setup_driver()
+            
+            # Scrape all countries
+            success = scraper.scrape_all_countries(
+                output_file, checkpoint=checkpoint, output_format=args.format, retries=retries
+            )
         
         if success:
             print(f"\n{'='*80}")
@@ -254,6 +767,10 @@ def main():
         import traceback
         traceback.print_exc()
     finally:
+        if scraper.cache:
+            scraper.cache.print_stats()
+        tracer.print_summary()
+        tracer.close()
         print("\n[CLEANUP] Closing browser...")
         scraper.close_driver()
         print("[OK] Done!")
@@ -0,0 +1,73 @@
+"""
+Single-pass table extraction for country pages
+Parses the page once with lxml (C parser), keeps only tables whose header has
+'Country' or 'Indicator' and builds their DataFrames straight from the parsed
+cells - no re-serialising each <table> for pd.read_html
+"""
+
+from lxml import html as lxml_html
+from pandas.io.parsers import TextParser
+
+
+WANTED_HEADERS = ('Country', 'Indicator')
+
+
+def _cell_values(row):
+    """Text of every cell in a row, repeating cells that span several columns"""
+    values = []
+    for cell in row.xpath('./th|./td'):
+        text = ' '.join(cell.text_content().split())
+        try:
+            span = int(cell.get('colspan', 1))
+        except ValueError:
+            span = 1
+        values.extend([text] * max(span, 1))
+    return values
+
+
+def _header_and_body(table):
+    """Header cells and body rows of a table, laid out the way pd.read_html reads them"""
+    header_rows = table.xpath('./thead/tr')
+    if header_rows:
+        header = _cell_values(header_rows[-1])
+        body_rows = table.xpath('./tbody/tr') or table.xpath('./tr')
+    else:
+        rows = table.xpath('./tbody/tr|./tr')
+        if not rows or rows[0].xpath('./td'):
+            return [], rows
+        header = _cell_values(rows[0])
+        body_rows = rows[1:]
+    return header, body_rows
+
+
+def parse_page(page_source):
+    """Parse the page source once"""
+    return lxml_html.fromstring(page_source)
+
+
+def extract_tables(doc, wanted_headers=WANTED_HEADERS):
+    """
+    DataFrames for every table whose header contains one of `wanted_headers`.
+    Tables are filtered on their header cells before any DataFrame is built.
+    """
+    frames = []
+    for table in doc.iter('table'):
+        header, body_rows = _header_and_body(table)
+        if not any(name in header for name in wanted_headers):
+            continue
+
+        rows = [_cell_values(row) for row in body_rows]
+        rows = [row for row in rows if row]
+        if not rows:
+            continue
+
+        width = len(header)
+        rows = [(row + [''] * width)[:width] for row in rows]
+        # Same type inference as pd.read_html (numbers, thousands separators, empty cells -> NaN)
+        frames.append(TextParser([header] + rows, header=0, thousands=',').read())
+    return frames
+
+
+def page_text(doc):
+    """Text of the whole page without script/style contents (what BeautifulSoup.get_text() returned)"""
+    return ''.join(doc.xpath('//text()[not(ancestor::script) and not(ancestor::style)]'))
@@ -11,29 +11,35 @@ load_dotenv()
 # Import from same directory
 from mongodb_loader import MongoDBLoader
 
-def load_data():
+def load_data(df=None):
+    """Load the latest long format CSV, or a long format DataFrame passed in memory"""
     print("\n" + "="*80)
     print("MONGODB DATA LOADER - LONG FORMAT DATA")
     print("="*80)
     
-    # Get the project root directory (parent of load/)
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    project_root = os.path.dirname(script_dir)
-    
-    # Look for the latest long format CSV in project root
-    csv_pattern = os.path.join(project_root, "africa_energy_long_format_*.csv")
-    csv_files = sorted(glob.glob(csv_pattern), reverse=True)
-    
-    if not csv_files:
-        print(f"\n[ERROR] No long format data file found in: {project_root}")
-        print("Please run transform/transform_to_long_format.py first.")
-        return False
-    
-    # Use the latest file
-    csv_file = csv_files[0]
+    if df is None:
+        # Get the project root directory (parent of load/)
+        script_dir = os.path.dirname(os.path.abspath(__file__))
+        project_root = os.path.dirname(script_dir)
+        
+        # Look for the latest long format CSV in project root
+        csv_pattern = os.path.join(project_root, "africa_energy_long_format_*.csv")
+        csv_files = sorted(glob.glob(csv_pattern), reverse=True)
+        
+        if not csv_files:
+            print(f"\n[ERROR] No long format data file found in: {project_root}")
+            print("Please run transform/transform_to_long_format.py first.")
+            return False
+        
+        # Use the latest file
+        csv_file = csv_files[0]
+        source = os.path.basename(csv_file)
+    else:
+        csv_file = None
+        source = f"in-memory long format data ({len(df)} rows)"
     
     print(f"\nConfiguration:")
-    print(f"  Input file: {os.path.basename(csv_file)}")
+    print(f"  Input: {source}")
     print(f"  Database: energyd2")
     print(f"  Collection: test")
     print(f"  Clear existing data: YES")
@@ -49,9 +55,10 @@ def load_data():
             return False
         
         # Load CSV
-        df = loader.load_csv(csv_file)
-        if df is None:
-            return False
+        if csv_file:
+            df = loader.load_csv(csv_file)
+            if df is None:
+                return False
         
         print(f"\n      Data structure:")
         print(f"      Columns: {df.columns.tolist()}")
@@ -7,7 +7,7 @@ import subprocess
 import os
 from datetime import datetime
 
-def run_command(script_path, stage_name):
+def run_command(script_path, stage_name, args=None):
     """Run a Python script and handle its output"""
     print("\n" + "="*80)
     print(f"STAGE: {stage_name}")
@@ -18,7 +18,7 @@ def run_command(script_path, stage_name):
     try:
         # Run the script and capture output
         result = subprocess.run(
-            [sys.executable, script_path],
+            [sys.executable, script_path] + list(args or []),
             capture_output=False,  # Show output in real-time
             text=True,
             check=True
@@ -54,24 +54,38 @@ def main():
         {
             "name": "EXTRACT - Web Scraping",
             "script": os.path.join(project_root, "extract", "scraper_complete.py"),
-            "description": "Scraping data from Africa Energy Portal"
+            "description": "Scraping data from Africa Energy Portal",
+            # --resume continues the last scrape from its checkpoints
+            "args": ["--resume"] if "--resume" in sys.argv[1:] else []
         },
-        {
-            "name": "TRANSFORM - Step 1 (Wide Format)",
-            "script": os.path.join(project_root, "transform", "transformer.py"),
-            "description": "Transforming raw data to wide format"
-        },
-        {
-            "name": "TRANSFORM - Step 2 (Long Format)",
-            "script": os.path.join(project_root, "transform", "transform_to_long_format.py"),
-            "description": "Converting wide format to MongoDB-ready long format"
-        },
-        {
-            "name": "LOAD - MongoDB Upload",
-            "script": os.path.join(project_root, "load", "load_to_mongodb.py"),
-            "description": "Loading data into MongoDB Atlas"
-        }
     ]
+    if "--staged" in sys.argv[1:]:
+        # Separate scripts, handing off through the intermediate CSVs
+        stages += [
+            {
+                "name": "TRANSFORM - Step 1 (Wide Format)",
+                "script": os.path.join(project_root, "transform", "transformer.py"),
+                "description": "Transforming raw data to wide format"
+            },
+            {
+                "name": "TRANSFORM - Step 2 (Long Format)",
+                "script": os.path.join(project_root, "transform", "transform_to_long_format.py"),
+                "description": "Converting wide format to MongoDB-ready long format"
+            },
+            {
+                "name": "LOAD - MongoDB Upload",
+                "script": os.path.join(project_root, "load", "load_to_mongodb.py"),
+                "description": "Loading data into MongoDB Atlas"
+            }
+        ]
+    else:
+        stages.append({
+            "name": "TRANSFORM + LOAD - Fused",
+            "script": os.path.join(project_root, "transform", "pipeline.py"),
+            "description": "Wide format, long format and MongoDB upload in one process, no CSV handoffs",
+            # --keep-intermediate also writes the transformed and long format CSVs
+            "args": ["--keep-intermediate"] if "--keep-intermediate" in sys.argv[1:] else []
+        })
     
     # Run each stage
     print("\n" + "="*80)
@@ -95,7 +109,7 @@ def main():
             return False
         
         # Run the stage
-        success = run_command(stage['script'], stage['name'])
+        success = run_command(stage['script'], stage['name'], stage.get('args'))
         
         if not success:
             print(f"\n{'='*80}")
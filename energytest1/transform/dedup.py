@@ -0,0 +1,199 @@
+"""
+Streaming deduplication
+Keeps the first row of every key (country + metric by default) over chunked input,
+without holding the rows themselves in memory - only one 8-byte fingerprint per key
+
+Fingerprints are kept in a sorted in-memory array up to --memory-mb; above that
+the array is written to a sorted run file in the spill directory and looked up
+memory-mapped from then on. Memory stays around the budget plus one chunk
+whatever the size of the input (with 64-bit fingerprints two different keys
+collide with a chance of about n^2 / 2^65, ~3e-4 at 100M keys)
+
+Usage: python transform/dedup.py [transformed.csv ...] [-o output.csv] [--chunksize 100000] [--memory-mb 64]
+Without input files, all africa_energy_transformed_*.csv in the project root are
+combined, newest first, so the latest run's row wins
+"""
+
+import argparse
+import glob
+import os
+import shutil
+import sys
+import tempfile
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+DEDUP_KEYS = ['country', 'metric']
+
+# Fingerprint of a missing value, whatever the column dtype it came from
+NULL_HASH = np.uint64(0x9E3779B97F4A7C15)
+COMBINE_MULTIPLIER = np.uint64(1_000_003)
+
+
+def row_fingerprints(df, columns):
+    """64-bit fingerprint of the key columns of every row.
+    Values are normalized first so a key hashes the same in every chunk: numbers
+    as float64 (1 == 1.0), everything else as text, and every null alike"""
+    fingerprints = np.zeros(len(df), dtype=np.uint64)
+    for column in columns:
+        values = df[column]
+        missing = values.isna().to_numpy()
+        if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+            hashed = pd.util.hash_array(values.to_numpy(dtype='float64', na_value=0.0))
+        else:
+            hashed = pd.util.hash_array(values.astype(str).to_numpy(dtype=object))
+        hashed[missing] = NULL_HASH
+        # Order-dependent combine, so (a, b) and (b, a) differ
+        fingerprints = fingerprints * COMBINE_MULTIPLIER ^ hashed
+    return fingerprints
+
+
+def contains(sorted_keys, fingerprints):
+    """Which fingerprints are in a sorted array (in memory or memory-mapped)"""
+    if not len(sorted_keys):
+        return np.zeros(len(fingerprints), dtype=bool)
+    positions = np.searchsorted(sorted_keys, fingerprints)
+    return sorted_keys[np.minimum(positions, len(sorted_keys) - 1)] == fingerprints
+
+
+class StreamingDeduplicator:
+    """
+    Keep-first deduplication over a stream of chunks.
+    mask(chunk) tells which rows are the first of their key across all chunks
+    seen so far, filter(chunk) returns just those rows.
+    """
+
+    def __init__(self, key_columns=DEDUP_KEYS, memory_budget_mb=64, spill_dir=None):
+        self.key_columns = list(key_columns)
+        self.memory_limit = max(1, int(memory_budget_mb * 1024 * 1024) // 8)
+        self.spill_dir = spill_dir
+        self._own_spill_dir = spill_dir is None
+        self.seen = np.empty(0, dtype=np.uint64)
+        self.runs = []
+        self.rows_in = 0
+        self.rows_kept = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def mask(self, chunk):
+        """Boolean mask of the rows to keep in this chunk"""
+        fingerprints = row_fingerprints(chunk, self.key_columns)
+        unique, first_rows = np.unique(fingerprints, return_index=True)
+
+        # Keys already kept in an earlier chunk, in memory or in a spilled run
+        duplicate = contains(self.seen, unique)
+        for run in self.runs:
+            duplicate |= contains(run, unique)
+
+        keep = np.zeros(len(chunk), dtype=bool)
+        keep[first_rows[~duplicate]] = True
+        self.remember(unique[~duplicate])
+
+        self.rows_in += len(chunk)
+        self.rows_kept += int(keep.sum())
+        return keep
+
+    def filter(self, chunk):
+        return chunk[self.mask(chunk)]
+
+    def remember(self, new_keys):
+        """Merge new (sorted) keys into the in-memory array, spilling it once over budget"""
+        if not len(new_keys):
+            return
+        # Both halves are sorted, so the stable sort is a linear merge
+        self.seen = np.sort(np.concatenate([self.seen, new_keys]), kind='stable')
+        if len(self.seen) > self.memory_limit:
+            self.spill()
+
+    def spill(self):
+        if self.spill_dir is None:
+            self.spill_dir = tempfile.mkdtemp(prefix='dedup_')
+        os.makedirs(self.spill_dir, exist_ok=True)
+        path = os.path.join(self.spill_dir, f"run_{len(self.runs):04d}.npy")
+        np.save(path, self.seen)
+        self.runs.append(np.load(path, mmap_mode='r'))
+        self.seen = np.empty(0, dtype=np.uint64)
+
+    @property
+    def duplicates(self):
+        return self.rows_in - self.rows_kept
+
+    def close(self):
+        """Drop the spilled runs (and the spill directory when it was created here)"""
+        paths = [run.filename for run in self.runs]
+        self.runs = []
+        if self._own_spill_dir and self.spill_dir:
+            shutil.rmtree(self.spill_dir, ignore_errors=True)
+            self.spill_dir = None
+        else:
+            for path in paths:
+                if os.path.exists(path):
+                    os.remove(path)
+
+
+def deduplicate_csv(input_files, output_file, key_columns=DEDUP_KEYS, chunksize=100_000,
+                    memory_budget_mb=64, spill_dir=None):
+    """Keep the first row of every key across CSV files, read and written in chunks"""
+    written = 0
+    columns = None
+    with StreamingDeduplicator(key_columns, memory_budget_mb, spill_dir) as dedup:
+        for input_file in input_files:
+            print(f"  Reading {os.path.basename(input_file)}")
+            # Every column as text, so a value hashes the same in every chunk whatever dtype
+            # inference would pick for it there; only empty cells count as missing
+            reader = pd.read_csv(input_file, chunksize=chunksize, dtype=str,
+                                 keep_default_na=False, na_values=[''])
+            for chunk in reader:
+                # Later files are written in the column order of the first one
+                columns = columns or chunk.columns.tolist()
+                kept = dedup.filter(chunk)[columns]
+                if written == 0:
+                    kept.to_csv(output_file, index=False, encoding='utf-8-sig')
+                elif len(kept):
+                    kept.to_csv(output_file, mode='a', header=False, index=False, encoding='utf-8')
+                written += len(kept)
+
+        print(f"\n[OK] Read {dedup.rows_in} rows, removed {dedup.duplicates} duplicates")
+        print(f"     Kept {written} rows -> {output_file}")
+        if dedup.runs:
+            print(f"     Spilled {len(dedup.runs)} fingerprint run(s) to disk")
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Deduplicate transformed CSV files in bounded memory')
+    parser.add_argument('inputs', nargs='*', help='Transformed CSV files, first occurrence wins')
+    parser.add_argument('-o', '--output', help='Output CSV (default: africa_energy_deduplicated_<timestamp>.csv)')
+    parser.add_argument('--keys', nargs='+', default=DEDUP_KEYS, help='Key columns')
+    parser.add_argument('--chunksize', type=int, default=100_000)
+    parser.add_argument('--memory-mb', type=float, default=64, help='Fingerprint memory before spilling to disk')
+    parser.add_argument('--spill-dir', help='Directory for spilled fingerprints (default: a temp directory)')
+    args = parser.parse_args(argv)
+
+    # Get the project root directory (parent of transform/)
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    input_files = args.inputs or sorted(
+        glob.glob(os.path.join(project_root, 'africa_energy_transformed_*.csv')), reverse=True
+    )
+    if not input_files:
+        print(f"\n[ERROR] No transformed file found in: {project_root}")
+        print("Please run transformer.py first to create the wide format CSV.")
+        return 1
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    output_file = args.output or os.path.join(project_root, f"africa_energy_deduplicated_{timestamp}.csv")
+
+    print(f"Deduplicating {len(input_files)} file(s) on {args.keys}")
+    deduplicate_csv(input_files, output_file, args.keys, args.chunksize, args.memory_mb, args.spill_dir)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""
+Fused transform pipeline
+Runs the wide-format transform, the long-format conversion and the MongoDB load
+in one process, handing DataFrames from step to step instead of writing and
+re-parsing africa_energy_transformed_*.csv and africa_energy_long_format_*.csv
+
+The intermediate CSVs are only written with --keep-intermediate (same names as
+the separate scripts, so they can still be inspected or loaded on their own)
+
+Usage: python transform/pipeline.py [--input extracted.csv] [--keep-intermediate] [--no-load]
+"""
+
+import argparse
+import glob
+import os
+import sys
+from datetime import datetime
+
+# Import from same directory
+from transformer import EnergyDataTransformer
+from transform_to_long_format import frame_to_long_format
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def transform_frames(input_file=None, extracted_df=None):
+    """Extracted data (CSV path or DataFrame) -> (wide DataFrame, long DataFrame), all in memory"""
+    transformer = EnergyDataTransformer(input_file)
+    transformer.load_data(extracted_df)
+    transformer.create_country_mapping()
+    transformer.transform_to_schema()
+    transformer.deduplicate_records()
+    wide = transformer.schema_frame()
+
+    print(f"\n[5/5] Converting to long format in memory...")
+    long_df = frame_to_long_format(wide)
+    print(f"      {len(wide)} wide rows -> {len(long_df)} records with data")
+    return wide, long_df
+
+
+def run_pipeline(input_file=None, extracted_df=None, keep_intermediate=False, load=True,
+                 output_dir=PROJECT_ROOT):
+    """Transform (and load) the extracted data without CSV handoffs between the steps"""
+    wide, long_df = transform_frames(input_file, extracted_df)
+
+    if keep_intermediate:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        wide_file = os.path.join(output_dir, f"africa_energy_transformed_{timestamp}.csv")
+        long_file = os.path.join(output_dir, f"africa_energy_long_format_{timestamp}.csv")
+        wide.to_csv(wide_file, index=False, encoding='utf-8-sig')
+        long_df.to_csv(long_file, index=False)
+        print(f"\n[OK] Intermediate files kept:")
+        print(f"     {wide_file}")
+        print(f"     {long_file}")
+
+    if load:
+        # Imported here so the transform runs without the MongoDB dependencies
+        sys.path.insert(0, os.path.join(PROJECT_ROOT, 'load'))
+        from load_to_mongodb import load_data
+        if not load_data(long_df):
+            return None
+
+    return long_df
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Transform and load the extracted data in one process')
+    parser.add_argument('--input', help='Extracted CSV (default: the latest africa_energy_complete_*.csv)')
+    parser.add_argument('--keep-intermediate', action='store_true',
+                        help='Also write the transformed and long format CSVs')
+    parser.add_argument('--no-load', action='store_true', help='Stop after the transform')
+    args = parser.parse_args(argv)
+
+    print("\n" + "="*80)
+    print("AFRICA ENERGY DATA - FUSED TRANSFORM PIPELINE")
+    print("="*80)
+
+    input_file = args.input
+    if not input_file:
+        extracted_files = sorted(glob.glob(os.path.join(PROJECT_ROOT, "africa_energy_complete_*.csv")), reverse=True)
+        if not extracted_files:
+            print(f"\n[ERROR] No extracted file found in: {PROJECT_ROOT}")
+            print("Please run extract/scraper_complete.py first to extract the data.")
+            return 1
+        input_file = extracted_files[0]
+    print(f"\nUsing extracted file: {os.path.basename(input_file)}")
+
+    long_df = run_pipeline(input_file, keep_intermediate=args.keep_intermediate, load=not args.no_load)
+    if long_df is None:
+        return 1
+
+    print(f"\n{'='*80}")
+    print("PIPELINE COMPLETED!")
+    print(f"{'='*80}")
+    print(f"Records: {len(long_df)}")
+    print(f"Countries: {long_df['country'].nunique()}")
+    print(f"Metrics: {long_df['metric'].nunique()}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
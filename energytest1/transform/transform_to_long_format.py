@@ -1,68 +1,146 @@
 """
 Transform wide format CSV to long format suitable for MongoDB
 Each row will become multiple rows - one per year with actual data
+
+stream_to_long_format converts in bounded memory: the wide file is read in chunks,
+only the non-empty year cells are expanded (metadata kept as categoricals), every
+chunk is sorted and spilled as a run, and the runs are merged into the output.
+Memory follows the non-empty values of one chunk instead of rows x years
 """
+import argparse
+import csv
+import heapq
+import shutil
+import tempfile
 import pandas as pd
 import numpy as np
 from datetime import datetime
 import os
 
-def transform_to_long_format(csv_file):
-    """Transform wide format to long format"""
-    print("="*80)
-    print("TRANSFORMING DATA TO LONG FORMAT")
-    print("="*80)
-    
-    # Load the data
-    print(f"\n[1/4] Loading CSV file: {csv_file}")
-    df = pd.read_csv(csv_file)
-    print(f"      Loaded {len(df)} rows, {len(df.columns)} columns")
-    
-    # Identify year columns
-    year_columns = [col for col in df.columns if col.isdigit() and 2000 <= int(col) <= 2030]
+from energy_common.schema import read_canonical_csv, year_values
+
+SORT_COLUMNS = ['country', 'metric', 'year']
+
+
+def year_columns_of(columns):
+    return [col for col in columns if col.isdigit() and 2000 <= int(col) <= 2030]
+
+
+def expand_chunk(chunk, year_columns, metadata_columns):
+    """Long rows for the non-empty year cells of one wide chunk, sorted by country, metric, year"""
+    values = year_values(chunk, year_columns).to_numpy()
+    # Row-major positions of the non-empty cells: rows in input order, years ascending
+    rows, cols = np.nonzero(~np.isnan(values))
+    
+    long_chunk = {}
+    for col in metadata_columns:
+        column = chunk[col]
+        if not pd.api.types.is_numeric_dtype(column):
+            # Repeated metadata strings are stored once, rows only hold codes
+            column = column.astype('category')
+        long_chunk[col] = column.take(rows).reset_index(drop=True)
+    long_chunk['year'] = np.array(year_columns, dtype=np.int16)[cols]
+    long_chunk['value'] = values[rows, cols]
+    
+    return pd.DataFrame(long_chunk).sort_values(SORT_COLUMNS, kind='stable')
+
+
+def frame_to_long_format(df):
+    """Long format of a wide DataFrame held in memory (e.g. straight from EnergyDataTransformer)"""
+    year_columns = year_columns_of(df.columns)
     metadata_columns = [col for col in df.columns if col not in year_columns]
-    
-    print(f"\n[2/4] Identified columns:")
-    print(f"      Metadata columns: {metadata_columns}")
-    print(f"      Year columns: {len(year_columns)} years ({year_columns[0]} to {year_columns[-1]})")
-    
-    # Melt the dataframe
-    print(f"\n[3/4] Converting to long format...")
-    df_long = pd.melt(
-        df,
-        id_vars=metadata_columns,
-        value_vars=year_columns,
-        var_name='year',
-        value_name='value'
-    )
-    
-    # Convert year to integer
-    df_long['year'] = df_long['year'].astype(int)
-    
-    # Remove rows with NaN values
-    before_count = len(df_long)
-    df_long = df_long.dropna(subset=['value'])
-    after_count = len(df_long)
-    print(f"      Before filtering: {before_count} rows")
-    print(f"      After removing NaN values: {after_count} rows")
-    print(f"      Removed: {before_count - after_count} rows with no data")
-    
-    # Sort by country, metric, year
-    df_long = df_long.sort_values(['country', 'metric', 'year']).reset_index(drop=True)
-    
-    print(f"\n[4/4] Final structure:")
-    print(f"      Total documents: {len(df_long)}")
-    print(f"      Columns: {df_long.columns.tolist()}")
-    
-    # Show sample
-    print(f"\n      Sample records:")
-    for idx, row in df_long.head(3).iterrows():
-        print(f"        {row['country']} - {row['metric'][:50]}... - {row['year']}: {row['value']}")
-    
-    return df_long
+    return expand_chunk(df, year_columns, metadata_columns).reset_index(drop=True)
+
+
+def sort_key(row, positions):
+    """Merge key of a CSV row, ordered like sort_values (missing country/metric last)"""
+    country, metric, year = (row[i] for i in positions)
+    return (country == '', country, metric == '', metric, int(year))
+
+
+def merge_runs(run_files, output_file, columns):
+    """k-way merge of sorted CSV runs; equal keys keep the order of the runs"""
+    positions = [columns.index(col) for col in SORT_COLUMNS]
+    handles = [open(run_file, newline='', encoding='utf-8') for run_file in run_files]
+    try:
+        readers = [csv.reader(handle) for handle in handles]
+        merged = heapq.merge(*readers, key=lambda row: sort_key(row, positions))
+        with open(output_file, 'w', newline='', encoding='utf-8') as out:
+            writer = csv.writer(out, lineterminator='\n')
+            writer.writerow(columns)
+            writer.writerows(merged)
+    finally:
+        for handle in handles:
+            handle.close()
 
 
-def main():
+def write_run(long_chunk, spill_dir, index):
+    run_file = os.path.join(spill_dir, f"run_{index:04d}.csv")
+    long_chunk.to_csv(run_file, index=False, header=False, encoding='utf-8')
+    return run_file
+
+
+def stream_to_long_format(csv_file, output_file, chunksize=50_000, spill_dir=None):
+    """Convert a wide CSV to a sorted long CSV in bounded memory, returns summary stats"""
+    print("="*80)
+    print("TRANSFORMING DATA TO LONG FORMAT (STREAMING)")
+    print("="*80)
+    print(f"\n[1/3] Reading {csv_file} in chunks of {chunksize} rows")
+    
+    own_spill_dir = spill_dir is None
+    spill_dir = spill_dir or tempfile.mkdtemp(prefix='long_format_')
+    os.makedirs(spill_dir, exist_ok=True)
+    
+    stats = {'wide_rows': 0, 'records': 0, 'countries': set(), 'metrics': set(), 'years': set()}
+    run_files = []
+    # The latest chunk, spilled only once another one follows, so a small file never touches disk
+    held = None
+    try:
+        for chunk in read_canonical_csv(csv_file, chunksize=chunksize):
+            year_columns = year_columns_of(chunk.columns)
+            metadata_columns = [col for col in chunk.columns if col not in year_columns]
+            long_chunk = expand_chunk(chunk, year_columns, metadata_columns)
+            
+            stats['wide_rows'] += len(chunk)
+            stats['records'] += len(long_chunk)
+            stats['countries'].update(long_chunk['country'].dropna().unique())
+            stats['metrics'].update(long_chunk['metric'].dropna().unique())
+            stats['years'].update(long_chunk['year'].unique().tolist())
+            
+            if held is not None:
+                run_files.append(write_run(held, spill_dir, len(run_files)))
+            held = long_chunk
+        
+        print(f"      {stats['wide_rows']} wide rows -> {stats['records']} records with data")
+        if held is None:
+            print("[WARN] Input file has no rows")
+            return stats
+        columns = held.columns.tolist()
+        
+        print(f"\n[2/3] Writing sorted output...")
+        if run_files:
+            run_files.append(write_run(held, spill_dir, len(run_files)))
+            held = None
+            print(f"      Merging {len(run_files)} sorted runs")
+            merge_runs(run_files, output_file, columns)
+        else:
+            held.to_csv(output_file, index=False)
+        
+        print(f"\n[3/3] Final structure:")
+        print(f"      Total documents: {stats['records']}")
+        print(f"      Columns: {columns}")
+    finally:
+        if own_spill_dir:
+            shutil.rmtree(spill_dir, ignore_errors=True)
+    
+    return stats
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Convert the latest transformed CSV to long format')
+    parser.add_argument('--chunksize', type=int, default=50_000, help='Wide rows read per chunk')
+    parser.add_argument('--spill-dir', help='Directory for sorted runs (default: a temp directory)')
+    args = parser.parse_args(argv)
+    
     # Get the project root directory (parent of transform/)
     script_dir = os.path.dirname(os.path.abspath(__file__))
     project_root = os.path.dirname(script_dir)
@@ -84,24 +162,23 @@ def main():
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     output_file = os.path.join(project_root, f"africa_energy_long_format_{timestamp}.csv")
     
-    # Transform
-    df_long = transform_to_long_format(input_file)
-    
-    # Save
+    # Transform and save, chunk by chunk
+    stats = stream_to_long_format(input_file, output_file, args.chunksize, args.spill_dir)
+    if not stats['records']:
+        return None
     print(f"\n{'='*80}")
-    print(f"Saving to: {output_file}")
-    df_long.to_csv(output_file, index=False)
+    print(f"Saved to: {output_file}")
     print(f"[OK] Saved successfully!")
     
     # Summary statistics
     print(f"\n{'='*80}")
     print("SUMMARY STATISTICS")
     print(f"{'='*80}")
-    print(f"Total records: {len(df_long)}")
-    print(f"Countries: {df_long['country'].nunique()}")
-    print(f"Metrics: {df_long['metric'].nunique()}")
-    print(f"Year range: {df_long['year'].min()} to {df_long['year'].max()}")
-    print(f"Records with data: {df_long['value'].notna().sum()}")
+    print(f"Total records: {stats['records']}")
+    print(f"Countries: {len(stats['countries'])}")
+    print(f"Metrics: {len(stats['metrics'])}")
+    print(f"Year range: {min(stats['years'])} to {max(stats['years'])}")
+    print(f"Records with data: {stats['records']}")
     
     print(f"\n{'='*80}")
     print("TRANSFORMATION COMPLETED!")
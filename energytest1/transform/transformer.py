@@ -10,6 +10,11 @@ import numpy as np
 from datetime import datetime
 import os
 
+from energy_common.schema import BASE_COLUMNS, YEAR_COLUMNS, memory_mb, read_extracted_csv
+
+# Import from same directory
+from dedup import DEDUP_KEYS, StreamingDeduplicator
+
 
 class EnergyDataTransformer:
     def __init__(self, input_file):
@@ -20,11 +25,15 @@ class EnergyDataTransformer:
         # Country serial numbers (alphabetical order)
         self.country_mapping = {}
         
-    def load_data(self):
-        """Load the extracted CSV data"""
-        print(f"[1/5] Loading data from: {self.input_file}")
-        self.df = pd.read_csv(self.input_file)
-        print(f"      Loaded {len(self.df)} rows, {len(self.df.columns)} columns")
+    def load_data(self, df=None):
+        """Load the extracted CSV data, or take an extracted DataFrame as is"""
+        if df is None:
+            print(f"[1/5] Loading data from: {self.input_file}")
+            self.df = read_extracted_csv(self.input_file)
+        else:
+            print(f"[1/5] Using extracted data passed in memory")
+            self.df = df
+        print(f"      Loaded {len(self.df)} rows, {len(self.df.columns)} columns ({memory_mb(self.df):.2f} MB)")
         return self.df
     
     def create_country_mapping(self):
@@ -40,72 +49,80 @@ class EnergyDataTransformer:
         
         return self.country_mapping
     
+    def column(self, name, default=None):
+        """A source column, or `default` on every row when the extract has no such column"""
+        if name in self.df.columns:
+            values = self.df[name].reset_index(drop=True)
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                # Plain values for the schema columns, as if read with default dtypes
+                values = values.astype(values.cat.categories.dtype)
+            return values
+        return pd.Series([default] * len(self.df), dtype=object if default is None else None)
+    
+    def signature_years(self):
+        """
+        Year of every Signature Date (NaN where missing or unparseable).
+        Each distinct date is parsed once, in one call with the format inferred
+        from the column; dates in any other format are parsed one by one
+        """
+        dates = self.column('Signature Date')
+        unique_dates = pd.Series(dates.dropna().unique(), dtype=object)
+        parsed = pd.to_datetime(unique_dates, errors='coerce')
+        other_format = parsed.isna()
+        if other_format.any():
+            parsed[other_format] = pd.to_datetime(unique_dates[other_format], format='mixed', errors='coerce')
+        return dates.map(pd.Series(parsed.dt.year.to_numpy(), index=unique_dates.to_numpy()))
+    
     def transform_to_schema(self):
-        """Transform data to required schema"""
+        """Transform data to required schema, one bulk operation per column"""
         print(f"\n[3/5] Transforming to required schema...")
         
-        records = []
-        
-        for idx, row in self.df.iterrows():
-            # Extract base information
-            country_name = row.get('Country_Name', 'Unknown')
-            country_serial = self.country_mapping.get(country_name, 0)
-            
-            # Determine metric based on available data
-            if pd.notna(row.get('Title')):
-                metric = row.get('Title', 'Unknown Metric')
-            else:
-                metric = 'Energy Project Data'
-            
-            # Create the record with required schema
-            record = {
-                'country': country_name,
-                'country_serial': country_serial,
-                'metric': metric,
-                'unit': row.get('Commitment in UA', 'UA'),  # Use commitment as unit
-                'sector': row.get('Sector', 'Energy'),
-                'sub_sector': row.get('Sovereign / Non-Sovereign', 'Not Specified'),
-                'sub_sub_sector': row.get('Status', None),
-                'source_link': row.get('Source_Link', 'https://africa-energy-portal.org/'),
-                'source': row.get('Source', 'Africa Energy Portal'),
-            }
-            
-            # Add year columns (2000-2024) - all empty for now as we don't have historical data
-            for year in range(2000, 2025):
-                record[str(year)] = None
-            
-            # If we have a signature date, we can put the commitment value in that year
-            if pd.notna(row.get('Signature Date')) and pd.notna(row.get('Commitment in UA')):
-                try:
-                    sig_date = pd.to_datetime(row.get('Signature Date'))
-                    year = sig_date.year
-                    if 2000 <= year <= 2024:
-                        record[str(year)] = row.get('Commitment in UA')
-                except:
-                    pass
-            
-            records.append(record)
-        
-        self.transformed_df = pd.DataFrame(records)
-        print(f"      Created {len(records)} records")
+        country = self.column('Country_Name', 'Unknown')
+        commitment = self.column('Commitment in UA')
+        
+        columns = {
+            'country': country,
+            'country_serial': country.map(self.country_mapping).fillna(0).astype('int64'),
+            'metric': self.column('Title', 'Energy Project Data').fillna('Energy Project Data'),
+            # Use commitment as unit
+            'unit': self.column('Commitment in UA', 'UA'),
+            'sector': self.column('Sector', 'Energy'),
+            'sub_sector': self.column('Sovereign / Non-Sovereign', 'Not Specified'),
+            'sub_sub_sector': self.column('Status'),
+            'source_link': self.column('Source_Link', 'https://africa-energy-portal.org/'),
+            'source': self.column('Source', 'Africa Energy Portal'),
+        }
+        
+        # Year columns (2000-2024) stay empty, except the signature year of a project
+        # which gets its commitment value: one indexed assignment for all rows
+        years = np.full((len(self.df), len(YEAR_COLUMNS)), None, dtype=object)
+        signed = self.signature_years()
+        rows = np.flatnonzero((signed.between(2000, 2024) & commitment.notna()).to_numpy())
+        years[rows, signed.to_numpy()[rows].astype(int) - 2000] = commitment.to_numpy(dtype=object)[rows]
+        columns.update(zip(YEAR_COLUMNS, years.T))
+        
+        # Same dtypes as building the frame from row dicts
+        self.transformed_df = pd.DataFrame(columns).infer_objects()
+        print(f"      Created {len(self.transformed_df)} records")
         print(f"      Columns: {len(self.transformed_df.columns)}")
         
         return self.transformed_df
     
-    def deduplicate_records(self):
-        """Remove duplicate records"""
+    def deduplicate_records(self, chunksize=100_000, memory_budget_mb=64):
+        """Remove duplicate records, streaming through the frame in chunks"""
         print(f"\n[4/5] Removing duplicates...")
         
         initial_count = len(self.transformed_df)
         
-        # Remove exact duplicates
-        self.transformed_df = self.transformed_df.drop_duplicates()
-        
-        # Group by country and metric to consolidate
-        # Keep the first occurrence of each country-metric combination
-        self.transformed_df = self.transformed_df.drop_duplicates(
-            subset=['country', 'metric'], keep='first'
-        )
+        # Keep the first occurrence of each country-metric combination. Exact
+        # duplicates repeat an earlier country-metric too, so one pass covers both;
+        # the rows are selected once at the end instead of copying the frame per pass
+        keep = np.zeros(initial_count, dtype=bool)
+        with StreamingDeduplicator(DEDUP_KEYS, memory_budget_mb) as dedup:
+            for start in range(0, initial_count, chunksize):
+                chunk = self.transformed_df.iloc[start:start + chunksize]
+                keep[start:start + chunksize] = dedup.mask(chunk)
+        self.transformed_df = self.transformed_df[keep]
         
         final_count = len(self.transformed_df)
         removed = initial_count - final_count
@@ -115,18 +132,16 @@ class EnergyDataTransformer:
         
         return self.transformed_df
     
+    def schema_frame(self):
+        """The transformed data with its columns in the required schema order"""
+        self.transformed_df = self.transformed_df[BASE_COLUMNS + YEAR_COLUMNS]
+        return self.transformed_df
+    
     def save_transformed_data(self, output_file):
         """Save transformed data to CSV"""
         print(f"\n[5/5] Saving transformed data...")
         
-        # Ensure column order matches required schema
-        base_cols = ['country', 'country_serial', 'metric', 'unit', 'sector', 
-                     'sub_sector', 'sub_sub_sector', 'source_link', 'source']
-        year_cols = [str(year) for year in range(2000, 2025)]
-        all_cols = base_cols + year_cols
-        
-        # Reorder columns
-        self.transformed_df = self.transformed_df[all_cols]
+        self.schema_frame()
         
         # Save to CSV
         self.transformed_df.to_csv(output_file, index=False, encoding='utf-8-sig')